@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the BBYouTubeDataSource pipeline.
+
+Generates synthetic audio (speech-like tone bursts separated by silences) of the
+requested lengths, replaces yt-dlp's YoutubeDL with a stub that "downloads" that
+audio, and times each stage of the pipeline on it:
+
+    download   - stub download (a local file copy; measures pipeline overhead only)
+    decode     - ffmpeg decode to 16 kHz mono float32 (the former MP3/WAV conversion
+                 passes are part of this single step now)
+    transcribe - Whisper (a real model from the local cache, or --fake-whisper)
+    summarize  - the summarizer for --language ('es': sumy LexRank, 'en': Hugging Face)
+
+The peak RSS of this process and of its children (ffmpeg, transcription workers)
+is recorded after each length: ru_maxrss never decreases, so it is the peak of the
+whole benchmark process up to that point, not of a single run. Results are written as JSON and can be compared against a
+stored baseline; the exit status is 1 when a stage regressed beyond --tolerance.
+
+Examples:
+    python benchmarks/youtube_pipeline_benchmark.py --lengths 30,300 --output run.json
+    python benchmarks/youtube_pipeline_benchmark.py --lengths 30,300 --save-baseline baseline.json
+    python benchmarks/youtube_pipeline_benchmark.py --lengths 30,300 --baseline baseline.json \\
+        --params '{"parallel_transcription": true}'
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import wave
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+youtube_module = importlib.import_module('brainboost_data_source_package.data_source_addons.BBYouTubeDataSource')
+
+SYNTHETIC_RATE = 44100  # deliberately not 16 kHz, so the decode stage resamples like real downloads
+
+
+def write_synthetic_audio(path, seconds, seed=0):
+    """Stereo 16-bit WAV of tone bursts (0.5-4 s) separated by short silences."""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SYNTHETIC_RATE)
+    samples = np.zeros(total, dtype=np.float32)
+    position = 0
+    while position < total:
+        burst = int(rng.uniform(0.5, 4.0) * SYNTHETIC_RATE)
+        end = min(total, position + burst)
+        t = np.arange(end - position) / SYNTHETIC_RATE
+        pitch = rng.uniform(120, 300)
+        samples[position:end] = 0.3 * np.sin(2 * np.pi * pitch * t) * (1 + 0.5 * np.sin(2 * np.pi * 3 * t))
+        position = end + int(rng.uniform(0.2, 1.0) * SYNTHETIC_RATE)
+    pcm = (np.clip(samples, -1, 1) * 32767).astype('<i2')
+    with wave.open(path, 'wb') as out:
+        out.setnchannels(2)
+        out.setsampwidth(2)
+        out.setframerate(SYNTHETIC_RATE)
+        out.writeframes(np.repeat(pcm, 2).tobytes())
+
+
+class StubYoutubeDL:
+    """Stands in for yt_dlp.YoutubeDL: 'downloads' the synthetic file registered for a URL."""
+
+    sources = {}  # url -> (path, seconds)
+
+    def __init__(self, options):
+        self.options = options
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=False):
+        path, seconds = self.sources[url]
+        video_id = os.path.splitext(os.path.basename(path))[0]
+        info = {'id': video_id, 'title': f"Synthetic {seconds:g} s", 'duration': seconds, 'ext': 'wav'}
+        if download:
+            target = self.options['outtmpl'].replace('%(id)s', video_id).replace('%(ext)s', 'wav')
+            shutil.copyfile(path, target)
+        return info
+
+
+class FakeWhisperModel:
+    """Cheap Whisper stand-in whose cost scales with audio length (one segment per 5 s)."""
+
+    def transcribe(self, audio, language=None, **kwargs):
+        frames = np.asarray(audio[:len(audio) - len(audio) % 16000]).reshape(-1, 16000)
+        energy = np.sqrt(np.mean(np.square(frames), axis=1))
+        segments = []
+        for start in range(0, len(energy), 5):
+            words = ' '.join(f"palabra{int(e * 1000) % 97}." for e in energy[start:start + 5])
+            segments.append({'start': float(start), 'end': float(min(start + 5, len(energy))), 'text': ' ' + words})
+        return {'text': ''.join(s['text'] for s in segments), 'language': language or 'es', 'segments': segments}
+
+
+def peak_rss_mb():
+    """Peak resident set size so far of this process and of its (waited-for) children, in MiB."""
+    scale = 1 if sys.platform == 'darwin' else 1024  # ru_maxrss is bytes on macOS, KiB on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+    return round(own / 2 ** 20, 1), round(children / 2 ** 20, 1)
+
+
+def run_once(source, url, seconds, language, workdir):
+    stages = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        audio_file, info = source.download_audio_stream(url, workdir)
+        stages['download'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        samples = source.audio_decoder.decode(audio_file, duration=info.get('duration'), workdir=workdir)
+        stages['decode'] = time.perf_counter() - started
+        os.remove(audio_file)
+
+        model = source.model_registry.get(source.whisper_model_key())
+        started = time.perf_counter()
+        transcript, _, segments = source.transcribe_audio(samples, model)
+        stages['transcribe'] = time.perf_counter() - started
+
+        summarizer, summary_model = source.get_summarizer(language)
+        started = time.perf_counter()
+        summary = source.summarize_text(transcript, summarizer)
+        stages['summarize'] = time.perf_counter() - started
+
+    return {
+        'audio_seconds': seconds,
+        'stages': {name: round(value, 4) for name, value in stages.items()},
+        'total_seconds': round(sum(stages.values()), 4),
+        'realtime_factor': round(seconds / sum(stages.values()), 2) if sum(stages.values()) else None,
+        'segments': len(segments),
+        'summary_chars': len(summary),
+        'summary_model': summary_model
+    }
+
+
+def median_run(samples):
+    """Per-field median of the runs of one length (per stage for 'stages'; other fields are constant)."""
+    median = {}
+    for field, value in samples[0].items():
+        if field == 'stages':
+            median[field] = {stage: round(float(np.median([s['stages'][stage] for s in samples])), 4)
+                             for stage in value}
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            middle = float(np.median([s[field] for s in samples]))
+            median[field] = int(middle) if isinstance(value, int) and middle.is_integer() else round(middle, 4)
+        else:
+            median[field] = value
+    median['total_seconds'] = round(sum(median['stages'].values()), 4)
+    return median
+
+
+def compare(results, baseline, tolerance, min_delta=0.01):
+    """Return (report lines, regressed) comparing per-stage medians with the baseline's."""
+    def by_length(document):
+        return {run['audio_seconds']: run for run in document['runs']}
+
+    current, previous = by_length(results), by_length(baseline)
+    lines, regressed = [], False
+    for seconds in sorted(current):
+        if seconds not in previous:
+            lines.append(f"{seconds:>8g} s  (no baseline)")
+            continue
+        for stage, value in current[seconds]['stages'].items():
+            before = previous[seconds]['stages'].get(stage)
+            if not before:
+                continue
+            change = (value - before) / before
+            flag = ''
+            if change > tolerance and value - before > min_delta:  # ignore noise on near-zero stages
+                flag, regressed = '  REGRESSION', True
+            lines.append(f"{seconds:>8g} s  {stage:<10} {before:9.3f} -> {value:9.3f} s  ({change:+.0%}){flag}")
+    return lines, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lengths', default='30,120', help="Comma-separated synthetic audio lengths in seconds.")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per length; the median is reported.")
+    parser.add_argument('--language', default='es', choices=['es', 'en'])
+    parser.add_argument('--fake-whisper', action='store_true', help="Use a cheap stand-in instead of Whisper.")
+    parser.add_argument('--params', default='{}', help="JSON params for BBYouTubeDataSource.")
+    parser.add_argument('--output', help="Write results JSON here (default: stdout).")
+    parser.add_argument('--baseline', help="Baseline JSON to compare against.")
+    parser.add_argument('--save-baseline', help="Also write the results to this baseline file.")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="Allowed slowdown per stage (0.15 = 15%%).")
+    parser.add_argument('--min-delta', type=float, default=0.01, help="Ignore slowdowns smaller than this (s).")
+    args = parser.parse_args()
+
+    params = dict(json.loads(args.params), transcript_cache=False)
+    if args.fake_whisper:
+        # The stand-in only exists in this process, so chunk workers cannot use it.
+        params['parallel_transcription'] = False
+    youtube_module.YoutubeDL = StubYoutubeDL
+    source = youtube_module.BBYouTubeDataSource(params=params)
+    if args.fake_whisper:
+        source.model_registry.evict(source.whisper_model_key())
+        source.model_registry.register(source.whisper_model_key(), FakeWhisperModel)
+
+    lengths = [float(value) for value in args.lengths.split(',') if value]
+    runs = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        media_dir, workdir = os.path.join(tmpdir, 'media'), os.path.join(tmpdir, 'work')
+        os.makedirs(media_dir)
+        os.makedirs(workdir)
+        for index, seconds in enumerate(lengths):
+            path = os.path.join(media_dir, f"synthetic{index:03d}.wav")
+            write_synthetic_audio(path, seconds, seed=index)
+            url = f"https://www.youtube.com/watch?v=synthetic{index:03d}"
+            StubYoutubeDL.sources[url] = (path, seconds)
+            # Warm-up run loads models and fills OS caches; it is not reported.
+            run_once(source, url, seconds, args.language, workdir)
+            samples = [run_once(source, url, seconds, args.language, workdir) for _ in range(args.repeat)]
+            median = median_run(samples)
+            median['process_peak_rss_mb'], median['process_peak_children_rss_mb'] = peak_rss_mb()
+            runs.append(median)
+            print(f"{seconds:>8g} s  " + '  '.join(f"{k}={v:.3f}s" for k, v in median['stages'].items()) +
+                  f"  process_peak_rss={median['process_peak_rss_mb']} MiB", file=sys.stderr)
+    source.stop()  # shuts down the transcription worker pools
+
+    results = {
+        'benchmark': 'youtube_pipeline',
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'fake_whisper': args.fake_whisper,
+        'language': args.language,
+        'params': params,
+        'repeat': args.repeat,
+        'runs': runs
+    }
+    document = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(document + '\n')
+    else:
+        print(document)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            f.write(document + '\n')
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        lines, regressed = compare(results, baseline, args.tolerance, args.min_delta)
+        print('\n'.join(lines), file=sys.stderr)
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,20 @@
 from abc import ABC, abstractmethod
+from collections import deque
 from brainboost_data_source_logger_package.BBLogger import BBLogger
+from brainboost_data_source_package.data_source_abstract.BBFetchRecord import BBFetchRecord
+from brainboost_data_source_package.data_source_manager.BBDependencyExecutor import BBDependencyExecutor
 
 
 class BBDataSource(ABC):
-    def __init__(self, name=None, session=None, dependency_data_sources=[], subscribers=None, params=None):
+    def __init__(self, name=None, session=None, dependency_data_sources=None, subscribers=None, params=None):
         self.name = name
         self.session = session
-        self.dependency_data_sources = dependency_data_sources
+        # Copied so subclasses' shared default lists are never mutated across instances
+        self.dependency_data_sources = list(dependency_data_sources or [])
         self.subscribers = subscribers or []
         self.params = params or {}
+        self.dependency_timings = {}
+        self.dependency_critical_path = ([], 0.0)
         self.progress_callback = None  # Initialize the progress callback to None
         self.status_callback = None    # Initialize the status callback to None
         # progress variables normal to all datasources
@@ -16,15 +22,74 @@ class BBDataSource(ABC):
         self._processed_items = 0
         self._total_processing_time = 0.0
         self._fetch_completed = False
+        # Optional columnar batch delivery for subscribers implementing notify_batch()
+        self._batcher = None
+        if self.params.get('delivery_batch_size') or self.params.get('delivery_batch_interval'):
+            # Imported here so NumPy is only required when batching is enabled.
+            from brainboost_data_source_package.data_source_utils.BBRecordBatch import BBRecordBatcher
+            self._batcher = BBRecordBatcher(
+                self._deliver_batch,
+                batch_size=self.params.get('delivery_batch_size', 1000),
+                flush_interval=self.params.get('delivery_batch_interval', 1.0)
+            )
 
     def start(self):
-        for ds in self.dependency_data_sources:
-            ds.subscribe(self)
-            ds.start()
+        """
+        Start this data source and its dependency graph. Dependencies start before
+        their dependents (which are subscribed to them), independent ones concurrently
+        on up to params['dependency_max_workers'] threads. Per-node timings are kept in
+        self.dependency_timings and the slowest chain in self.dependency_critical_path.
+        """
+        executor = BBDependencyExecutor(self, max_workers=self.params.get('dependency_max_workers', 4))
+        self.dependency_timings = executor.run()
+        self.dependency_critical_path = executor.critical_path()
+        BBLogger.log(f"Dependency critical path: {' -> '.join(self.dependency_critical_path[0])} "
+                     f"({self.dependency_critical_path[1]:.3f} seconds)")
+
+    def start_node(self):
+        """
+        Hook called by start() once all of this source's dependencies have started.
+        Does nothing by default; override to begin producing data.
+        """
+        pass
 
     def update(self, data):
+        if self._batcher is None:
+            for subscriber in self.subscribers:
+                subscriber.notify(data)
+            return
+        batch_subscribers = False
+        for subscriber in self.subscribers:
+            if self._wants_batches(subscriber):
+                batch_subscribers = True
+            else:
+                subscriber.notify(data)
+        if batch_subscribers:
+            self._batcher.append(data)
+
+    @staticmethod
+    def _wants_batches(subscriber):
+        """Subscribers opt into columnar delivery by defining notify_batch(batch)."""
+        return callable(getattr(type(subscriber), 'notify_batch', None))
+
+    def _deliver_batch(self, batch):
         for subscriber in self.subscribers:
-            subscriber.notify(data)
+            if self._wants_batches(subscriber):
+                subscriber.notify_batch(batch)
+
+    def flush_batches(self):
+        """Deliver any records still pending in the batch buffer."""
+        if self._batcher is not None:
+            self._batcher.flush()
+
+    def stop(self):
+        """
+        Stop producing data. The base implementation delivers the records still
+        pending in the batch buffer and stops its timer thread; sources that
+        override stop() must call it.
+        """
+        if self._batcher is not None:
+            self._batcher.close()
 
     def subscribe(self, subscriber):
         if subscriber not in self.subscribers:
@@ -52,6 +117,23 @@ class BBDataSource(ABC):
         """Fetch data from the data source."""
         pass
 
+    def iter_fetch(self, *args, **kwargs):
+        """
+        Yield BBFetchRecord items as they are produced (cloned repos, offers, snapshots,
+        transcript segments...) so callers can process them while the fetch is running.
+        Sources that do not stream yet run fetch() to completion and then yield a single
+        'fetch_completed' record holding fetch()'s return value.
+        """
+        result = self.fetch(*args, **kwargs)
+        yield BBFetchRecord('fetch_completed', self.get_name(), {'result': result})
+
+    def consume_iter_fetch(self, *args, **kwargs):
+        """
+        Drain iter_fetch() without keeping records; streaming sources implement fetch() with it.
+        A source overriding fetch() this way must also override iter_fetch().
+        """
+        deque(self.iter_fetch(*args, **kwargs), maxlen=0)
+
     @abstractmethod
     def get_icon(self):
         """Return the SVG code for the data source icon."""
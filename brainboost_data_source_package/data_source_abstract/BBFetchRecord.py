@@ -0,0 +1,11 @@
+# File: brainboost_data_source_package/data_source_abstract/BBFetchRecord.py
+
+from collections import namedtuple
+
+
+# A single record or artifact yielded by BBDataSource.iter_fetch().
+#   record_type: what was produced ('repository', 'offer', 'snapshot', 'transcript_segment', 'summary', ...);
+#                sources without streaming support yield one 'fetch_completed' record
+#   source:      name of the data source that produced it (BBDataSource.get_name())
+#   data:        dict with the record payload
+BBFetchRecord = namedtuple('BBFetchRecord', ['record_type', 'source', 'data'])
@@ -0,0 +1,168 @@
+# File: brainboost_data_source_package/data_source_abstract/BBP2PDataSource.py
+
+import threading
+import time
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from brainboost_data_source_package.data_source_abstract.BBPeriodicDataSource import BBPeriodicDataSource
+from brainboost_data_source_package.data_source_utils.BBOfferDelta import BBOfferDelta
+from brainboost_data_source_package.data_source_utils.BBP2POfferHistory import BBP2POfferHistory
+from brainboost_data_source_logger_package.BBLogger import BBLogger
+
+
+class BBP2PDataSource(BBPeriodicDataSource):
+    """
+    Base class for P2P exchange sources that poll offers for many (token, fiat, side)
+    markets and publish only what changed since the previous poll.
+
+    All markets are requested concurrently on a thread pool sharing one pooled
+    requests.Session (keep-alive connections, retries on 429/5xx). The last
+    snapshot of every market is kept, and each tick publishes, per market, the
+    offers that were added, the ids of the ones removed and the offers whose
+    price, quantity, limits or payment methods changed; ticks without changes
+    publish nothing. A market whose request fails keeps its previous snapshot.
+    New subscribers first receive the current snapshot (flagged 'snapshot'); it is
+    taken and sent under the same lock as the diffs, so no newer delta can reach a
+    subscriber ahead of its snapshot.
+
+    Subclasses set ``exchange`` and implement fetch_market(), returning offers with
+    the shared fields: offer_id, exchange, token, fiat, side, price, available,
+    min_amount, max_amount, payment_methods, trader, trader_id.
+
+    Params (besides those of BBPeriodicDataSource; 'frequency' defaults to 10 s):
+      - markets: list of {'token', 'fiat', 'side'} dicts or (token, fiat, side) tuples
+        (default [('USDT', 'USD', 'SELL')])
+      - page_size: offers per request (default 10); pages: requests per market (default 1)
+      - max_workers: concurrent requests (default min(8, number of markets))
+      - request_timeout: seconds (default 10)
+      - history_dir: when set, every delta is also appended to a BBP2POfferHistory there
+        (history_flush_rows, history_flush_interval tune its write buffering; the interval is
+        checked on every poll)
+    """
+
+    record_type = 'offer_delta'
+    exchange = None
+    fetch_errors = (requests.exceptions.RequestException, ValueError)
+
+    def __init__(self, name=None, session=None, dependency_data_sources=None, subscribers=None, params=None):
+        params = dict(params or {})
+        params.setdefault('frequency', 10)
+        super().__init__(name=name, session=session, dependency_data_sources=dependency_data_sources,
+                         subscribers=subscribers, params=params)
+        self.markets = [self._parse_market(market) for market in
+                        self.params.get('markets', [('USDT', 'USD', 'SELL')])]
+        self.page_size = self.params.get('page_size', 10)
+        self.pages = self.params.get('pages', 1)
+        self.request_timeout = self.params.get('request_timeout', 10)
+        self.max_workers = self.params.get('max_workers', max(1, min(8, len(self.markets))))
+        self.offer_delta = BBOfferDelta()
+        self._delta_lock = threading.RLock()  # orders diffs against snapshots sent to new subscribers
+        self.history = None
+        if self.params.get('history_dir'):
+            self.history = BBP2POfferHistory(self.params['history_dir'],
+                                             flush_rows=self.params.get('history_flush_rows', 4096),
+                                             flush_interval=self.params.get('history_flush_interval', 5.0))
+        self._http = None
+        self._executor = None
+
+    @staticmethod
+    def _parse_market(market):
+        if isinstance(market, dict):
+            token, fiat, side = market['token'], market['fiat'], market['side']
+        else:
+            token, fiat, side = market
+        return token.upper(), fiat.upper(), side.upper()
+
+    @staticmethod
+    def market_key(token, fiat, side):
+        return f"{token}/{fiat}/{side}"
+
+    @staticmethod
+    def _number(value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _http_session(self):
+        if self._http is None:
+            self._http = requests.Session()
+            retries = Retry(total=2, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504),
+                            allowed_methods=('GET', 'POST'))
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers, max_retries=retries)
+            self._http.mount('https://', adapter)
+            self._http.mount('http://', adapter)
+        return self._http
+
+    @abstractmethod
+    def fetch_market(self, token, fiat, side):
+        """Return the current normalized offers of one market; raise one of fetch_errors on failure."""
+        pass
+
+    def _fetch_market_safely(self, market):
+        try:
+            return market, self.fetch_market(*market)
+        except self.fetch_errors as e:
+            BBLogger.log(f"Failed to fetch {self.exchange} P2P market {self.market_key(*market)}: {e}",
+                         level='warning')
+            return market, None
+
+    def poll(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix=f"{self.get_name()}-http")
+        started = time.time()
+        timestamp = None
+        deltas = []
+        for (token, fiat, side), offers in self._executor.map(self._fetch_market_safely, self.markets):
+            if offers is None:
+                continue
+            key = self.market_key(token, fiat, side)
+            with self._delta_lock:
+                delta = self.offer_delta.diff(key, offers)
+            if delta['added'] or delta['removed'] or delta['changed']:
+                timestamp = timestamp or time.time()
+                deltas.append(dict(delta, market=key, token=token, fiat=fiat, side=side))
+                if self.history is not None:
+                    self.history.append_delta(self.exchange, key, delta, timestamp)
+        if self.history is not None:
+            self.history.flush_if_due()  # quiet ticks still write out rows buffered earlier
+        self.set_total_processing_time(self._total_processing_time + time.time() - started)
+        self.increment_processed_items()
+        if not deltas:
+            return None
+        return {'exchange': self.exchange, 'timestamp': timestamp, 'markets': deltas}
+
+    def snapshot(self, token, fiat, side):
+        """The offers last seen for one market."""
+        with self._delta_lock:
+            return self.offer_delta.snapshot(self.market_key(token.upper(), fiat.upper(), side.upper()))
+
+    def subscribe(self, subscriber):
+        """Subscribe, first sending the current offers so deltas can be applied on top of them."""
+        with self._delta_lock:
+            super().subscribe(subscriber)
+            markets = []
+            for token, fiat, side in self.markets:
+                key = self.market_key(token, fiat, side)
+                if key in self.offer_delta.markets():
+                    markets.append({'market': key, 'token': token, 'fiat': fiat, 'side': side, 'snapshot': True,
+                                    'added': self.offer_delta.snapshot(key), 'removed': [], 'changed': []})
+            if markets:
+                subscriber.notify({'exchange': self.exchange, 'timestamp': time.time(), 'markets': markets})
+
+    def stop(self):
+        super().stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+        if self.history is not None:
+            self.history.close()
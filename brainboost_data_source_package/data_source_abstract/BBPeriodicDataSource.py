@@ -0,0 +1,111 @@
+# File: brainboost_data_source_package/data_source_abstract/BBPeriodicDataSource.py
+
+import queue
+import threading
+from abc import abstractmethod
+
+from brainboost_data_source_package.data_source_abstract.BBDataSource import BBDataSource
+from brainboost_data_source_package.data_source_abstract.BBFetchRecord import BBFetchRecord
+from brainboost_data_source_package.data_source_utils.BBScheduler import BBScheduler
+from brainboost_data_source_logger_package.BBLogger import BBLogger
+
+
+class BBPeriodicDataSource(BBDataSource):
+    """
+    Base class for data sources that produce data at regular intervals.
+
+    Subclasses implement poll(), which is called on the shared BBScheduler every
+    params['frequency'] seconds on a drift-free schedule. Supported params:
+      - frequency: seconds between polls (default 60)
+      - jitter: random delay in seconds added to each poll to spread load (default 0)
+      - missed_tick_policy: 'skip' (default) or 'coalesce' when a poll overruns
+    Whatever poll() returns (unless None) is sent to subscribers via update().
+    """
+
+    record_type = 'periodic'
+
+    def __init__(self, name=None, session=None, dependency_data_sources=None, subscribers=None, params=None):
+        super().__init__(name=name, session=session, dependency_data_sources=dependency_data_sources,
+                         subscribers=subscribers, params=params)
+        self.frequency = self.params.get('frequency', 60)
+        self.jitter = self.params.get('jitter', 0.0)
+        self.missed_tick_policy = self.params.get('missed_tick_policy', 'skip')
+        self.scheduler = BBScheduler.get_scheduler_singleton()
+        self._job = None
+        self._stopped = threading.Event()
+        self._records = None  # queue feeding iter_fetch() while it is being consumed
+
+    @abstractmethod
+    def poll(self):
+        """Produce one tick of data. Return a dict to publish, or None to publish nothing."""
+        pass
+
+    def _tick(self):
+        try:
+            data = self.poll()
+        except Exception as e:
+            BBLogger.log(f"Exception while polling {self.get_name()}: {e}", level='error')
+            if self.status_callback:
+                self.status_callback(self.get_name(), 'error')
+            self.stop()
+            return
+        if data is not None:
+            self.publish(data)
+
+    def publish(self, data):
+        """
+        Send one tick of data to subscribers and to a running iter_fetch(). Sources that
+        finish a tick outside poll() (e.g. on a pipeline thread) publish it through here.
+        """
+        self.update(data)
+        if self._records is not None:
+            self._records.put(data)
+
+    def start_periodic(self):
+        """Register this source with the shared scheduler (first poll runs immediately)."""
+        if self._job is not None:
+            return
+        self._stopped.clear()
+        self._job = self.scheduler.schedule_periodic(
+            self._tick, self.frequency, jitter=self.jitter,
+            missed_tick_policy=self.missed_tick_policy, start_delay=0, name=self.get_name()
+        )
+        BBLogger.log(f"Scheduled {self.get_name()} every {self.frequency} seconds.")
+        if self.status_callback:
+            self.status_callback(self.get_name(), 'started')
+
+    def set_frequency(self, frequency):
+        """Change the polling period of a running source."""
+        self.frequency = frequency
+        if self._job is not None:
+            self.scheduler.set_period(self._job, frequency)
+
+    def stop(self):
+        if self._job is not None:
+            self.scheduler.cancel(self._job)
+            self._job = None
+            BBLogger.log(f"Stopped periodic polling for {self.get_name()}.")
+        self._stopped.set()
+        super().stop()
+
+    def start_node(self):
+        self.start_periodic()
+
+    def iter_fetch(self):
+        """Start polling and yield a record for every published tick until stop() is called."""
+        self._records = queue.Queue()
+        self.start_periodic()
+        try:
+            while not self._stopped.is_set() or not self._records.empty():
+                try:
+                    data = self._records.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                yield BBFetchRecord(self.record_type, self.get_name(), data)
+        finally:
+            self._records = None
+            self.stop()
+
+    def fetch(self):
+        """Poll on schedule, blocking until stop() is called or a poll fails."""
+        self.consume_iter_fetch()
@@ -5,6 +5,8 @@ import json
 import logging
 import threading
 from brainboost_data_source_package.data_source_abstract.BBDataSource import BBDataSource
+from brainboost_data_source_package.data_source_utils.BBEventLog import BBEventLog
+from brainboost_data_source_package.data_source_utils.BBScheduler import BBScheduler
 from brainboost_data_source_logger_package.BBLogger import BBLogger  # Ensure BBLogger is correctly implemented
 
 
@@ -12,6 +14,8 @@ class BBRealTimeDataSource(BBDataSource):
     # Internal host and port (not exposed to users)
     _HOST = 'localhost'
     _PORT = 65432  # Fixed port for simplicity; adjust as needed
+    # Column carrying each record's event log offset through the batcher
+    _OFFSET_COLUMN = '_event_log_offset'
 
     def __init__(self, name=None, session=None, dependency_data_sources=None, subscribers=None, params=None):
         super().__init__(
@@ -23,11 +27,105 @@ class BBRealTimeDataSource(BBDataSource):
         )
         self._server = None
         self._connected_clients = set()
+        self._event_log = self._open_event_log()
+        self._local_offsets = {}  # id(subscriber) -> offset, for subscribers without a consumer_id
+        self._delivery_lock = threading.RLock()
         self._loop = asyncio.new_event_loop()
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
         BBLogger.log("Asyncio event loop started in a separate thread.")
 
+    def _open_event_log(self):
+        """
+        Open the optional durable event log configured through params.
+        Returns None when 'event_log_dir' is not set (in-memory delivery only).
+        """
+        log_dir = self.params.get('event_log_dir')
+        if not log_dir:
+            return None
+        return BBEventLog(
+            log_dir,
+            segment_bytes=self.params.get('event_log_segment_bytes', 64 * 1024 * 1024),
+            fsync_interval=self.params.get('event_log_fsync_interval', 0.05),
+            fsync_batch=self.params.get('event_log_fsync_batch', 256),
+            retention_bytes=self.params.get('event_log_retention_bytes'),
+            retention_seconds=self.params.get('event_log_retention_seconds')
+        )
+
+    @staticmethod
+    def _consumer_id(subscriber):
+        """The subscriber's 'consumer_id' attribute, under which its offset is stored in the log, or None."""
+        consumer_id = getattr(subscriber, 'consumer_id', None)
+        return str(consumer_id) if consumer_id else None
+
+    def _committed(self, subscriber):
+        consumer_id = self._consumer_id(subscriber)
+        if consumer_id is None:
+            return self._local_offsets.get(id(subscriber))
+        return self._event_log.committed(consumer_id)
+
+    def _commit(self, subscriber, offset):
+        """
+        Record the subscriber's next offset: on disk when it has a consumer_id, so it
+        survives restarts, otherwise only in memory for as long as this source lives.
+        """
+        consumer_id = self._consumer_id(subscriber)
+        if consumer_id is None:
+            self._local_offsets[id(subscriber)] = offset
+        else:
+            self._event_log.commit(consumer_id, offset)
+
+    def _catch_up(self, subscriber, upto=None):
+        """Replay logged records the subscriber has not acknowledged yet, committing as it goes."""
+        offset = self._committed(subscriber)
+        if offset is None:
+            offset = self._event_log.end_offset()
+        upto = self._event_log.end_offset() if upto is None else upto
+        while offset < upto:
+            records = self._event_log.read(offset, max_records=min(1000, upto - offset))
+            if not records:
+                break
+            for record_offset, record in records:
+                subscriber.notify(record)
+                offset = record_offset + 1
+                self._commit(subscriber, offset)
+        return offset
+
+    def update(self, data):
+        """
+        Notify subscribers. With an event log configured, the record is group-committed
+        to disk first and each subscriber advances its own offset, giving at-least-once
+        delivery across restarts. Subscribers taking batches (see BBDataSource.update)
+        get the record through the batcher, and their offsets advance when the batch
+        holding it has been delivered.
+        """
+        if self._event_log is None:
+            super().update(data)
+            return
+        offset = self._event_log.append(data)
+        with self._delivery_lock:
+            batch_subscribers = False
+            for subscriber in list(self.subscribers):
+                if self._batcher is not None and self._wants_batches(subscriber):
+                    batch_subscribers = True
+                    continue
+                committed = self._committed(subscriber)
+                if committed is not None and committed < offset:
+                    committed = self._catch_up(subscriber, upto=offset)
+                if committed is None or committed == offset:
+                    subscriber.notify(data)
+                    self._commit(subscriber, offset + 1)
+            if batch_subscribers:
+                self._batcher.append(dict(data, **{self._OFFSET_COLUMN: offset}))
+
+    def _deliver_batch(self, batch):
+        offsets = batch.columns.pop(self._OFFSET_COLUMN, None)
+        super()._deliver_batch(batch)
+        if offsets is not None and len(offsets):
+            for subscriber in list(self.subscribers):
+                if self._wants_batches(subscriber):
+                    self._commit(subscriber, int(offsets.max()) + 1)
+
     def _run_loop(self):
         """Run the asyncio event loop."""
         asyncio.set_event_loop(self._loop)
@@ -87,8 +185,7 @@ class BBRealTimeDataSource(BBDataSource):
 
     def _schedule_mock_update(self):
         """Schedule sending mock data after a 10-second delay."""
-        timer = threading.Timer(10, self._send_mock_data)
-        timer.start()
+        BBScheduler.get_scheduler_singleton().call_later(10, self._send_mock_data, name=f"{self.get_name()}.mock_update")
         BBLogger.log("Scheduled mock data update to be sent after 10 seconds.")
 
     def subscribe(self, subscriber):
@@ -97,7 +194,15 @@ class BBRealTimeDataSource(BBDataSource):
 
         :param subscriber: An instance of BBSubscriber to be notified.
         """
+        if self._event_log is not None:
+            consumer_id = self._consumer_id(subscriber)
+            for other in self.subscribers:
+                if consumer_id and other is not subscriber and self._consumer_id(other) == consumer_id:
+                    raise ValueError(f"Consumer id '{consumer_id}' is already used by subscriber {other}.")
         super().subscribe(subscriber)
+        if self._event_log is not None:
+            with self._delivery_lock:
+                self._catch_up(subscriber)
         self._start_server()
         self._schedule_mock_update()
 
@@ -119,6 +224,9 @@ class BBRealTimeDataSource(BBDataSource):
     def stop(self):
         """Public method to gracefully shut down the server."""
         self._stop_server()
+        super().stop()  # pending batches are delivered (and their offsets committed) before the log closes
+        if self._event_log is not None:
+            self._event_log.close()
 
     def fetch(self):
         """Implement the abstract fetch method. Left empty as per requirements."""
@@ -1,117 +1,205 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
+import json
+import queue
 import time
 
-def fetch_p2p_offers():
-    # Configure Selenium options
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run in headless mode
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    
-    # Initialize WebDriver
-    driver = webdriver.Chrome(options=chrome_options)
-    
-    try:
-        # Navigate to Binance P2P
-        driver.get("https://p2p.binance.com/en/trade/BTC_USDT")
-        
-        # Wait for the page to load
-        time.sleep(5)  # Adjust as necessary
-
-        # Example: Extract offer elements
-        offers = driver.find_elements(By.CLASS_NAME, "css-1sv7ku3")  # Update with actual class names
-        
-        for offer in offers:
-            try:
-                seller = offer.find_element(By.CLASS_NAME, "css-1gw9lzm").text  # Update class name
-                price = offer.find_element(By.CLASS_NAME, "css-1uvkrz3").text  # Update class name
-                min_amt = offer.find_element(By.CLASS_NAME, "css-1w0m5x8").text  # Update class name
-                max_amt = offer.find_element(By.CLASS_NAME, "css-1w0m5x8").text  # Update class name
-                payment_methods = [pm.text for pm in offer.find_elements(By.CLASS_NAME, "css-1pm6sv3")]  # Update class name
-                
-                print(f"Seller: {seller}, Price: {price}, Min: {min_amt}, Max: {max_amt}, Payment Methods: {payment_methods}")
-            except Exception as e:
-                print(f"Error extracting offer details: {e}")
-        
-    except Exception as e:
-        print(f"Error navigating to Binance P2P: {e}")
-    finally:
-        driver.quit()
-
-
-    import os
-import subprocess
-import time
-from brainboost_data_source_package.data_source_abstract.BBDataSource import BBDataSource
+import requests
+
+from brainboost_data_source_package.data_source_abstract.BBP2PDataSource import BBP2PDataSource
+from brainboost_data_source_package.data_source_utils.BBBrowserPool import BBBrowserPool
 from brainboost_data_source_logger_package.BBLogger import BBLogger
 
+BINANCE_P2P_PAGE = "https://p2p.binance.com/en/trade/all-payments/USDT?fiat=USD"
+BINANCE_P2P_SEARCH_URL = "https://p2p.binance.com/bapi/c2c/v2/friendly/c2c/adv/search"
+
+# Runs inside the P2P page: calls the same search endpoint the page uses, with the
+# browser's cookies and headers, and hands the JSON text back to Selenium.
+_BROWSER_SEARCH_SCRIPT = """
+const done = arguments[arguments.length - 1];
+fetch(arguments[0], {method: 'POST', headers: {'Content-Type': 'application/json'}, body: arguments[1],
+                     credentials: 'include'})
+    .then(response => response.text()).then(done).catch(error => done(JSON.stringify({error: String(error)})));
+"""
+
+
+def binance_search_payload(asset="USDT", fiat="USD", side="SELL", page=1, rows=10, pay_types=None):
+    """
+    Body of a P2P search request. ``side`` is the advertiser's side ('SELL': offers
+    selling ``asset``); Binance's tradeType is the taker's, so it is the opposite.
+    """
+    return {
+        "asset": asset,
+        "fiat": fiat,
+        "tradeType": "BUY" if side.upper() == "SELL" else "SELL",
+        "page": page,
+        "rows": rows,
+        "payTypes": list(pay_types or []),
+        "publisherType": None,
+        "merchantCheck": False
+    }
+
+
+def parse_binance_search_response(data):
+    """Return the offers of a search response, raising ValueError when it reports an error."""
+    if not isinstance(data, dict) or data.get("error") or (data.get("code") not in (None, "000000")) \
+            or data.get("success") is False:
+        message = data.get("message") or data.get("error") if isinstance(data, dict) else data
+        raise ValueError(f"Error from API: {message}")
+    return data.get("data") or []
+
+
+def request_binance_p2p_items(session, asset="USDT", fiat="USD", side="SELL", page=1, rows=10,
+                              pay_types=None, timeout=10):
+    """
+    Requests one page of P2P offers from the JSON endpoint used by the Binance P2P page.
+
+    Raises:
+        requests.exceptions.RequestException: On HTTP errors.
+        ValueError: When the API answers with an error code.
+    """
+    response = session.post(BINANCE_P2P_SEARCH_URL, timeout=timeout,
+                            json=binance_search_payload(asset, fiat, side, page, rows, pay_types))
+    response.raise_for_status()
+    return parse_binance_search_response(response.json())
+
+
+def fetch_p2p_offers(asset="USDT", fiat="USD", side="SELL"):
+    """Prints the first page of Binance P2P offers of one market."""
+    try:
+        items = request_binance_p2p_items(requests, asset, fiat, side)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Error fetching Binance P2P offers: {e}")
+        return
+    for item in items:
+        adv, advertiser = item.get("adv", {}), item.get("advertiser", {})
+        payment_methods = [method.get("tradeMethodName") or method.get("identifier")
+                           for method in adv.get("tradeMethods", [])]
+        print(f"Seller: {advertiser.get('nickName')}, Price: {adv.get('price')}, "
+              f"Min: {adv.get('minSingleTransAmount')}, Max: {adv.get('maxSingleTransAmount')}, "
+              f"Payment Methods: {payment_methods}")
+
+
+class BBBinanceP2POffersDataSource(BBP2PDataSource):
+    """
+    Polls Binance P2P offers for many (token, fiat, side) markets and publishes only
+    what changed since the previous poll (see BBP2PDataSource for the shared params).
+
+    Offers come from the JSON search endpoint the P2P web page itself calls, over
+    the pooled HTTP session. When that request is refused (e.g. bot protection),
+    the same search runs inside a warm browser from a BBBrowserPool instead: the
+    P2P page is loaded once per browser (waiting for the document to be ready, not
+    for a fixed delay) and every market is then fetched from that page, so one
+    browser serves all markets without navigating. After an API failure the
+    browser is used directly for 'api_retry_interval' seconds.
+
+    Extra params:
+      - browser_fallback: use the browser pool when the API fails (default True)
+      - browser_pool_size: warm browsers (default 1); browser_timeout: seconds (default 20)
+      - api_retry_interval: seconds before retrying the API after a failure (default 300)
+      - pay_types: Binance payment method identifiers to filter by (default all)
+    'page_size' is capped at 20, the endpoint's maximum.
+    """
 
-class BBAWSCodeCommitDataSource(BBDataSource):
-    def __init__(self, name=None, session=None, dependency_data_sources=[], subscribers=None, params=None):
+    exchange = 'binance'
+
+    def __init__(self, name=None, session=None, dependency_data_sources=None, subscribers=None, params=None):
         super().__init__(name=name, session=session, dependency_data_sources=dependency_data_sources,
                          subscribers=subscribers, params=params)
-        # Existing code…
-        self._total_items = 0
-        self._processed_items = 0
-        self._total_processing_time = 0.0
-        self._fetch_completed = False
-
-    def fetch(self):
-        start_time = time.time()
-        region = self.params.get('region', '')
-        target_directory = self.params.get('target_directory', '')
-        access_key = self.params.get('access_key', '')
-        secret_key = self.params.get('secret_key', '')
-        BBLogger.log(f"Starting AWS CodeCommit fetch for region '{region}' into '{target_directory}'.")
-
-        if not os.path.exists(target_directory):
-            os.makedirs(target_directory)
-            BBLogger.log(f"Created directory {target_directory}")
-
-        # Simulate obtaining repository names from AWS CodeCommit.
-        repos = self._get_repositories()
-        self._total_items = len(repos)
-        BBLogger.log(f"Found {self._total_items} repositories.")
-
-        for repo in repos:
-            step_start = time.time()
-            repo_name = repo  # In this dummy implementation, repo is just the name.
-            clone_url = f"https://git-codecommit.{region}.amazonaws.com/v1/repos/{repo_name}"
-            dest_path = os.path.join(target_directory, repo_name)
-            if os.path.exists(dest_path) and os.listdir(dest_path):
-                BBLogger.log(f"Repository {repo_name} already exists. Skipping clone.")
-            else:
-                try:
-                    BBLogger.log(f"Cloning repository {repo_name} from {clone_url} ...")
-                    subprocess.run(["git", "clone", clone_url, dest_path],
-                                   check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                except subprocess.CalledProcessError as e:
-                    BBLogger.log(f"Error cloning {repo_name}: {e.stderr.decode()}", level="error")
-            elapsed = time.time() - step_start
-            self._total_processing_time += elapsed
-            self._processed_items += 1
-            if self.progress_callback:
-                est_time = self.estimated_remaining_time()
-                self.progress_callback(self.get_name(), self.total_to_process(), self.total_processed(), est_time)
-        self._fetch_completed = True
-        BBLogger.log("AWS CodeCommit fetch process completed.")
-
-    def _get_repositories(self):
-        # Dummy implementation: replace with actual AWS API calls.
-        return ['Repo1', 'Repo2', 'Repo3']
+        self.page_size = min(self.page_size, 20)
+        self.pay_types = self.params.get('pay_types', [])
+        self.browser_fallback = self.params.get('browser_fallback', True)
+        self.browser_timeout = self.params.get('browser_timeout', 20)
+        self.api_retry_interval = self.params.get('api_retry_interval', 300)
+        self.browser_pool = BBBrowserPool(size=self.params.get('browser_pool_size', 1))
+        self._api_blocked_until = 0.0
+
+    def normalize_offer(self, item, token, fiat, side):
+        """Map a raw Binance search item onto the offer fields shared by the P2P sources."""
+        adv, advertiser = item.get('adv', {}), item.get('advertiser', {})
+        payment_methods = [str(method.get('identifier') or method.get('tradeMethodName'))
+                           for method in adv.get('tradeMethods', [])]
+        return {
+            'offer_id': str(adv.get('advNo')),
+            'exchange': self.exchange,
+            'token': token,
+            'fiat': fiat,
+            'side': side,
+            'price': self._number(adv.get('price')),
+            'available': self._number(adv.get('surplusAmount', adv.get('tradableQuantity'))),
+            'min_amount': self._number(adv.get('minSingleTransAmount')),
+            'max_amount': self._number(adv.get('dynamicMaxSingleTransAmount', adv.get('maxSingleTransAmount'))),
+            'payment_methods': sorted(payment_methods),
+            'trader': advertiser.get('nickName'),
+            'trader_id': advertiser.get('userNo')
+        }
+
+    def _search_api(self, token, fiat, side, page):
+        return request_binance_p2p_items(self._http_session(), token, fiat, side, page=page, rows=self.page_size,
+                                         pay_types=self.pay_types, timeout=self.request_timeout)
+
+    def _search_browser(self, token, fiat, side, page):
+        # Every failure is raised as ValueError, one of fetch_errors: it skips this market for one
+        # tick instead of stopping the source.
+        try:
+            from selenium.common.exceptions import WebDriverException
+            from selenium.webdriver.support.ui import WebDriverWait
+        except ImportError as e:
+            raise ValueError(f"The browser fallback needs selenium: {e}") from e
+
+        body = json.dumps(binance_search_payload(token, fiat, side, page, self.page_size, self.pay_types))
+        try:
+            with self.browser_pool.acquire(timeout=self.browser_timeout) as driver:
+                if not driver.current_url.startswith("https://p2p.binance.com"):
+                    driver.get(BINANCE_P2P_PAGE)
+                    WebDriverWait(driver, self.browser_timeout).until(
+                        lambda d: d.execute_script("return document.readyState") in ("interactive", "complete"))
+                driver.set_script_timeout(self.browser_timeout)
+                text = driver.execute_async_script(_BROWSER_SEARCH_SCRIPT, BINANCE_P2P_SEARCH_URL, body)
+        except queue.Empty:
+            raise ValueError(f"No browser of the pool was free within {self.browser_timeout} seconds.") from None
+        except WebDriverException as e:
+            raise ValueError(f"Browser search failed: {e}") from e
+        if not isinstance(text, str):
+            raise ValueError(f"Browser search returned {text!r}.")
+        return parse_binance_search_response(json.loads(text))
+
+    def _search(self, token, fiat, side, page):
+        if not self.browser_fallback or time.monotonic() >= self._api_blocked_until:
+            try:
+                return self._search_api(token, fiat, side, page)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                if not self.browser_fallback:
+                    raise
+                BBLogger.log(f"Binance P2P API request failed ({e}); using the browser pool "
+                             f"for {self.api_retry_interval} seconds.", level='warning')
+                self._api_blocked_until = time.monotonic() + self.api_retry_interval
+        return self._search_browser(token, fiat, side, page)
+
+    def fetch_market(self, token, fiat, side):
+        """Request every configured page of one market and return its normalized offers."""
+        offers = []
+        for page in range(1, self.pages + 1):
+            items = self._search(token, fiat, side, page)
+            offers.extend(self.normalize_offer(item, token, fiat, side) for item in items)
+            if len(items) < self.page_size:
+                break
+        return offers
+
+    def stop(self):
+        super().stop()
+        self.browser_pool.close()
 
     def get_icon(self):
-        # Complete AWS CodeCommit icon (placeholder; replace with full original if needed)
         return """<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 20 20">
-  <circle cx="10" cy="10" r="10" fill="#252F3E"/>
+  <rect width="20" height="20" rx="4" fill="#1E2329"/>
+  <path d="M10 3l2 2-2 2-2-2zM5 8l2 2-2 2-2-2zM15 8l2 2-2 2-2-2zM10 8l2 2-2 2-2-2zM10 13l2 2-2 2-2-2z" fill="#F0B90B"/>
 </svg>"""
 
     def get_connection_data(self):
         return {
-            "connection_type": "AWS",
-            "fields": ["region", "access_key", "secret_key", "target_directory"]
+            "connection_type": "BinanceP2P",
+            "fields": ["markets", "frequency", "page_size", "pages", "browser_fallback"]
         }
 
 
+if __name__ == "__main__":
+    fetch_p2p_offers()
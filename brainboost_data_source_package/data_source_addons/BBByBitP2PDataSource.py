@@ -1,42 +1,56 @@
 import requests
-import json
 
-def get_bybit_p2p_opportunities(base_currency="USDT", trade_type="SELL", fiat_currency="USD"):
+from brainboost_data_source_package.data_source_abstract.BBP2PDataSource import BBP2PDataSource
+
+BYBIT_P2P_URL = "https://api2.bybit.com/spot/api/otc/item/list"
+
+
+def request_bybit_p2p_items(session, base_currency="USDT", trade_type="SELL", fiat_currency="USD",
+                            size=10, page=1, timeout=10):
     """
-    Fetches P2P opportunities from Bybit's public API.
+    Requests one page of P2P offers from Bybit's public API.
 
-    Args:
-        base_currency (str): The cryptocurrency you want to buy/sell (e.g., USDT, BTC, ETH).
-        trade_type (str): Trade type, either "BUY" or "SELL".
-        fiat_currency (str): The fiat currency to filter by (e.g., USD, EUR).
+    Raises:
+        requests.exceptions.RequestException: On HTTP errors.
+        ValueError: When the API answers with an error code.
 
     Returns:
-        list: A list of P2P trading opportunities.
+        list: The raw offer items of the page.
     """
-    url = "https://api2.bybit.com/spot/api/otc/item/list"
-
     params = {
         "userId": "",
         "tokenId": base_currency,
         "currencyId": fiat_currency,
         "side": trade_type.upper(),
-        "size": 10,  # Number of results per page
-        "page": 1    # Starting page
+        "size": size,  # Number of results per page
+        "page": page
     }
+    response = session.get(BYBIT_P2P_URL, params=params, timeout=timeout)
+    response.raise_for_status()
+    data = response.json()
+    if data.get("ret_code") != 0:
+        raise ValueError(f"Error from API: {data.get('ret_msg')}")
+    return data.get("result", {}).get("items", []) or []
 
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
 
-        data = response.json()
+def get_bybit_p2p_opportunities(base_currency="USDT", trade_type="SELL", fiat_currency="USD", session=None):
+    """
+    Fetches P2P opportunities from Bybit's public API.
 
-        if data.get("ret_code") == 0:
-            p2p_opportunities = data.get("result", {}).get("items", [])
-            return p2p_opportunities
-        else:
-            print(f"Error from API: {data.get('ret_msg')}")
-            return []
+    Args:
+        base_currency (str): The cryptocurrency you want to buy/sell (e.g., USDT, BTC, ETH).
+        trade_type (str): Trade type, either "BUY" or "SELL".
+        fiat_currency (str): The fiat currency to filter by (e.g., USD, EUR).
+        session (requests.Session): Optional session whose connections are reused.
 
+    Returns:
+        list: A list of P2P trading opportunities.
+    """
+    try:
+        return request_bybit_p2p_items(session or requests, base_currency, trade_type, fiat_currency)
+    except ValueError as e:
+        print(e)
+        return []
     except requests.exceptions.RequestException as e:
         print(f"HTTP request failed: {e}")
         return []
@@ -62,86 +76,67 @@ def display_p2p_opportunities(opportunities):
         print("-" * 40)
 
 
-if __name__ == "__main__":
-    base_currency = input("Enter the cryptocurrency (e.g., USDT, BTC): ").upper()
-    trade_type = input("Enter trade type (BUY or SELL): ").upper()
-    fiat_currency = input("Enter fiat currency (e.g., USD, EUR): ").upper()
+class BBByBitP2PDataSource(BBP2PDataSource):
+    """
+    Polls Bybit P2P offers for many (token, fiat, side) markets and publishes only
+    what changed since the previous poll (see BBP2PDataSource for the params).
+    """
 
-    print("\nFetching P2P opportunities...\n")
+    exchange = 'bybit'
 
-    opportunities = get_bybit_p2p_opportunities(base_currency, trade_type, fiat_currency)
-    display_p2p_opportunities(opportunities)
+    def normalize_offer(self, item, token, fiat, side):
+        """Map a raw Bybit item onto the offer fields shared by the P2P sources."""
+        payments = item.get('payMethods')
+        if payments is not None:
+            payment_methods = [str(pm.get('name', pm.get('id', ''))) for pm in payments]
+        else:
+            payment_methods = [str(pm) for pm in item.get('payments') or []]
+        return {
+            'offer_id': str(item.get('id')),
+            'exchange': self.exchange,
+            'token': token,
+            'fiat': fiat,
+            'side': side,
+            'price': self._number(item.get('price')),
+            'available': self._number(item.get('lastQuantity', item.get('quantity'))),
+            'min_amount': self._number(item.get('minAmount')),
+            'max_amount': self._number(item.get('maxAmount')),
+            'payment_methods': sorted(payment_methods),
+            'trader': item.get('nickName', item.get('nickname')),
+            'trader_id': item.get('userId')
+        }
 
-import os
-import subprocess
-import time
-from brainboost_data_source_package.data_source_abstract.BBDataSource import BBDataSource
-from brainboost_data_source_logger_package.BBLogger import BBLogger
-
-
-class BBAWSCodeCommitDataSource(BBDataSource):
-    def __init__(self, name=None, session=None, dependency_data_sources=[], subscribers=None, params=None):
-        super().__init__(name=name, session=session, dependency_data_sources=dependency_data_sources,
-                         subscribers=subscribers, params=params)
-        # Existing code…
-        self._total_items = 0
-        self._processed_items = 0
-        self._total_processing_time = 0.0
-        self._fetch_completed = False
-
-    def fetch(self):
-        start_time = time.time()
-        region = self.params.get('region', '')
-        target_directory = self.params.get('target_directory', '')
-        access_key = self.params.get('access_key', '')
-        secret_key = self.params.get('secret_key', '')
-        BBLogger.log(f"Starting AWS CodeCommit fetch for region '{region}' into '{target_directory}'.")
-
-        if not os.path.exists(target_directory):
-            os.makedirs(target_directory)
-            BBLogger.log(f"Created directory {target_directory}")
-
-        # Simulate obtaining repository names from AWS CodeCommit.
-        repos = self._get_repositories()
-        self._total_items = len(repos)
-        BBLogger.log(f"Found {self._total_items} repositories.")
-
-        for repo in repos:
-            step_start = time.time()
-            repo_name = repo  # In this dummy implementation, repo is just the name.
-            clone_url = f"https://git-codecommit.{region}.amazonaws.com/v1/repos/{repo_name}"
-            dest_path = os.path.join(target_directory, repo_name)
-            if os.path.exists(dest_path) and os.listdir(dest_path):
-                BBLogger.log(f"Repository {repo_name} already exists. Skipping clone.")
-            else:
-                try:
-                    BBLogger.log(f"Cloning repository {repo_name} from {clone_url} ...")
-                    subprocess.run(["git", "clone", clone_url, dest_path],
-                                   check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                except subprocess.CalledProcessError as e:
-                    BBLogger.log(f"Error cloning {repo_name}: {e.stderr.decode()}", level="error")
-            elapsed = time.time() - step_start
-            self._total_processing_time += elapsed
-            self._processed_items += 1
-            if self.progress_callback:
-                est_time = self.estimated_remaining_time()
-                self.progress_callback(self.get_name(), self.total_to_process(), self.total_processed(), est_time)
-        self._fetch_completed = True
-        BBLogger.log("AWS CodeCommit fetch process completed.")
-
-    def _get_repositories(self):
-        # Dummy implementation: replace with actual AWS API calls.
-        return ['Repo1', 'Repo2', 'Repo3']
+    def fetch_market(self, token, fiat, side):
+        """Request every configured page of one market and return its normalized offers."""
+        session = self._http_session()
+        offers = []
+        for page in range(1, self.pages + 1):
+            items = request_bybit_p2p_items(session, token, side, fiat, size=self.page_size,
+                                            page=page, timeout=self.request_timeout)
+            offers.extend(self.normalize_offer(item, token, fiat, side) for item in items)
+            if len(items) < self.page_size:
+                break
+        return offers
 
     def get_icon(self):
-        # Complete AWS CodeCommit icon (placeholder; replace with full original if needed)
         return """<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 20 20">
-  <circle cx="10" cy="10" r="10" fill="#252F3E"/>
+  <rect width="20" height="20" rx="4" fill="#17181E"/>
+  <text x="10" y="14" font-size="9" font-family="Arial" font-weight="bold" fill="#F7A600" text-anchor="middle">BYB</text>
 </svg>"""
 
     def get_connection_data(self):
         return {
-            "connection_type": "AWS",
-            "fields": ["region", "access_key", "secret_key", "target_directory"]
+            "connection_type": "ByBitP2P",
+            "fields": ["markets", "frequency", "page_size", "pages"]
         }
 
+
+if __name__ == "__main__":
+    base_currency = input("Enter the cryptocurrency (e.g., USDT, BTC): ").upper()
+    trade_type = input("Enter trade type (BUY or SELL): ").upper()
+    fiat_currency = input("Enter fiat currency (e.g., USD, EUR): ").upper()
+
+    print("\nFetching P2P opportunities...\n")
+
+    opportunities = get_bybit_p2p_opportunities(base_currency, trade_type, fiat_currency)
+    display_p2p_opportunities(opportunities)
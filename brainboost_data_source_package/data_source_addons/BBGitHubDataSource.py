@@ -3,6 +3,7 @@ import subprocess
 import time
 import requests
 from brainboost_data_source_package.data_source_abstract.BBDataSource import BBDataSource
+from brainboost_data_source_package.data_source_abstract.BBFetchRecord import BBFetchRecord
 from brainboost_data_source_logger_package.BBLogger import BBLogger
 
 
@@ -12,6 +13,10 @@ class BBGitHubDataSource(BBDataSource):
                          subscribers=subscribers, params=params)
 
     def fetch(self):
+        self.consume_iter_fetch()
+
+    def iter_fetch(self):
+        """Clone the user's repositories, yielding a 'repository' record as each one is ready."""
         start_time = time.time()
         username = self.params.get('username')
         token = self.params.get('token')
@@ -48,6 +53,7 @@ class BBGitHubDataSource(BBDataSource):
 
             step_start = time.time()
             dest_path = os.path.join(target_directory, repo_name)
+            cloned = True
             if os.path.exists(dest_path) and os.listdir(dest_path):
                 BBLogger.log(f"Repository {repo_name} already exists. Skipping clone.")
             else:
@@ -58,6 +64,7 @@ class BBGitHubDataSource(BBDataSource):
                     BBLogger.log(f"Repository {repo_name} cloned successfully.")
                 except subprocess.CalledProcessError as e:
                     BBLogger.log(f"Error cloning {repo_name}: {e.stderr.decode()}", level="error")
+                    cloned = False
             elapsed = time.time() - step_start
             super().set_total_processing_time(super().get_total_processing_time() + elapsed)
             super().increment_processed_items()
@@ -69,6 +76,8 @@ class BBGitHubDataSource(BBDataSource):
                                        est_time)
                 BBLogger.log(f"Progress callback: {self.get_name()}, Total: {super().get_total_to_process()}, "
                              f"Processed: {super().get_total_processed()}, Estimated remaining time: {est_time:.2f} seconds")
+            yield BBFetchRecord('repository', self.get_name(),
+                                {'name': repo_name, 'clone_url': clone_url, 'path': dest_path, 'cloned': cloned})
         super().set_fetch_completed(True)
         BBLogger.log("GitHub fetch process completed.")
 
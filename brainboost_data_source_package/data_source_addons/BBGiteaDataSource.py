@@ -4,6 +4,8 @@ import requests
 from urllib.parse import urljoin
 
 from brainboost_data_source_package.data_source_abstract.BBDataSource import BBDataSource
+from brainboost_data_source_package.data_source_abstract.BBFetchRecord import BBFetchRecord
+from brainboost_data_source_package.data_source_utils.helpers import git_clone_path
 from brainboost_data_source_logger_package.BBLogger import BBLogger
 from brainboost_configuration_package.BBConfig import BBConfig
 
@@ -14,6 +16,10 @@ class BBGiteaDataSource(BBDataSource):
         self.params = params
 
     def fetch(self):
+        self.consume_iter_fetch()
+
+    def iter_fetch(self):
+        """Clone the user's repositories, yielding a 'repository' record as each one is processed."""
         base_url = self.params['base_url']
         username = self.params['username']
         target_directory = self.params['target_directory']
@@ -54,7 +60,11 @@ class BBGiteaDataSource(BBDataSource):
                 repo_name = repo.get('name', 'Unnamed Repository')
                 clone_url = repo.get('clone_url')
                 if clone_url:
-                    self.clone_repo(clone_url, target_directory, repo_name)
+                    cloned = self.clone_repo(clone_url, target_directory, repo_name)
+                    yield BBFetchRecord('repository', self.get_name(),
+                                        {'name': repo_name, 'clone_url': clone_url,
+                                         'path': git_clone_path(clone_url, target_directory),
+                                         'cloned': cloned})
                 else:
                     BBLogger.log(f"No clone URL found for repository '{repo_name}'. Skipping.")
 
@@ -68,10 +78,12 @@ class BBGiteaDataSource(BBDataSource):
             BBLogger.log(f"Cloning repository '{repo_name}' from {repo_clone_url}...")
             subprocess.run(['git', 'clone', repo_clone_url], cwd=target_directory, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             BBLogger.log(f"Successfully cloned '{repo_name}'.")
+            return True
         except subprocess.CalledProcessError as e:
             BBLogger.log(f"Error cloning repository '{repo_name}': {e.stderr.decode().strip()}")
         except Exception as e:
             BBLogger.log(f"Unexpected error cloning repository '{repo_name}': {e}")
+        return False
 
     # ------------------ New Methods ------------------
     def get_icon(self):
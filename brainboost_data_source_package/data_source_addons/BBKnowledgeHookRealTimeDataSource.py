@@ -1,15 +1,30 @@
 # brainboost_desktop_package/BBKnowledgeHooksRealTimeDataSource.py
 
+import os
+import queue
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Tuple, Dict, Any
 from brainboost_data_source_logger_package.BBLogger import BBLogger
 from brainboost_desktop_package.Desktop import Desktop
-from brainboost_data_source_package.data_source_abstract.BBDataSource import BBDataSource
+from brainboost_data_source_package.data_source_abstract.BBPeriodicDataSource import BBPeriodicDataSource
+from brainboost_data_source_package.data_source_utils.BBAdaptiveRate import BBAdaptiveRate
+from brainboost_data_source_package.data_source_utils.BBFrameDiff import BBFrameChangeDetector
+from brainboost_data_source_package.data_source_utils.BBSharedFrameRing import BBSharedFrameRing
+from brainboost_data_source_package.data_source_utils.BBTileOCRCache import BBTileOCRCache
 from datetime import datetime
 import numpy as np
 
 
-class BBKnowledgeHookRealTimeDataSource(BBDataSource):
+def _ocr_in_worker(image):
+    """OCR entry point for pipeline worker processes (each uses its own Desktop singleton)."""
+    return Desktop.get_desktop_singleton().extract_texts_with_rects(image)
+
+
+class BBKnowledgeHookRealTimeDataSource(BBPeriodicDataSource):
+    record_type = 'snapshot'
+
     def __init__(
         self,
         name: str = None,
@@ -26,56 +41,344 @@ class BBKnowledgeHookRealTimeDataSource(BBDataSource):
             session (str, optional): Session identifier.
             dependency_data_sources (list, optional): List of dependency data sources.
             subscribers (list, optional): List of subscribers.
-            params (dict, optional): Parameters including 'frequency' in seconds.
+            params (dict, optional): Parameters including 'frequency' in seconds
+                (plus 'jitter' and 'missed_tick_policy', see BBPeriodicDataSource).
+                'change_detection' enables frame-diff gating before OCR, tuned by
+                'change_tile_size', 'change_threshold' and 'change_downscale'.
+                'ocr_tile_cache' OCRs per 'ocr_tile_size' tile with an LRU result
+                cache capped at 'ocr_cache_max_bytes'; it needs a Desktop exposing
+                take_screenshot and extract_texts_with_rects (with snapshot() alone
+                every frame is OCRed whole, which is logged on the first poll).
+                'pipelined' runs capture, OCR ('ocr_workers' processes, default one per
+                core) and notification as separate stages joined by bounded queues
+                ('pipeline_queue_size'), dropping the oldest frames under load; with a
+                snapshot()-only Desktop it falls back to serial polling (logged).
+                'shared_memory_frames' publishes an 'image_descriptor' into a shared
+                memory ring of 'shared_memory_slots' frames instead of the 'image' array.
+                'adaptive_frequency' polls every 'min_frequency' seconds while frames
+                change and backs off by 'frequency_backoff' per unchanged frame up to
+                'max_frequency', keeping capture CPU within 'cpu_budget' (fraction of a
+                core); the effective rate is reported through status_callback.
+                'verbose' (default True) prints every snapshot's texts.
         """
         super().__init__(name, session, dependency_data_sources, subscribers, params)
         self.frequency = self.params.get('frequency', 5)  # frequency in seconds, default to 5 seconds
+        self._desktop = None
+        # Optional adaptive polling period driven by frame changes and a CPU budget
+        self._adaptive_rate = None
+        if self.params.get('adaptive_frequency', False):
+            self._adaptive_rate = BBAdaptiveRate(
+                min_period=self.params.get('min_frequency', 0.5),
+                max_period=self.params.get('max_frequency', 60.0),
+                backoff=self.params.get('frequency_backoff', 2.0),
+                cpu_budget=self.params.get('cpu_budget', 0.5)
+            )
+            self.frequency = self._adaptive_rate.period
+        self._frame_changed = True
+        # Optional frame-diff gating: skip OCR and notification when the screen did not change
+        self.gate_unchanged_frames = self.params.get('change_detection', False)
+        self._change_detector = None
+        if self.gate_unchanged_frames or self._adaptive_rate is not None:
+            self._change_detector = BBFrameChangeDetector(
+                tile_size=self.params.get('change_tile_size', 64),
+                threshold=self.params.get('change_threshold', 2.0),
+                downscale=self.params.get('change_downscale', 4)
+            )
+        # Optional staged pipeline: capture (scheduler tick) -> OCR process pool -> notify thread
+        self.pipelined = self.params.get('pipelined', False)
+        self.verbose = self.params.get('verbose', True)
+        self.dropped_frames = 0
+        self._pipeline_threads = []
+        self._pipeline_stop = threading.Event()
+        # Optional tiled OCR with results cached by tile content hash
+        self._ocr_cache = None
+        self.ocr_tile_size = self.params.get('ocr_tile_size', 256)
+        if self.params.get('ocr_tile_cache', False):
+            self._ocr_cache = BBTileOCRCache(max_bytes=self.params.get('ocr_cache_max_bytes', 32 * 1024 * 1024))
+        # Optional zero-copy delivery: frames go into shared memory, subscribers get descriptors
+        self.shared_memory_frames = self.params.get('shared_memory_frames', False)
+        self._frame_ring = None
+
+    def poll(self):
+        """
+        Take one desktop snapshot. Called by the shared scheduler every `frequency` seconds;
+        the returned snapshot (image plus extracted texts with their bounding rectangles)
+        is sent to subscribers. In pipelined mode the tick only captures the frame and
+        hands it to the OCR and notify stages, so nothing is returned here; the notify
+        stage publishes the snapshot instead.
+        """
+        if self._adaptive_rate is None:
+            return self._poll_frame()
+        started = time.thread_time()
+        try:
+            return self._poll_frame()
+        finally:
+            self._adapt_frequency(time.thread_time() - started)
+
+    def _poll_frame(self):
+        if self._desktop is None:
+            self._desktop = Desktop.get_desktop_singleton()
+            BBLogger.log(f"Starting BBKnowledgeHooksRealTimeDataSource with frequency {self.frequency} seconds.")
+            self._check_desktop_capabilities()
+
+        frame = self._capture_stage()
+        if frame is None:
+            return None
+        if self.pipelined:
+            self._start_pipeline()
+            self._enqueue_frame(frame)
+            return None
+        if frame['texts_with_rects'] is None:
+            plan = self._plan_ocr(frame['image'])
+            results = [self._ocr(tile) if cached is None else cached for _, _, _, tile, cached in plan]
+            frame['texts_with_rects'] = self._assemble_ocr(plan, results)
+        return self._build_snapshot(frame)
+
+    # ------------------------ Stages ----------------------------- #
+
+    def _capture_stage(self):
+        """Capture a frame and apply change gating. Returns a frame dict or None when unchanged."""
+        changed_tiles = None
+        if self._change_detector is None and self._ocr_cache is None and not self.pipelined:
+            # Take a snapshot
+            screenshot, texts_with_rects = self._desktop.snapshot()
+        else:
+            screenshot, texts_with_rects = self._capture()
+            if self._change_detector is not None:
+                changed_tiles = self._change_detector.changed_tiles(screenshot)
+                self._frame_changed = bool(changed_tiles)
+                if not changed_tiles and self.gate_unchanged_frames:
+                    BBLogger.log("Screen unchanged since last snapshot; skipping OCR and notification.")
+                    return None
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'image': screenshot,
+            'texts_with_rects': texts_with_rects,
+            'changed_tiles': changed_tiles
+        }
+
+    def _build_snapshot(self, frame):
+        """Notify-stage formatting: print the snapshot and build the dict sent to subscribers."""
+        screenshot = frame['image']
+        texts_with_rects = frame['texts_with_rects']
+        snapshot_time = frame['timestamp']
+
+        # Print the image and rects as text
+        if self.verbose:
+            print(f"Snapshot taken at {snapshot_time}")
+            print(f"Image shape: {screenshot.shape}")  # (height, width, channels)
+            print("Extracted Texts and their Bounding Rectangles:")
+            for text, rect in texts_with_rects:
+                print(f"Text: '{text}', Rect: {rect}")
 
-    def fetch(self):
+        snapshot_data = {
+            'timestamp': snapshot_time,
+            'texts_with_rects': texts_with_rects
+        }
+        if self.shared_memory_frames:
+            # Subscribers map the frame with BBSharedFrameRing.attach(descriptor).read(descriptor);
+            # changed tiles are sent as rects only, to be sliced from that view.
+            snapshot_data['image_descriptor'] = self._write_shared_frame(screenshot)
+            if frame['changed_tiles'] is not None:
+                snapshot_data['changed_tiles'] = [{'rect': rect} for rect in frame['changed_tiles']]
+            return snapshot_data
+        snapshot_data['image'] = screenshot
+        if frame['changed_tiles'] is not None:
+            # Views into the frame, so passing them on costs no copy
+            snapshot_data['changed_tiles'] = [
+                {'rect': rect, 'image': screenshot[rect[1]:rect[3], rect[0]:rect[2]]}
+                for rect in frame['changed_tiles']
+            ]
+        return snapshot_data
+
+    def _adapt_frequency(self, cpu_seconds):
         """
-        Fetch data in an infinite loop by taking desktop snapshots at specified frequency.
-        Each snapshot includes an image and extracted texts with their bounding rectangles.
+        Feed the last poll into the adaptive rate and reschedule when the period moves.
+        CPU is measured on the polling thread, so pipelined OCR workers are not counted.
         """
-        desktop = Desktop.get_desktop_singleton()
-        BBLogger.log(f"Starting BBKnowledgeHooksRealTimeDataSource with frequency {self.frequency} seconds.")
-        
+        period = self._adaptive_rate.observe(self._frame_changed, cpu_seconds)
+        if period == self.frequency:
+            return
+        self.set_frequency(period)
+        BBLogger.log(f"{self.get_name()} capture period now {period:.2f} seconds.")
         if self.status_callback:
-            self.status_callback(self.get_name(), 'started')
-        
+            self.status_callback(self.get_name(), f"running at {self._adaptive_rate.rate():.2f} captures/s")
+
+    def _write_shared_frame(self, image):
+        """Copy a frame into the shared memory ring, (re)allocating it when the frame outgrows the slots."""
+        if self._frame_ring is None or image.nbytes > self._frame_ring.slot_bytes:
+            if self._frame_ring is not None:
+                self._frame_ring.close()
+            self._frame_ring = BBSharedFrameRing(image.nbytes, slots=self.params.get('shared_memory_slots', 4))
+            BBLogger.log(f"Allocated shared frame ring {self._frame_ring.name} "
+                         f"({self._frame_ring.slots} x {image.nbytes} bytes).")
+        return self._frame_ring.write(image)
+
+    def _has_separate_ocr(self):
+        """Whether the Desktop can capture a frame without running OCR on it."""
+        return (callable(getattr(self._desktop, 'take_screenshot', None))
+                and callable(getattr(self._desktop, 'extract_texts_with_rects', None)))
+
+    def _check_desktop_capabilities(self):
+        """Log the features that cannot take effect with a snapshot()-only Desktop."""
+        if self._has_separate_ocr():
+            return
+        if self.pipelined:
+            BBLogger.log("Desktop has no separate take_screenshot/extract_texts_with_rects; "
+                         "'pipelined' falls back to serial snapshots.", level='warning')
+            self.pipelined = False
+        if self._ocr_cache is not None:
+            BBLogger.log("Desktop has no separate take_screenshot/extract_texts_with_rects; "
+                         "'ocr_tile_cache' has no effect and every frame is OCRed in full.", level='warning')
+
+    def _capture(self):
+        """
+        Grab a frame without running OCR when the Desktop exposes capture and OCR
+        separately (take_screenshot / extract_texts_with_rects). Otherwise fall back
+        to a full snapshot, in which case only notification can be gated.
+
+        Returns:
+            tuple: (image, texts_with_rects or None if OCR has not run yet)
+        """
+        if self._has_separate_ocr():
+            return self._desktop.take_screenshot(), None
+        return self._desktop.snapshot()
+
+    def _ocr(self, image):
+        """Run OCR on an image (full frame or tile), returning [(text, rect), ...]."""
+        return self._desktop.extract_texts_with_rects(image)
+
+    def _plan_ocr(self, image):
+        """
+        Split a frame into the pieces to OCR: the whole frame, or with the tile cache
+        enabled one entry per `ocr_tile_size` tile, carrying the cached result when the
+        tile's content hash is known. Text crossing a tile border is recognised per tile.
+
+        Returns:
+            list: (x, y, cache_key, tile, cached_results or None) per piece
+        """
+        if self._ocr_cache is None:
+            return [(0, 0, None, image, None)]
+        height, width = image.shape[:2]
+        size = self.ocr_tile_size
+        plan = []
+        for y in range(0, height, size):
+            for x in range(0, width, size):
+                tile = image[y:y + size, x:x + size]
+                key = self._ocr_cache.tile_key(tile)
+                plan.append((x, y, key, tile, self._ocr_cache.get(key)))
+        return plan
+
+    def _assemble_ocr(self, plan, results):
+        """Cache fresh tile results and rebuild texts_with_rects in frame coordinates."""
+        texts_with_rects = []
+        for (x, y, key, _, cached), tile_results in zip(plan, results):
+            if key is not None and cached is None:
+                self._ocr_cache.put(key, tile_results)
+            for text, (x1, y1, x2, y2) in tile_results:
+                texts_with_rects.append((text, (x1 + x, y1 + y, x2 + x, y2 + y)))
+        return texts_with_rects
+
+    # ------------------------ Pipelined mode ----------------------------- #
+
+    def _start_pipeline(self):
+        """Start the OCR dispatch and notify threads plus the OCR process pool (once)."""
+        if self._pipeline_threads:
+            return
+        workers = self.params.get('ocr_workers') or os.cpu_count() or 1
+        self._ocr_pool = ProcessPoolExecutor(max_workers=workers)
+        self._capture_queue = queue.Queue(maxsize=self.params.get('pipeline_queue_size', 2))
+        self._inflight_queue = queue.Queue(maxsize=workers * 2)
+        self._pipeline_stop = threading.Event()
+        self._pipeline_threads = [
+            threading.Thread(target=self._ocr_dispatch_loop, name=f"{self.get_name()}-ocr", daemon=True),
+            threading.Thread(target=self._notify_loop, name=f"{self.get_name()}-notify", daemon=True)
+        ]
+        for thread in self._pipeline_threads:
+            thread.start()
+        BBLogger.log(f"Knowledge hook pipeline started with {workers} OCR workers.")
+
+    def _enqueue_frame(self, frame):
+        """Hand a captured frame to the OCR stage, dropping the oldest waiting frame when full."""
+        while True:
+            try:
+                self._capture_queue.put_nowait(frame)
+                return
+            except queue.Full:
+                if self._pipeline_stop.is_set():
+                    return  # stopping: never drop the shutdown sentinel to make room
+                try:
+                    self._capture_queue.get_nowait()
+                    self.dropped_frames += 1
+                except queue.Empty:
+                    pass
+
+    def _ocr_dispatch_loop(self):
+        """OCR stage: submit the uncached pieces of each frame to the process pool."""
+        capture_queue, inflight_queue = self._capture_queue, self._inflight_queue
+        while True:
+            frame = capture_queue.get()
+            if frame is None:
+                inflight_queue.put(None)
+                return
+            if frame['texts_with_rects'] is not None:
+                inflight_queue.put((frame, None, None))
+                continue
+            plan = self._plan_ocr(frame['image'])
+            futures = [None if cached is not None else self._ocr_pool.submit(_ocr_in_worker, tile)
+                       for _, _, _, tile, cached in plan]
+            # Blocks while too many frames are in flight, which backs up and drops captures.
+            inflight_queue.put((frame, plan, futures))
+
+    def _notify_loop(self):
+        """Notify stage: wait for OCR results in capture order and publish the snapshots."""
+        inflight_queue, stopping = self._inflight_queue, self._pipeline_stop
         while True:
+            item = inflight_queue.get()
+            if item is None:
+                return
+            if stopping.is_set():
+                continue  # stopped: drain the frames still in flight without publishing them
+            frame, plan, futures = item
             try:
-                # Take a snapshot
-                screenshot, texts_with_rects = desktop.snapshot()
-                
-                # Print the image and rects as text
-                snapshot_time = datetime.now().isoformat()
-                print(f"Snapshot taken at {snapshot_time}")
-                print(f"Image shape: {screenshot.shape}")  # (height, width, channels)
-                print("Extracted Texts and their Bounding Rectangles:")
-                for text, rect in texts_with_rects:
-                    print(f"Text: '{text}', Rect: {rect}")
-                
-                # Notify subscribers with snapshot data
-                snapshot_data = {
-                    'timestamp': snapshot_time,
-                    'image': screenshot,
-                    'texts_with_rects': texts_with_rects
-                }
-                self.update(snapshot_data)
-                
-                # Optionally, use progress_callback if needed
-                if self.progress_callback:
-                    # Example: You can implement progress tracking here if applicable
-                    pass  # Replace with actual progress tracking logic
-                
-                # Sleep for the specified frequency time
-                time.sleep(self.frequency)
-            
+                if plan is not None:
+                    results = [cached if future is None else future.result()
+                               for (_, _, _, _, cached), future in zip(plan, futures)]
+                    frame['texts_with_rects'] = self._assemble_ocr(plan, results)
+                self.publish(self._build_snapshot(frame))
             except Exception as e:
-                BBLogger.log(f"Exception in fetch: {e}")
+                BBLogger.log(f"Exception in knowledge hook pipeline: {e}", level='error')
                 if self.status_callback:
                     self.status_callback(self.get_name(), 'error')
-                break  # Exit the loop on error
+
+    def _stop_pipeline(self):
+        if not self._pipeline_threads:
+            return
+        self._pipeline_stop.set()
+        # Make room for the sentinel; once the stop is set, captures no longer drop it.
+        while True:
+            try:
+                self._capture_queue.get_nowait()
+            except queue.Empty:
+                break
+        self._capture_queue.put(None)
+        # stop() may be called by a subscriber from the notify thread. Joining from there would
+        # deadlock, so neither thread is joined (both exit on the sentinel once notify returns)
+        # and the pool is not waited for.
+        on_pipeline_thread = threading.current_thread() in self._pipeline_threads
+        if not on_pipeline_thread:
+            for thread in self._pipeline_threads:
+                thread.join()
+        self._ocr_pool.shutdown(wait=not on_pipeline_thread)
+        self._pipeline_threads = []
+        BBLogger.log(f"Knowledge hook pipeline stopped ({self.dropped_frames} frames dropped).")
+
+    def stop(self):
+        super().stop()
+        self._stop_pipeline()
+        if self._frame_ring is not None:
+            self._frame_ring.close()
+            self._frame_ring = None
 
     def get_icon(self) -> str:
         """
@@ -1,23 +1,34 @@
+import functools
 import glob
 import logging
 import os
+import queue
 import re
 import sys
 import tempfile
+import threading
 import time
+import wave
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
-from pydub import AudioSegment  # Used to convert audio format
+import numpy as np
 from sumy.nlp.tokenizers import Tokenizer
 from sumy.parsers.plaintext import PlaintextParser
 from sumy.summarizers.lex_rank import LexRankSummarizer
-from transformers import pipeline
+from transformers import Pipeline, pipeline
 from yt_dlp import YoutubeDL
 import whisper
 
 from brainboost_configuration_package.BBConfig import BBConfig
 from brainboost_data_source_logger_package.BBLogger import BBLogger
 from brainboost_data_source_package.data_source_abstract.BBDataSource import BBDataSource
+from brainboost_data_source_package.data_source_abstract.BBFetchRecord import BBFetchRecord
+from brainboost_data_source_package.data_source_utils.BBAudioChunker import BBAudioChunker
+from brainboost_data_source_package.data_source_utils.BBAudioDecoder import BBAudioDecoder
+from brainboost_data_source_package.data_source_utils.BBModelRegistry import BBModelRegistry
+from brainboost_data_source_package.data_source_utils.BBTranscriptCache import BBTranscriptCache
 
 
 # Configuración de logging a nivel de módulo
@@ -28,6 +39,47 @@ logging.basicConfig(
 )
 
 
+# Fuente usada por los procesos de transcripción del modo por lotes (una por proceso)
+_worker_source = None
+
+
+def _init_transcription_worker(params):
+    """Inicializador de los procesos de transcripción: crea la fuente y precarga Whisper."""
+    global _worker_source
+    # Los procesos de trabajo transcriben secuencialmente: no abren pools propios
+    _worker_source = BBYouTubeDataSource(params=dict(params, warm_up_models=False, parallel_transcription=False))
+    if params.get('torch_threads'):
+        import torch
+        torch.set_num_threads(params['torch_threads'])
+    _worker_source.model_registry.warm_up([_worker_source.whisper_model_key()])
+
+
+def _transcribe_in_worker(raw_path):
+    """Transcribe el audio decodificado (float32 crudo) que dejó una descarga del modo por lotes."""
+    model = _worker_source.model_registry.get(_worker_source.whisper_model_key())
+    return _worker_source.transcribe_audio(BBAudioDecoder.open_raw(raw_path), model)
+
+
+def load_whisper_model(model_size):
+    """Cargador del registro de modelos para Whisper (no retiene ninguna instancia de la fuente)."""
+    print(f"Cargando modelo Whisper ({model_size})...")
+    logging.info(f"Cargando modelo Whisper '{model_size}'.")
+    return whisper.load_model(model_size)
+
+
+def load_summarization_pipeline(model_name):
+    """Cargador del registro de modelos para un pipeline de resumen de Hugging Face."""
+    logging.info(f"Cargando modelo de resumen '{model_name}'.")
+    return pipeline("summarization", model=model_name)
+
+
+def _transcribe_chunk_in_worker(samples):
+    """Transcribe un fragmento de audio (float32, 16 kHz); los tiempos son relativos al fragmento."""
+    model = _worker_source.model_registry.get(_worker_source.whisper_model_key())
+    result = model.transcribe(samples, language="es")
+    return {'language': result.get('language', "es"), 'segments': result.get('segments', [])}
+
+
 class BBYouTubeDataSource(BBDataSource):
     # Definir constantes a nivel de clase
     WHISPER_MODEL_SIZE = 'base'  # Puedes ajustar según las capacidades de tu sistema
@@ -35,35 +87,322 @@ class BBYouTubeDataSource(BBDataSource):
     ENGLISH_SUMMARIZATION_MODEL = "facebook/bart-large-cnn"
 
     def __init__(self, name=None, session=None, dependency_data_sources=[], subscribers=None, params=None):
+        """
+        Parámetros opcionales (params):
+          - model_cache_max_models: máximo de modelos residentes en el registro del proceso. El límite
+            es global: afecta a todas las fuentes del proceso (ver BBModelRegistry.set_limits).
+          - model_cache_max_bytes: memoria máxima estimada de los modelos residentes (también global).
+          - warm_up_models: si es True, carga Whisper y el resumidor en inglés al crear la fuente.
+          - parallel_transcription: si es True, los audios largos se dividen en silencios en fragmentos
+            de 'transcription_chunk_seconds' (con 'transcription_overlap_seconds' de solape) que se
+            transcriben en 'chunk_workers' procesos (por defecto uno por núcleo). Los pools de
+            procesos (este y el de 'transcription_workers' del modo por lotes) se crean al usarse
+            por primera vez y se mantienen, con Whisper cargado, hasta stop().
+          - memmap_audio_seconds: a partir de esta duración el audio decodificado se mapea desde
+            disco en lugar de mantenerse en memoria (por defecto 1800).
+          - transcript_cache: si es True activa la caché persistente de transcripciones y resúmenes
+            (por (id del video, modelo, idioma, resumidor)), guardada en 'transcript_cache_dir'
+            (por defecto ~/.cache/brainboost_youtube) y limitada a 'transcript_cache_max_bytes'
+            (por defecto 512 MB). Desactivada por defecto.
+          - summary_batch_size: fragmentos por llamada al pipeline de resumen (por defecto 8).
+          - summary_chunk_tokens: tokens máximos por fragmento (por defecto el máximo del modelo).
+          - summary_map_reduce: si es True, los resúmenes parciales se vuelven a resumir por niveles
+            hasta obtener un único resumen.
+          - summary_map_reduce_levels: niveles máximos de re-resumen con summary_map_reduce (por defecto 3).
+        """
         super().__init__(name=name, session=session, dependency_data_sources=dependency_data_sources,
                          subscribers=subscribers, params=params)
-        self.params = params
+        self._processing_time_lock = threading.Lock()
+        # Pools de procesos de transcripción, creados al usarse por primera vez (ver _worker_pool)
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+        # Los modelos se cargan una sola vez por proceso y se comparten entre instancias
+        self.model_registry = BBModelRegistry.get_registry_singleton()
+        if self.params.get('model_cache_max_models') or self.params.get('model_cache_max_bytes'):
+            self.model_registry.set_limits(
+                max_models=self.params.get('model_cache_max_models'),
+                max_memory_bytes=self.params.get('model_cache_max_bytes')
+            )
+        # Cargadores a nivel de módulo, identificados por la configuración del modelo
+        self.model_registry.register(self.whisper_model_key(),
+                                     functools.partial(load_whisper_model, self.WHISPER_MODEL_SIZE))
+        self.model_registry.register(self.summarizer_model_key(),
+                                     functools.partial(load_summarization_pipeline, self.ENGLISH_SUMMARIZATION_MODEL))
+        if self.params.get('warm_up_models', False):
+            self.warm_up_models()
+        # Una sola decodificación con ffmpeg a float32 mono de 16 kHz, lo que espera Whisper
+        self.audio_decoder = BBAudioDecoder(
+            sample_rate=whisper.audio.SAMPLE_RATE,
+            memmap_threshold_seconds=self.params.get('memmap_audio_seconds', 1800)
+        )
+        # Caché en disco compartida entre procesos: un video ya procesado no se vuelve a descargar
+        self.transcript_cache = None
+        if self.params.get('transcript_cache', False):
+            self.transcript_cache = BBTranscriptCache(
+                self.params.get('transcript_cache_dir',
+                                os.path.join(os.path.expanduser('~'), '.cache', 'brainboost_youtube')),
+                max_bytes=self.params.get('transcript_cache_max_bytes', 512 * 1024 * 1024)
+            )
 
     def fetch(self, youtube_link, language='es'):
         """
         Método principal para descargar, transcribir y resumir un video de YouTube.
+        También acepta una lista de URLs o un enlace de playlist o canal (ver iter_fetch_batch).
 
-        :param youtube_link: URL del video de YouTube.
+        :param youtube_link: URL del video de YouTube, de una playlist/canal, o lista de URLs.
+        :param language: Idioma del video ('es' para español, 'en' para inglés).
+        """
+        self.consume_iter_fetch(youtube_link, language)
+
+    def iter_fetch(self, youtube_link, language='es'):
+        """
+        Igual que fetch(), pero produce registros a medida que se generan:
+        un 'transcript_segment' por cada segmento de Whisper y un 'summary' al final de cada video.
+
+        :param youtube_link: URL del video de YouTube, de una playlist/canal, o lista de URLs.
         :param language: Idioma del video ('es' para español, 'en' para inglés).
         """
         if not youtube_link:
             logging.error("No se proporcionó una URL de YouTube.")
             raise ValueError("Se requiere una URL de YouTube para procesar.")
 
+        if self.is_batch_request(youtube_link):
+            yield from self.iter_fetch_batch(youtube_link, language)
+            return
+
         video_url = youtube_link
         logging.info(f"Iniciado procesamiento de la URL del video: '{video_url}'.")
 
-        # Obtener información del video (por ejemplo, título) usando yt-dlp
+        video_id = self.video_id_from_url(video_url)
+        cached = self._cached_transcript(video_id, language)
+        if cached is not None:
+            print(f"Procesando Video: {cached['title']} (transcripción en caché)")
+            yield from self._transcript_records(video_url, cached['title'], cached['transcript'],
+                                                cached['language'], cached['segments'], language, video_id)
+            return
+
+        print(f"URL: {video_url}")
+
+        # Obtener el modelo Whisper del registro (se carga solo la primera vez en el proceso)
         try:
-            with YoutubeDL({'quiet': True, 'skip_download': True, 'forcejson': True}) as ydl:
-                info_dict = ydl.extract_info(video_url, download=False)
-                video_title = info_dict.get('title', 'Título_Desconocido')
+            whisper_model = self.model_registry.get(self.whisper_model_key())
         except Exception as e:
-            logging.error(f"Error al obtener la información del video para {video_url}: {e}")
-            raise RuntimeError(f"Error al obtener la información del video: {e}")
+            logging.error(f"Error al cargar el modelo Whisper: {e}")
+            raise RuntimeError(f"Error al cargar el modelo Whisper: {e}")
 
-        print(f"Procesando Video: {video_title}")
-        print(f"URL: {video_url}")
+        # Crear una carpeta temporal para almacenar el audio descargado
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            # Una sola llamada a yt-dlp: la información del video llega con la descarga
+            samples, info_dict = self.download_and_decode(video_url, tmpdirname)
+            video_title = info_dict.get('title', 'Título_Desconocido')
+            video_id = info_dict.get('id') or video_id
+            print(f"Procesando Video: {video_title}")
+            duration = self.audio_decoder.duration(samples)
+            print(f"Duración del audio (s): {duration:.1f}")
+            logging.info(f"Duración del audio: {duration:.1f} segundos")
+
+            # Transcribir las muestras decodificadas usando Whisper
+            transcript, lang, segments = self.transcribe_audio(samples, whisper_model)
+            self._cache_transcript(video_id, language, video_title, transcript, lang, segments)
+            yield from self._transcript_records(video_url, video_title, transcript, lang, segments,
+                                                language, video_id)
+
+    def iter_fetch_batch(self, sources, language='es'):
+        """
+        Procesa varios videos solapando descargas y transcripciones.
+
+        Las descargas (limitadas por la red) corren en paralelo en 'download_workers' hilos y
+        dejan el audio listo en una cola acotada ('transcription_queue_size'); un pool de
+        'transcription_workers' procesos toma de ella, de modo que el siguiente video ya está
+        en disco cuando un proceso queda libre. El resumen se hace en este proceso y el
+        progreso se informa por video mediante progress_callback.
+
+        :param sources: Lista de URLs, o URL de playlist/canal (o lista que las mezcle).
+        :param language: Idioma de los videos ('es' para español, 'en' para inglés).
+        """
+        videos = self.expand_video_urls(sources)
+        self.set_total_items(len(videos))
+        self.set_processed_items(0)
+        self.set_total_processing_time(0.0)
+        self.set_fetch_completed(False)
+        if not videos:
+            logging.warning("No se encontraron videos para procesar.")
+            self.set_fetch_completed(True)
+            return
+
+        # Los videos ya en caché se entregan de inmediato; solo el resto se descarga
+        to_download = []
+        for video_url, video_title in videos:
+            video_id = self.video_id_from_url(video_url)
+            cached = self._cached_transcript(video_id, language)
+            if cached is None:
+                to_download.append((video_url, video_title))
+                continue
+            try:
+                yield from self._transcript_records(video_url, cached['title'], cached['transcript'],
+                                                    cached['language'], cached['segments'], language, video_id)
+            except Exception as e:
+                logging.error(f"Error al procesar {video_url}: {e}")
+            finally:
+                self._video_done()
+        if not to_download:
+            self.set_fetch_completed(True)
+            return
+
+        transcription_workers = self.params.get('transcription_workers', min(2, os.cpu_count() or 1))
+        download_workers = self.params.get('download_workers', 4)
+        ready = queue.Queue(maxsize=self.params.get('transcription_queue_size', transcription_workers))
+        cancelled = threading.Event()
+        batch_start = time.time()
+        logging.info(f"Procesando {len(videos)} videos con {download_workers} descargas y "
+                     f"{transcription_workers} procesos de transcripción.")
+
+        # Pool persistente: Whisper se carga una vez por proceso y se reutiliza entre lotes
+        transcribers = self._worker_pool('batch', transcription_workers, self.params)
+        with tempfile.TemporaryDirectory() as tmpdirname, \
+                ThreadPoolExecutor(max_workers=download_workers) as downloads:
+            for video_url, video_title in to_download:
+                downloads.submit(self._download_to_queue, video_url, video_title, tmpdirname, ready, cancelled)
+
+            try:
+                yield from self._drain_batch(ready, len(to_download), transcribers, transcription_workers, language)
+            finally:
+                # Si el consumidor abandona el generador, liberar las descargas bloqueadas en la cola
+                cancelled.set()
+                downloads.shutdown(wait=False, cancel_futures=True)
+
+        self.set_fetch_completed(True)
+        logging.info(f"Lote de {len(videos)} videos procesado en {time.time() - batch_start:.1f} segundos.")
+
+    def _drain_batch(self, ready, remaining, transcribers, transcription_workers, language):
+        """Bucle del modo por lotes: reparte los audios descargados y produce los registros terminados."""
+        pending = {}  # future -> (url, título, id del video, audio crudo, pool)
+        retried = set()  # audios ya reenviados tras romperse el pool
+        try:
+            while remaining or pending:
+                # Mantener ocupados todos los procesos con los videos ya descargados
+                while remaining and len(pending) < transcription_workers:
+                    try:
+                        video_url, video_title, video_id, raw_path, error = ready.get(block=not pending)
+                    except queue.Empty:
+                        break
+                    remaining -= 1
+                    if error is not None:
+                        logging.error(f"Error al preparar {video_url}: {error}")
+                        self._video_done()
+                        continue
+                    future = transcribers.submit(_transcribe_in_worker, raw_path)
+                    pending[future] = (video_url, video_title, video_id, raw_path, transcribers)
+
+                done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    video_url, video_title, video_id, raw_path, pool = pending.pop(future)
+                    resubmitted = False
+                    try:
+                        try:
+                            transcript, lang, segments = future.result()
+                        except BrokenProcessPool:
+                            # Un proceso murió (p. ej. por falta de memoria): pool nuevo y un reintento por video
+                            self._discard_pool('batch', pool)
+                            transcribers = self._worker_pool('batch', transcription_workers, self.params)
+                            if raw_path in retried:
+                                raise
+                            retried.add(raw_path)
+                            future = transcribers.submit(_transcribe_in_worker, raw_path)
+                            pending[future] = (video_url, video_title, video_id, raw_path, transcribers)
+                            resubmitted = True
+                            continue
+                        self._cache_transcript(video_id, language, video_title, transcript, lang, segments)
+                        yield from self._transcript_records(video_url, video_title, transcript,
+                                                            lang, segments, language, video_id)
+                    except Exception as e:
+                        logging.error(f"Error al procesar {video_url}: {e}")
+                    finally:
+                        if not resubmitted:
+                            if os.path.exists(raw_path):
+                                os.remove(raw_path)
+                            self._video_done()
+        finally:
+            # El pool sobrevive al lote: no dejarle trabajo de un lote abandonado
+            for future in pending:
+                future.cancel()
+
+    def _download_to_queue(self, video_url, video_title, base_dir, ready, cancelled):
+        """Tarea de descarga del modo por lotes: deja (url, título, id, audio crudo, error) en la cola."""
+        step_start = time.time()
+        video_id = self.video_id_from_url(video_url)
+        try:
+            video_dir = tempfile.mkdtemp(dir=base_dir)
+            raw_path = os.path.join(video_dir, 'audio.f32')
+            _, info_dict = self.download_and_decode(video_url, video_dir, raw_path=raw_path)
+            video_title = video_title or info_dict.get('title', 'Título_Desconocido')
+            item = (video_url, video_title, info_dict.get('id') or video_id, raw_path, None)
+        except Exception as e:
+            item = (video_url, video_title or video_url, video_id, None, e)
+        # Varios hilos de descarga suman a la vez al tiempo de procesamiento
+        with self._processing_time_lock:
+            self._total_processing_time += time.time() - step_start
+        # La cola acotada frena las descargas cuando los procesos de transcripción van atrasados
+        while not cancelled.is_set():
+            try:
+                ready.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                continue
+
+    def _worker_pool(self, name, workers, worker_params):
+        """
+        Pool de procesos de transcripción 'name', creado la primera vez que se usa y
+        mantenido hasta stop(), para que cada proceso cargue Whisper una sola vez. Un pool roto
+        (un proceso murió) se descarta con _discard_pool y se vuelve a crear.
+        """
+        with self._pools_lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                pool = self._pools[name] = ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_transcription_worker, initargs=(worker_params,))
+                logging.info(f"Pool de transcripción '{name}' creado con {workers} procesos.")
+            return pool
+
+    def _discard_pool(self, name, pool):
+        """Saca del caché un pool roto (un proceso murió) y lo cierra; el próximo uso crea otro."""
+        with self._pools_lock:
+            if self._pools.get(name) is pool:
+                del self._pools[name]
+                logging.warning(f"Pool de transcripción '{name}' roto; se creará uno nuevo.")
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def stop(self):
+        """Cierra los pools de procesos de transcripción."""
+        super().stop()
+        with self._pools_lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _video_done(self):
+        self.increment_processed_items()
+        if self.progress_callback:
+            est_time = self.estimated_remaining_time()
+            self.progress_callback(self.get_name(), self.get_total_to_process(), self.get_total_processed(), est_time)
+
+    def _transcript_records(self, video_url, video_title, transcript, lang, segments, language, video_id=None):
+        """
+        Produce los segmentos y el resumen de un video transcrito y guarda el resumen en disco.
+        Con video_id el resumen se toma de la caché, o se genera y se guarda en ella.
+        """
+        if not transcript.strip():
+            logging.warning("La transcripción estaba vacía después del procesamiento del audio.")
+            raise RuntimeError("No se generó ninguna transcripción.")
+        print("Transcripción completada.")
+        logging.info("Transcripción completada exitosamente.")
+        for segment in segments:
+            yield BBFetchRecord('transcript_segment', self.get_name(), {
+                'video_url': video_url,
+                'start': segment.get('start'),
+                'end': segment.get('end'),
+                'text': segment.get('text', '')
+            })
 
         # Crear un título sanitizado para usar en nombres de archivos
         sanitized_title = self.sanitize_filename(video_title)
@@ -71,90 +410,169 @@ class BBYouTubeDataSource(BBDataSource):
         summary_filename = f"{sanitized_title}-{timestamp}.txt"
         summary_filepath = os.path.join(os.getcwd(), summary_filename)
 
-        # Cargar el modelo Whisper para la transcripción
-        print(f"Cargando modelo Whisper ({self.WHISPER_MODEL_SIZE})...")
-        logging.info(f"Cargando modelo Whisper '{self.WHISPER_MODEL_SIZE}'.")
+        summary_key = ('summary', video_id, self.WHISPER_MODEL_SIZE, language, self.summarizer_id(language))
+        cached = self.transcript_cache.get(*summary_key) if self.transcript_cache and video_id else None
+        if cached is not None:
+            summary, summary_model = cached['summary'], cached['summary_model']
+            logging.info(f"Resumen de {video_id} obtenido de la caché.")
+        else:
+            # Determinar el modelo de resumen según el idioma
+            summarizer, summary_model = self.get_summarizer(language)
+
+            # Generar el resumen del texto transcrito
+            print("Generando resumen...")
+            logging.info("Iniciando resumen de la transcripción.")
+            summary = self.summarize_text(transcript, summarizer)
+
+            if not summary.strip():
+                logging.warning("El resumen está vacío después de la generación.")
+                summary = "No se generó ningún resumen."
+            elif self.transcript_cache and video_id:
+                self.transcript_cache.put({'summary': summary, 'summary_model': summary_model}, *summary_key)
+
+        print("\n--- Resumen ---\n")
+        print(summary)
+
+        # Preparar el contenido completo para guardar (incluyendo transcripción y resumen)
+        file_content = (
+            f"URL del Video: {video_url}\n"
+            f"Título del Video: {video_title}\n"
+            f"Idioma Detectado: {lang}\n"
+            f"Generado el: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+            "=== Transcripción ===\n\n"
+            f"{transcript}\n\n"
+            "=== Resumen ===\n\n"
+            f"{summary}"
+        )
+
+        # Guardar la transcripción y el resumen en un archivo de texto en el directorio actual
         try:
-            whisper_model = whisper.load_model(self.WHISPER_MODEL_SIZE)
+            with open(summary_filepath, 'w', encoding='utf-8') as f:
+                f.write(file_content)
+            print(f"\nResumen guardado en '{summary_filename}'.")
+            logging.info(f"Resumen guardado en '{summary_filepath}'.")
         except Exception as e:
-            logging.error(f"Error al cargar el modelo Whisper: {e}")
-            raise RuntimeError(f"Error al cargar el modelo Whisper: {e}")
+            logging.error(f"Error al guardar el archivo '{summary_filepath}': {e}")
+            raise RuntimeError(f"Error al guardar el resumen: {e}")
+        yield BBFetchRecord('summary', self.get_name(), {
+            'video_url': video_url,
+            'title': video_title,
+            'language': lang,
+            'summary_model': summary_model,
+            'summary': summary,
+            'path': summary_filepath
+        })
 
-        # Crear una carpeta temporal para almacenar el audio descargado
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            print("Descargando audio...")
-            audio_file = self.download_audio(video_url, tmpdirname)
-            if audio_file:
-                print(f"Audio descargado en {audio_file}")
-                logging.info(f"Audio descargado exitosamente en {audio_file}.")
-
-                # Convertir MP3 a WAV mono para mejorar la precisión de la transcripción
-                wav_path = os.path.join(tmpdirname, "audio_mono.wav")
-                converted_audio = self.convert_to_mono_wav(audio_file, wav_path)
-                if not converted_audio:
-                    logging.error("Conversión de audio fallida.")
-                    raise RuntimeError("Error al convertir el audio a WAV.")
-
-                # Verificar la duración del archivo de audio
-                try:
-                    audio = AudioSegment.from_wav(converted_audio)
-                    duration = audio.duration_seconds
-                    print(f"Duración del audio (s): {duration:.1f}")
-                    logging.info(f"Duración del audio: {duration:.1f} segundos")
-                except Exception as e:
-                    logging.error(f"No se pudo determinar la duración del audio: {e}")
-
-                # Transcribir el audio descargado usando Whisper
-                transcript, lang = self.transcribe_audio(converted_audio, whisper_model)
-                if transcript.strip():
-                    print("Transcripción completada.")
-                    logging.info("Transcripción completada exitosamente.")
-
-                    # Determinar el modelo de resumen según el idioma
-                    summarizer, summary_model = self.get_summarizer(language)
-
-                    # Generar el resumen del texto transcrito
-                    print("Generando resumen...")
-                    logging.info("Iniciando resumen de la transcripción.")
-                    summary = self.summarize_text(transcript, summarizer)
-
-                    if not summary.strip():
-                        logging.warning("El resumen está vacío después de la generación.")
-                        summary = "No se generó ningún resumen."
-
-                    print("\n--- Resumen ---\n")
-                    print(summary)
-
-                    # Preparar el contenido completo para guardar (incluyendo transcripción y resumen)
-                    file_content = (
-                        f"URL del Video: {video_url}\n"
-                        f"Título del Video: {video_title}\n"
-                        f"Idioma Detectado: {lang}\n"
-                        f"Generado el: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                        "=== Transcripción ===\n\n"
-                        f"{transcript}\n\n"
-                        "=== Resumen ===\n\n"
-                        f"{summary}"
-                    )
-
-                    # Guardar la transcripción y el resumen en un archivo de texto en el directorio actual
-                    try:
-                        with open(summary_filepath, 'w', encoding='utf-8') as f:
-                            f.write(file_content)
-                        print(f"\nResumen guardado en '{summary_filename}'.")
-                        logging.info(f"Resumen guardado en '{summary_filepath}'.")
-                    except Exception as e:
-                        logging.error(f"Error al guardar el archivo '{summary_filepath}': {e}")
-                        raise RuntimeError(f"Error al guardar el resumen: {e}")
-                else:
-                    logging.warning("La transcripción estaba vacía después del procesamiento del audio.")
-                    raise RuntimeError("No se generó ninguna transcripción.")
-            else:
-                logging.error("La descarga del audio falló para la URL proporcionada.")
-                raise RuntimeError("Error al descargar el audio.")
+    # ------------------------ Modelos ----------------------------- #
+
+    def whisper_model_key(self):
+        return ('whisper', self.WHISPER_MODEL_SIZE)
+
+    def summarizer_model_key(self):
+        return ('summarization', self.ENGLISH_SUMMARIZATION_MODEL)
+
+    def warm_up_models(self):
+        """Carga por adelantado los modelos de esta fuente (por ejemplo al iniciar un proceso de trabajo)."""
+        self.model_registry.warm_up([self.whisper_model_key(), self.summarizer_model_key()])
 
     # ------------------------ Métodos Auxiliares ----------------------------- #
 
+    def is_batch_request(self, youtube_link):
+        """True para listas de URLs y para enlaces de playlist o de canal."""
+        if isinstance(youtube_link, (list, tuple)):
+            return True
+        return bool(re.search(r'[?&]list=|/playlist\b|/channel/|/c/|/user/|/@', youtube_link))
+
+    def expand_video_urls(self, sources):
+        """
+        Convierte URLs de videos, playlists y canales en una lista de (url del video, título o None),
+        usando la extracción plana de yt-dlp (sin descargar ni resolver cada video).
+        """
+        if isinstance(sources, str):
+            sources = [sources]
+        videos = []
+        for source in sources:
+            if not self.is_batch_request(source):
+                videos.append((source, None))
+                continue
+            try:
+                with YoutubeDL({'quiet': True, 'extract_flat': 'in_playlist', 'skip_download': True}) as ydl:
+                    info_dict = ydl.extract_info(source, download=False)
+            except Exception as e:
+                logging.error(f"Error al listar los videos de {source}: {e}")
+                continue
+            for entry in info_dict.get('entries') or []:
+                if not entry:
+                    continue
+                url = entry.get('url') or entry.get('webpage_url')
+                if not url or not url.startswith('http'):
+                    url = f"https://www.youtube.com/watch?v={entry.get('id')}"
+                videos.append((url, entry.get('title')))
+        return videos
+
+    def video_id_from_url(self, video_url):
+        """Extrae el id del video de una URL de YouTube sin acceder a la red (None si no se reconoce)."""
+        match = re.search(r'(?:[?&]v=|youtu\.be/|/shorts/|/embed/|/live/)([\w-]{11})', video_url)
+        return match.group(1) if match else None
+
+    def summarizer_id(self, language):
+        """Identificador del resumidor usado para un idioma (forma parte de la clave de caché)."""
+        if language == "es":
+            return "sumy LexRank"
+        options = [self.ENGLISH_SUMMARIZATION_MODEL]
+        if self.params.get('summary_chunk_tokens'):
+            options.append(f"chunk={self.params['summary_chunk_tokens']}")
+        if self.params.get('summary_map_reduce', False):
+            options.append("map-reduce")
+        return ' '.join(options)
+
+    def _cached_transcript(self, video_id, language):
+        if self.transcript_cache is None or not video_id:
+            return None
+        cached = self.transcript_cache.get('transcript', video_id, self.WHISPER_MODEL_SIZE, language)
+        if cached is not None:
+            logging.info(f"Transcripción de {video_id} obtenida de la caché.")
+        return cached
+
+    def _cache_transcript(self, video_id, language, video_title, transcript, lang, segments):
+        if self.transcript_cache is None or not video_id or not transcript.strip():
+            return
+        self.transcript_cache.put({
+            'title': video_title,
+            'transcript': transcript,
+            'language': lang,
+            'segments': [{'start': segment.get('start'), 'end': segment.get('end'), 'text': segment.get('text', '')}
+                         for segment in segments]
+        }, 'transcript', video_id, self.WHISPER_MODEL_SIZE, language)
+
+    def download_and_decode(self, video_url, download_path, raw_path=None):
+        """
+        Descarga el audio del video y lo decodifica en una sola pasada de ffmpeg a muestras
+        float32 mono de 16 kHz (en memoria, o mapeadas desde disco si el audio es largo o se
+        indica raw_path). El archivo descargado se borra tras decodificarlo.
+        Devuelve (muestras, información del video de yt-dlp).
+        """
+        print("Descargando audio...")
+        audio_file, info_dict = self.download_audio_stream(video_url, download_path)
+        if not audio_file:
+            logging.error("La descarga del audio falló para la URL proporcionada.")
+            raise RuntimeError("Error al descargar el audio.")
+        print(f"Audio descargado en {audio_file}")
+        logging.info(f"Audio descargado exitosamente en {audio_file}.")
+
+        try:
+            if raw_path is not None:
+                samples = self.audio_decoder.decode_to_file(audio_file, raw_path)
+            else:
+                samples = self.audio_decoder.decode(audio_file, duration=info_dict.get('duration'),
+                                                    workdir=download_path)
+        except Exception as e:
+            logging.error(f"Error al decodificar {audio_file}: {e}")
+            raise RuntimeError(f"Error al decodificar el audio: {e}")
+        finally:
+            os.remove(audio_file)
+        return samples, info_dict
+
     def sanitize_filename(self, name):
         """
         Sanitiza el título del video (o cualquier cadena) para crear un nombre de archivo válido.
@@ -166,18 +584,42 @@ class BBYouTubeDataSource(BBDataSource):
 
     def download_audio(self, video_url, download_path, max_retries=3):
         """
-        Descarga el stream de audio de un video de YouTube usando yt-dlp y lo convierte a mp3.
+        Descarga el audio de un video de YouTube y devuelve la ruta del archivo, o None si falla.
+        Se mantiene por compatibilidad: el archivo es el stream original (webm, m4a...), ya no un
+        MP3. Para obtener también la información del video usar download_audio_stream.
+        """
+        audio_file, _ = self.download_audio_stream(video_url, download_path, max_retries)
+        return audio_file
+
+    def convert_to_mono_wav(self, mp3_path, output_path):
+        """
+        Convierte un archivo de audio a un WAV mono de 16 bits. Se mantiene por compatibilidad:
+        el pipeline ya no lo usa (ver download_and_decode). La frecuencia de muestreo es la del
+        decodificador (16 kHz). Devuelve output_path, o None si la conversión falla.
+        """
+        try:
+            samples = self.audio_decoder.decode_to_memory(mp3_path)
+            pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2')
+            with wave.open(output_path, 'wb') as out:
+                out.setnchannels(1)
+                out.setsampwidth(2)
+                out.setframerate(self.audio_decoder.sample_rate)
+                out.writeframes(pcm.tobytes())
+            logging.info(f"Convertido {mp3_path} a WAV mono en {output_path}.")
+            return output_path
+        except Exception as e:
+            logging.error(f"Error al convertir {mp3_path} a WAV: {e}")
+            return None
+
+    def download_audio_stream(self, video_url, download_path, max_retries=3):
+        """
+        Descarga el stream de audio de un video de YouTube usando yt-dlp, sin transcodificarlo.
         Implementa un mecanismo de reintentos en caso de fallos de red.
-        Después de la descarga, busca el archivo mp3 en el directorio de descarga.
+        Devuelve (ruta del archivo descargado, info del video), o (None, None) si falla.
         """
         ydl_opts = {
             'format': 'bestaudio/best',
             'outtmpl': os.path.join(download_path, '%(id)s.%(ext)s'),
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }],
             'quiet': True,
             'no_warnings': True,
             'retries': max_retries,
@@ -189,52 +631,90 @@ class BBYouTubeDataSource(BBDataSource):
                 with YoutubeDL(ydl_opts) as ydl:
                     info_dict = ydl.extract_info(video_url, download=True)
                     logging.info(f"Descargado info del video para {video_url}: {info_dict.get('title', 'Título Desconocido')}")
-                # Después de la descarga, encuentra el archivo mp3 en la carpeta de descarga
-                mp3_files = glob.glob(os.path.join(download_path, "*.mp3"))
-                if mp3_files:
-                    audio_file = mp3_files[0]
+                # Después de la descarga, encuentra el archivo en la carpeta de descarga
+                audio_files = [f for f in glob.glob(os.path.join(download_path, f"{info_dict.get('id')}.*"))
+                               if not f.endswith('.part')]
+                if audio_files:
+                    audio_file = audio_files[0]
                     logging.info(f"Archivo de audio encontrado: {audio_file}")
-                    return audio_file
+                    return audio_file, info_dict
                 else:
-                    logging.error("No se encontró ningún archivo MP3 después de la descarga.")
-                    return None
+                    logging.error("No se encontró ningún archivo de audio después de la descarga.")
+                    return None, None
             except Exception as e:
                 attempt += 1
                 logging.error(f"Intento {attempt} - Error al descargar {video_url}: {e}")
                 if attempt < max_retries:
                     time.sleep(3)  # Espera un poco antes de reintentar
                 else:
-                    return None
+                    return None, None
 
-    def convert_to_mono_wav(self, mp3_path, output_path):
+    def transcribe_audio(self, audio, model):
         """
-        Convierte un archivo MP3 a un archivo WAV mono.
+        Transcribe el audio a texto usando Whisper. `audio` es la ruta de un archivo o las
+        muestras float32 mono de 16 kHz ya decodificadas (ver download_and_decode).
+        Devuelve la transcripción, el código del idioma detectado y los segmentos con marcas de tiempo.
         """
+        if self.params.get('parallel_transcription', False):
+            return self.transcribe_audio_in_chunks(audio, model)
+        label = self._audio_label(audio)
         try:
-            audio = AudioSegment.from_mp3(mp3_path)
-            audio = audio.set_channels(1)  # Convierte a mono
-            audio.export(output_path, format="wav")
-            logging.info(f"Convertido {mp3_path} a WAV mono en {output_path}.")
-            return output_path
+            # Especifica el idioma para mejorar la precisión
+            result = model.transcribe(audio, language="es")
+            transcript = result.get('text', "")
+            language = result.get('language', "es")
+            segments = result.get('segments', [])
+            logging.info(f"Transcrito {label} con idioma detectado: {language}.")
+            return transcript, language, segments
         except Exception as e:
-            logging.error(f"Error al convertir {mp3_path} a WAV: {e}")
-            return None
+            logging.error(f"Error al transcribir {label}: {e}")
+            return "", "es", []
+
+    def _audio_label(self, audio):
+        if isinstance(audio, str):
+            return f"el archivo de audio {audio}"
+        return f"{self.audio_decoder.duration(audio):.1f} s de audio decodificado"
 
-    def transcribe_audio(self, audio_path, model):
+    def transcribe_audio_in_chunks(self, audio, model):
         """
-        Transcribe el audio a texto usando Whisper.
-        Devuelve tanto la transcripción como el código del idioma detectado.
+        Variante paralela de transcribe_audio: divide el audio en silencios en fragmentos solapados,
+        los transcribe en un pool de procesos y une el texto eliminando lo repetido en los solapes.
+        Los tiempos de los segmentos se refieren al audio completo.
         """
+        label = self._audio_label(audio)
         try:
-            # Especifica el idioma para mejorar la precisión
-            result = model.transcribe(audio_path, language="es")
-            transcript = result.get('text', "")
-            language = result.get('language', "es")
-            logging.info(f"Transcrito el archivo de audio {audio_path} con idioma detectado: {language}.")
-            return transcript, language
+            # ffmpeg -> float32 mono a 16 kHz, salvo que ya venga decodificado
+            samples = self.audio_decoder.decode(audio) if isinstance(audio, str) else audio
+            chunker = BBAudioChunker(
+                sample_rate=whisper.audio.SAMPLE_RATE,
+                chunk_seconds=self.params.get('transcription_chunk_seconds', 300.0),
+                overlap_seconds=self.params.get('transcription_overlap_seconds', 2.0)
+            )
+            chunks = chunker.split(samples)
+            if len(chunks) == 1:
+                result = model.transcribe(samples, language="es")
+                return result.get('text', ""), result.get('language', "es"), result.get('segments', [])
+
+            cpus = os.cpu_count() or 1
+            workers = self.params.get('chunk_workers') or cpus
+            # Repartir los núcleos entre procesos para no sobresuscribir los hilos de torch
+            worker_params = dict(self.params, torch_threads=max(1, cpus // workers))
+            logging.info(f"Transcribiendo {label} en {len(chunks)} fragmentos con {workers} procesos.")
+            pool = self._worker_pool('chunks', workers, worker_params)
+            try:
+                results = list(pool.map(_transcribe_chunk_in_worker, [chunk[3] for chunk in chunks]))
+            except BrokenProcessPool:
+                # Un proceso murió (p. ej. por falta de memoria): reintentar una vez con un pool nuevo
+                self._discard_pool('chunks', pool)
+                pool = self._worker_pool('chunks', workers, worker_params)
+                results = list(pool.map(_transcribe_chunk_in_worker, [chunk[3] for chunk in chunks]))
+            transcript, segments = chunker.merge(chunks, results)
+            language = results[0].get('language', "es")
+            logging.info(f"Transcrito {label} por fragmentos con idioma detectado: {language}.")
+            return transcript, language, segments
         except Exception as e:
-            logging.error(f"Error al transcribir {audio_path}: {e}")
-            return "", "es"
+            logging.error(f"Error al transcribir {label} por fragmentos: {e}")
+            return "", "es", []
 
     def summarize_text(self, text, summarizer):
         """
@@ -242,14 +722,17 @@ class BBYouTubeDataSource(BBDataSource):
         """
         try:
             # Dependiendo del summarizer, la implementación puede variar
-            if isinstance(summarizer, pipeline):
-                # Usando Hugging Face
-                max_chunk = 1024  # Ajusta según el tamaño máximo de tokens de entrada del modelo
-                text_chunks = [text[i:i + max_chunk] for i in range(0, len(text), max_chunk)]
-                summaries = []
-                for chunk in text_chunks:
-                    summary = summarizer(chunk, max_length=150, min_length=40, do_sample=False)[0]['summary_text']
-                    summaries.append(summary)
+            if isinstance(summarizer, Pipeline):
+                # Usando Hugging Face: fragmentos por oraciones que caben en la entrada del modelo,
+                # resumidos en lotes
+                summaries = self._summarize_chunks(self.chunk_text_by_tokens(text, summarizer.tokenizer), summarizer)
+                if self.params.get('summary_map_reduce', False):
+                    # Reducir: resumir los resúmenes parciales hasta que quepan en un solo fragmento
+                    for _ in range(self.params.get('summary_map_reduce_levels', 3)):
+                        if len(summaries) <= 1:
+                            break
+                        chunks = self.chunk_text_by_tokens(' '.join(summaries), summarizer.tokenizer)
+                        summaries = self._summarize_chunks(chunks, summarizer)
                 full_summary = ' '.join(summaries)
                 logging.info("Resumen generado utilizando Hugging Face.")
                 return full_summary
@@ -267,6 +750,43 @@ class BBYouTubeDataSource(BBDataSource):
             logging.error(f"Error al resumir el texto: {e}")
             return ""
 
+    def chunk_text_by_tokens(self, text, tokenizer):
+        """
+        Agrupa oraciones completas en fragmentos de como máximo 'summary_chunk_tokens' tokens
+        (por defecto lo que admite el modelo). Las oraciones más largas que el límite se cortan.
+        """
+        max_tokens = self.params.get('summary_chunk_tokens') or min(tokenizer.model_max_length, 1024)
+        max_tokens = max(1, max_tokens - 2)  # tokens especiales de inicio y fin
+        sentences = [s for s in re.split(r'(?<=[.!?¡¿])\s+', text.strip()) if s]
+        if not sentences:
+            return []
+        # Una sola llamada al tokenizador para todas las oraciones
+        token_ids = tokenizer(sentences, add_special_tokens=False)['input_ids']
+
+        chunks, current, current_tokens = [], [], 0
+        for sentence, ids in zip(sentences, token_ids):
+            pieces = [(sentence, len(ids))]
+            if len(ids) > max_tokens:
+                pieces = [(tokenizer.decode(ids[i:i + max_tokens]), len(ids[i:i + max_tokens]))
+                          for i in range(0, len(ids), max_tokens)]
+            for piece, count in pieces:
+                if current and current_tokens + count > max_tokens:
+                    chunks.append(' '.join(current))
+                    current, current_tokens = [], 0
+                current.append(piece)
+                current_tokens += count
+        if current:
+            chunks.append(' '.join(current))
+        return chunks
+
+    def _summarize_chunks(self, chunks, summarizer):
+        """Resume los fragmentos en llamadas por lotes de 'summary_batch_size'."""
+        if not chunks:
+            return []
+        results = summarizer(chunks, max_length=150, min_length=40, do_sample=False, truncation=True,
+                             batch_size=self.params.get('summary_batch_size', 8))
+        return [result['summary_text'] for result in results]
+
     def get_summarizer(self, language):
         """
         Retorna el summarizer adecuado basado en el idioma.
@@ -280,7 +800,7 @@ class BBYouTubeDataSource(BBDataSource):
             summary_model = "sumy LexRank"
         else:
             # Usar Hugging Face para inglés
-            summarizer = pipeline("summarization", model=self.ENGLISH_SUMMARIZATION_MODEL)
+            summarizer = self.model_registry.get(self.summarizer_model_key())
             summary_model = "Hugging Face BART"
         logging.info(f"Usando modelo de resumen: {summary_model}")
         return summarizer, summary_model
@@ -0,0 +1,142 @@
+# File: brainboost_data_source_package/data_source_manager/BBDependencyExecutor.py
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from brainboost_data_source_logger_package.BBLogger import BBLogger
+
+
+class BBDependencyCycleError(Exception):
+    """Raised when dependency_data_sources form a cycle."""
+
+
+class BBDependencyExecutor:
+    """
+    Starts a data source and its transitive dependency_data_sources as a DAG.
+
+    Every node starts only after all of its dependencies have started; nodes whose
+    dependencies are satisfied run concurrently on a bounded thread pool. Starting a
+    node means subscribing each of its dependents to it and then calling its
+    ``start_node()`` hook. Per-node timings and the critical path are kept after ``run()``.
+    """
+
+    def __init__(self, root, max_workers=4):
+        self.root = root
+        self.max_workers = max_workers
+        self.nodes = {}        # id -> data source
+        self.dependencies = {}  # id -> [id of each dependency]
+        self.dependents = {}   # id -> [id of each dependent]
+        self.timings = {}      # node name -> {'start', 'end', 'duration'}
+        self._names = {}
+        self._build_graph()
+
+    def _node_name(self, node_id):
+        if node_id not in self._names:
+            name = self.nodes[node_id].get_name()
+            taken = set(self._names.values())
+            unique, suffix = name, 2
+            while unique in taken:
+                unique, suffix = f"{name}#{suffix}", suffix + 1
+            self._names[node_id] = unique
+        return self._names[node_id]
+
+    def _build_graph(self):
+        """Collect the transitive dependency graph, raising BBDependencyCycleError on cycles."""
+        visiting, visited = [], set()
+
+        def visit(ds):
+            node_id = id(ds)
+            if node_id in visited:
+                return
+            if node_id in visiting:
+                cycle = visiting[visiting.index(node_id):] + [node_id]
+                raise BBDependencyCycleError(
+                    "Dependency cycle: " + " -> ".join(self.nodes[n].get_name() for n in cycle))
+            visiting.append(node_id)
+            self.nodes[node_id] = ds
+            self.dependencies[node_id] = []
+            self.dependents.setdefault(node_id, [])
+            for dep in ds.dependency_data_sources or []:
+                visit(dep)
+                if id(dep) not in self.dependencies[node_id]:
+                    self.dependencies[node_id].append(id(dep))
+                    self.dependents.setdefault(id(dep), []).append(node_id)
+            visiting.pop()
+            visited.add(node_id)
+
+        visit(self.root)
+
+    def topological_order(self):
+        """Return the data sources in an order where dependencies come first."""
+        remaining = {n: len(deps) for n, deps in self.dependencies.items()}
+        ready = [n for n, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            node_id = ready.pop(0)
+            order.append(self.nodes[node_id])
+            for dependent in self.dependents[node_id]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        return order
+
+    def _start_node(self, node_id):
+        ds = self.nodes[node_id]
+        started = time.monotonic()
+        for dependent in self.dependents[node_id]:
+            ds.subscribe(self.nodes[dependent])
+        ds.start_node()
+        return started, time.monotonic()
+
+    def run(self):
+        """Start every node in dependency order and return the per-node timings."""
+        remaining = {n: len(deps) for n, deps in self.dependencies.items()}
+        origin = time.monotonic()
+        errors = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {pool.submit(self._start_node, n): n for n, count in remaining.items() if count == 0}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node_id = running.pop(future)
+                    name = self._node_name(node_id)
+                    try:
+                        started, ended = future.result()
+                    except Exception as e:
+                        BBLogger.log(f"Failed to start data source {name}: {e}", level='error')
+                        errors.append((name, e))
+                        continue  # dependents of a failed node are never started
+                    self.timings[name] = {
+                        'start': started - origin,
+                        'end': ended - origin,
+                        'duration': ended - started
+                    }
+                    BBLogger.log(f"Started data source {name} in {ended - started:.3f} seconds.")
+                    for dependent in self.dependents[node_id]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0:
+                            running[pool.submit(self._start_node, dependent)] = dependent
+        if errors:
+            name, error = errors[0]
+            raise RuntimeError(f"Data source {name} failed to start: {error}") from error
+        return self.timings
+
+    def critical_path(self):
+        """
+        Return (names, seconds) of the dependency chain with the largest summed start
+        duration, i.e. the chain that bounds how fast the whole graph can start.
+        """
+        best = {}
+
+        def longest(node_id):
+            if node_id not in best:
+                duration = self.timings.get(self._node_name(node_id), {}).get('duration', 0.0)
+                chain, total = [], 0.0
+                for dep in self.dependencies[node_id]:
+                    dep_chain, dep_total = longest(dep)
+                    if dep_total > total:
+                        chain, total = dep_chain, dep_total
+                best[node_id] = (chain + [self._node_name(node_id)], total + duration)
+            return best[node_id]
+
+        return longest(id(self.root))
@@ -28,6 +28,8 @@ import subprocess
 
 from brainboost_data_source_package.data_source_abstract.BBDataSource import BBDataSource
 from brainboost_data_source_package.data_source_abstract.BBRealTimeDataSource import BBRealTimeDataSource
+from brainboost_data_source_package.data_source_abstract.BBPeriodicDataSource import BBPeriodicDataSource
+from brainboost_data_source_package.data_source_utils.helpers import get_redis_connection_params
 from brainboost_configuration_package.BBConfig import BBConfig
 
 
@@ -35,16 +37,11 @@ class DataSourceManager:
     def __init__(self, redis_host=None, redis_port=None,
                  command_channel_prefix='datasource_commands', command_channel=None):
         
-        redis_private_ip = BBConfig.get("brainboost_server_vm_redis_private_ip_0")
-        redis_private_port = BBConfig.get("brainboost_server_vm_redis_private_port_0")
-        BBConfig.override("redis_server_ip", redis_private_ip)
-        BBConfig.override("redis_server_port", redis_private_port)
-
-
+        default_host, default_port = get_redis_connection_params()
         if redis_host is None:
-            redis_host = BBConfig.get('redis_server_ip')
+            redis_host = default_host
         if redis_port is None:
-            redis_port = BBConfig.get('redis_server_port')
+            redis_port = default_port
         self.data_source_classes = {}
         self.load_data_sources()
         self.redis = redis.Redis(host=redis_host, port=redis_port, db=0)
@@ -219,7 +216,7 @@ class DataSourceManager:
             attr = getattr(module, attr_name)
             if (isinstance(attr, type) and 
                 (issubclass(attr, BBDataSource) or issubclass(attr, BBRealTimeDataSource)) and 
-                attr not in (BBDataSource, BBRealTimeDataSource)):
+                attr not in (BBDataSource, BBRealTimeDataSource, BBPeriodicDataSource)):
                 self.data_source_classes[attr.__name__] = {"class": attr, "source": source}
                 print(f"Loaded data source class '{attr.__name__}' from {source}.")
 
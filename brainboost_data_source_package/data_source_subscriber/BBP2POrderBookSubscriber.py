@@ -0,0 +1,65 @@
+# File: brainboost_data_source_package/data_source_subscriber/BBP2POrderBookSubscriber.py
+
+import heapq
+import math
+import threading
+
+from brainboost_data_source_package.data_source_subscriber.BBSubscriber import BBSubscriber
+from brainboost_data_source_package.data_source_utils.BBP2POrderBook import BBP2POrderBook
+
+
+class BBP2POrderBookSubscriber(BBSubscriber):
+    """
+    Subscriber that keeps a BBP2POrderBook per exchange and market from the offer
+    deltas published by the P2P data sources (BBByBitP2PDataSource, ...), and
+    answers best-offer queries against them without rescanning offer lists.
+
+    Markets are named 'TOKEN/FIAT/SIDE' (e.g. 'USDT/EUR/SELL'). A delta flagged
+    'snapshot' replaces the book instead of being applied incrementally.
+    """
+
+    def __init__(self):
+        super().__init__(any_object=self)
+        self._books = {}  # (exchange, market) -> BBP2POrderBook
+        self._lock = threading.Lock()
+
+    def notify(self, data):
+        exchange = data.get('exchange')
+        for delta in data.get('markets', ()):
+            book = self.book(exchange, delta['market'], create=True)
+            if delta.get('snapshot'):
+                book.replace(delta.get('added', ()))
+            else:
+                book.apply(delta)
+
+    def book(self, exchange, market, create=False):
+        """The order book of one exchange's market (None when unknown, unless ``create``)."""
+        key = (exchange, market)
+        book = self._books.get(key)
+        if book is None and create:
+            with self._lock:
+                book = self._books.get(key)
+                if book is None:
+                    book = self._books[key] = BBP2POrderBook(side=market.rsplit('/', 1)[-1])
+        return book
+
+    def markets(self):
+        return sorted(self._books)
+
+    def best(self, market, n=10, payment_method=None, amount=None, exchange=None):
+        """
+        The ``n`` best offers of ``market`` accepting ``payment_method`` and ``amount``,
+        on one ``exchange`` or, when None, merged across all exchanges by price.
+        """
+        if exchange is not None:
+            book = self.book(exchange, market)
+            return book.best(n, payment_method=payment_method, amount=amount) if book else []
+        books = [book for (_, name), book in list(self._books.items()) if name == market]
+        if not books:
+            return []
+        sign = -1 if books[0].side == 'BUY' else 1
+        per_exchange = [book.best(n, payment_method=payment_method, amount=amount) for book in books]
+        # Same order as BBP2POrderBook: unpriced offers last
+        merged = heapq.merge(*per_exchange, key=lambda offer: math.inf if offer.get('price') is None
+                             else sign * offer['price'])
+        return [offer for _, offer in zip(range(n), merged)]
@@ -0,0 +1,169 @@
+# File: brainboost_data_source_package/data_source_subscriber/BBP2PSpreadSubscriber.py
+
+import threading
+import time
+
+import numpy as np
+
+from brainboost_data_source_package.data_source_subscriber.BBP2POrderBookSubscriber import BBP2POrderBookSubscriber
+from brainboost_data_source_logger_package.BBLogger import BBLogger
+
+
+class BBP2PSpreadSubscriber(BBP2POrderBookSubscriber):
+    """
+    Finds P2P arbitrage across exchanges and payment methods.
+
+    Subscribed to several P2P sources (ByBit, Binance...), it keeps their order books
+    up to date (see BBP2POrderBookSubscriber) and, for every (token, fiat) pair, the
+    best price per (exchange, payment method) "slot" in two NumPy matrices: asks
+    (SELL advertisements, where the token is bought) and bids (BUY advertisements,
+    where it is sold), shaped [pairs, slots]. Only slots of the markets touched by
+    a delta are refreshed. Each notification then computes every spread
+    bid / ask - 1 (net of per-exchange fees) for all pairs and slot combinations
+    in one broadcast, and sends the opportunities above ``threshold`` to its own
+    subscribers, best first.
+
+    Args:
+        threshold (float): Minimum spread to report (0.005 = 0.5 %).
+        amount (float): Fiat amount to trade; offers whose limits exclude it are ignored.
+        fees (dict): Fee fraction per exchange, charged on both legs.
+        include_same_exchange (bool): Also pair slots of the same exchange.
+        max_opportunities (int): Maximum opportunities per notification.
+        subscribers (list): Receivers of {'timestamp', 'opportunities'} notifications.
+    """
+
+    def __init__(self, threshold=0.005, amount=None, fees=None, include_same_exchange=False,
+                 max_opportunities=100, subscribers=None):
+        super().__init__()
+        self.threshold = threshold
+        self.amount = amount
+        self.fees = dict(fees or {})
+        self.include_same_exchange = include_same_exchange
+        self.max_opportunities = max_opportunities
+        self.subscribers = subscribers or []
+        self._pairs = {}      # (token, fiat) -> row
+        self._slots = {}      # (exchange, payment method) -> column
+        self._pair_names = []
+        self._slot_names = []
+        self._asks = np.full((4, 16), np.nan)
+        self._bids = np.full((4, 16), np.nan)
+        self._ask_ids = np.full((4, 16), None, dtype=object)
+        self._bid_ids = np.full((4, 16), None, dtype=object)
+        self._slot_fees = np.zeros(16)
+        self._slot_exchanges = np.zeros(16, dtype=np.int32)
+        self._exchanges = {}
+        self._compute_lock = threading.Lock()
+
+    def subscribe(self, subscriber):
+        if subscriber not in self.subscribers:
+            self.subscribers.append(subscriber)
+
+    def _grow(self, rows, columns):
+        """Enlarge the matrices (doubling) so they hold ``rows`` pairs and ``columns`` slots."""
+        old_rows, old_columns = self._asks.shape
+        if rows <= old_rows and columns <= old_columns:
+            return
+        new_rows = max(old_rows, 1 << (rows - 1).bit_length())
+        new_columns = max(old_columns, 1 << (columns - 1).bit_length())
+        for name, fill, dtype in (('_asks', np.nan, float), ('_bids', np.nan, float),
+                                  ('_ask_ids', None, object), ('_bid_ids', None, object)):
+            grown = np.full((new_rows, new_columns), fill, dtype=dtype)
+            grown[:old_rows, :old_columns] = getattr(self, name)
+            setattr(self, name, grown)
+        self._slot_fees = np.concatenate([self._slot_fees, np.zeros(new_columns - old_columns)])
+        self._slot_exchanges = np.concatenate([self._slot_exchanges,
+                                               np.zeros(new_columns - old_columns, dtype=np.int32)])
+
+    def _pair(self, token, fiat):
+        row = self._pairs.get((token, fiat))
+        if row is None:
+            row = self._pairs[(token, fiat)] = len(self._pair_names)
+            self._pair_names.append((token, fiat))
+            self._grow(len(self._pair_names), len(self._slot_names) or 1)
+        return row
+
+    def _slot(self, exchange, method):
+        column = self._slots.get((exchange, method))
+        if column is None:
+            column = self._slots[(exchange, method)] = len(self._slot_names)
+            self._slot_names.append((exchange, method))
+            self._grow(len(self._pair_names) or 1, len(self._slot_names))
+            self._slot_fees[column] = self.fees.get(exchange, 0.0)
+            self._slot_exchanges[column] = self._exchanges.setdefault(exchange, len(self._exchanges))
+        return column
+
+    def _refresh_quotes(self, exchange, market):
+        """Re-read the best price per payment method of one exchange's market into the matrices."""
+        token, fiat, side = market.split('/')
+        book = self.book(exchange, market)
+        row = self._pair(token, fiat)
+        prices, ids = (self._asks, self._ask_ids) if side == 'SELL' else (self._bids, self._bid_ids)
+        for (slot_exchange, _), column in self._slots.items():
+            if slot_exchange == exchange:
+                prices[row, column] = np.nan
+                ids[row, column] = None
+        for method in book.payment_methods():
+            best = book.best(1, payment_method=method, amount=self.amount)
+            if best and best[0].get('price') is not None:
+                column = self._slot(exchange, method)
+                prices, ids = (self._asks, self._ask_ids) if side == 'SELL' else (self._bids, self._bid_ids)
+                prices[row, column] = best[0]['price']
+                ids[row, column] = best[0]['offer_id']
+
+    def compute(self):
+        """
+        Every spread above the threshold, best first, as dicts naming the pair and the
+        exchange, payment method, price and offer id of both legs.
+        """
+        rows, columns = len(self._pair_names), len(self._slot_names)
+        if not rows or not columns:
+            return []
+        fees = self._slot_fees[:columns]
+        asks = self._asks[:rows, :columns] * (1.0 + fees)
+        bids = self._bids[:rows, :columns] * (1.0 - fees)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            spreads = bids[:, None, :] / asks[:, :, None] - 1.0  # [pair, ask slot, bid slot]
+            mask = spreads > self.threshold  # NaN (missing quote) compares False
+        if not self.include_same_exchange:
+            exchanges = self._slot_exchanges[:columns]
+            mask &= exchanges[:, None] != exchanges[None, :]
+        pair_index, ask_index, bid_index = np.nonzero(mask)
+        if not len(pair_index):
+            return []
+        values = spreads[pair_index, ask_index, bid_index]
+        if len(values) > self.max_opportunities:
+            # Only the best max_opportunities need sorting.
+            top = np.argpartition(-values, self.max_opportunities - 1)[:self.max_opportunities]
+            order = top[np.argsort(-values[top], kind='stable')]
+        else:
+            order = np.argsort(-values, kind='stable')
+        opportunities = []
+        for i in order:
+            p, a, b = pair_index[i], ask_index[i], bid_index[i]
+            token, fiat = self._pair_names[p]
+            opportunities.append({
+                'token': token,
+                'fiat': fiat,
+                'spread': float(values[i]),
+                'buy': {'exchange': self._slot_names[a][0], 'payment_method': self._slot_names[a][1],
+                        'price': float(self._asks[p, a]), 'offer_id': self._ask_ids[p, a]},
+                'sell': {'exchange': self._slot_names[b][0], 'payment_method': self._slot_names[b][1],
+                         'price': float(self._bids[p, b]), 'offer_id': self._bid_ids[p, b]}
+            })
+        return opportunities
+
+    def notify(self, data):
+        super().notify(data)
+        with self._compute_lock:
+            exchange = data.get('exchange')
+            for delta in data.get('markets', ()):
+                self._refresh_quotes(exchange, delta['market'])
+            started = time.perf_counter()
+            opportunities = self.compute()
+            elapsed = time.perf_counter() - started
+        if not opportunities:
+            return
+        BBLogger.log(f"Found {len(opportunities)} P2P spreads above {self.threshold:.2%} "
+                     f"in {elapsed * 1000:.2f} ms (best {opportunities[0]['spread']:.2%}).")
+        for subscriber in self.subscribers:
+            subscriber.notify({'timestamp': time.time(), 'opportunities': opportunities})
@@ -0,0 +1,115 @@
+# File: brainboost_data_source_package/data_source_subscriber/BBRedisStreamReader.py
+
+import json
+import socket
+import threading
+
+import redis
+
+from brainboost_data_source_package.data_source_utils.helpers import get_redis_connection_params
+from brainboost_data_source_logger_package.BBLogger import BBLogger
+
+
+class BBRedisStreamReader:
+    """
+    Consumer-group reader for streams written by BBRedisStreamSubscriber.
+
+    Each entry read from the stream is turned back into a ``notify()`` call on the
+    local subscribers and acknowledged afterwards, so entries left pending by a
+    crashed consumer are redelivered when it restarts (at-least-once). An entry whose
+    delivery raises is logged and left unacknowledged, and a lost connection is
+    retried every second, so neither stops the reader.
+    """
+
+    def __init__(self, stream, group, consumer=None, subscribers=None, redis_client=None,
+                 batch_size=100, block_ms=1000):
+        if redis_client is None:
+            redis_host, redis_port = get_redis_connection_params()
+            redis_client = redis.Redis(host=redis_host, port=redis_port, db=0)
+        self.redis = redis_client
+        self.stream = stream
+        self.group = group
+        self.consumer = consumer or socket.gethostname()
+        self.subscribers = subscribers or []
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self._stopped = threading.Event()
+        self._thread = None
+        self._ensure_group()
+
+    def _ensure_group(self):
+        try:
+            self.redis.xgroup_create(self.stream, self.group, id='$', mkstream=True)
+            BBLogger.log(f"Created consumer group '{self.group}' on stream '{self.stream}'.")
+        except redis.ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+
+    def subscribe(self, subscriber):
+        if subscriber not in self.subscribers:
+            self.subscribers.append(subscriber)
+            BBLogger.log(f"Subscriber {subscriber} added to stream reader '{self.stream}'.")
+
+    def _read(self, stream_id):
+        response = self.redis.xreadgroup(self.group, self.consumer, {self.stream: stream_id},
+                                         count=self.batch_size, block=self.block_ms)
+        return response[0][1] if response else []
+
+    def _dispatch(self, entries):
+        """Notify subscribers of each entry and acknowledge the whole batch in one pipeline."""
+        if not entries:
+            return
+        ack_ids = []
+        for entry_id, fields in entries:
+            payload = fields.get(b'data', fields.get('data'))
+            if payload is None:
+                # Entry was trimmed by MAXLEN while pending; nothing left to deliver.
+                ack_ids.append(entry_id)
+                continue
+            try:
+                data = json.loads(payload)
+            except (TypeError, json.JSONDecodeError):
+                BBLogger.log(f"Invalid JSON in stream '{self.stream}' entry {entry_id}.", level='error')
+                ack_ids.append(entry_id)
+                continue
+            try:
+                for subscriber in self.subscribers:
+                    subscriber.notify(data)
+            except Exception as e:
+                BBLogger.log(f"Subscriber failed on stream '{self.stream}' entry {entry_id}: {e}", level='error')
+                continue
+            ack_ids.append(entry_id)
+        if not ack_ids:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xack(self.stream, self.group, *ack_ids)
+        pipe.execute()
+
+    def run(self):
+        """Deliver this consumer's pending entries first, then block for new ones until stopped."""
+        BBLogger.log(f"Stream reader '{self.consumer}' started on '{self.stream}' (group '{self.group}').")
+        pending_id = '0'
+        while not self._stopped.is_set():
+            try:
+                if pending_id is None:
+                    self._dispatch(self._read('>'))
+                    continue
+                entries = self._read(pending_id)
+                self._dispatch(entries)
+                pending_id = entries[-1][0] if entries else None
+            except redis.ConnectionError as e:
+                BBLogger.log(f"Stream reader lost connection to Redis: {e}", level='warning')
+                self._stopped.wait(1)
+        BBLogger.log(f"Stream reader '{self.consumer}' stopped.")
+
+    def start(self):
+        """Run the reader loop in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,88 @@
+# File: brainboost_data_source_package/data_source_subscriber/BBRedisStreamSubscriber.py
+
+import json
+import threading
+
+import redis
+
+from brainboost_data_source_package.data_source_subscriber.BBSubscriber import BBSubscriber
+from brainboost_data_source_package.data_source_utils.helpers import get_redis_connection_params
+from brainboost_data_source_logger_package.BBLogger import BBLogger
+
+
+class BBRedisStreamSubscriber(BBSubscriber):
+    """
+    Subscriber that bridges a data source to a Redis Stream so consumers on other
+    machines can receive its records (see BBRedisStreamReader for the other end).
+
+    Records are buffered and written with pipelined XADDs, either when
+    ``batch_size`` records are pending or every ``flush_interval`` seconds.
+    The stream is capped with ``MAXLEN ~ maxlen``. Flushes are serialized so batches
+    reach the stream in order; a batch that fails to publish is retried with the
+    next flush, and while Redis is unreachable at most ``max_buffer`` records are
+    kept (the oldest are dropped, with a log entry).
+    """
+
+    def __init__(self, stream, redis_client=None, batch_size=100, flush_interval=0.1, maxlen=100000,
+                 max_buffer=100000):
+        super().__init__(any_object=self)
+        if redis_client is None:
+            redis_host, redis_port = get_redis_connection_params()
+            redis_client = redis.Redis(host=redis_host, port=redis_port, db=0)
+        self.redis = redis_client
+        self.stream = stream
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.maxlen = maxlen
+        self.max_buffer = max_buffer
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+        BBLogger.log(f"Redis stream bridge publishing to '{stream}' (batch {batch_size}, maxlen ~{maxlen}).")
+
+    def notify(self, data: dict) -> None:
+        """Queue a record for the next pipelined XADD batch."""
+        with self._lock:
+            self._buffer.append(json.dumps(data, default=str))
+            self._trim_buffer()
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def _trim_buffer(self):
+        """Drop the oldest records beyond max_buffer. Caller holds the lock."""
+        dropped = len(self._buffer) - self.max_buffer
+        if dropped > 0:
+            del self._buffer[:dropped]
+            BBLogger.log(f"Stream '{self.stream}' buffer full; dropped the {dropped} oldest records.", level='error')
+
+    def flush(self):
+        """Write all buffered records to the stream in one pipeline round trip."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+            pipe = self.redis.pipeline(transaction=False)
+            for payload in batch:
+                pipe.xadd(self.stream, {'data': payload}, maxlen=self.maxlen, approximate=True)
+            try:
+                pipe.execute()
+            except redis.RedisError as e:
+                BBLogger.log(f"Failed to publish {len(batch)} records to stream '{self.stream}': {e}", level='error')
+                with self._lock:
+                    self._buffer[:0] = batch
+                    self._trim_buffer()
+
+    def _flush_loop(self):
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """Stop the background flusher and publish whatever is still buffered."""
+        self._stopped.set()
+        self._flusher.join()
+        self.flush()
@@ -11,3 +11,8 @@ class BBSubscriber(ABC):
     def notify(self, data: dict) -> None:
         """Handle incoming data updates."""
         pass  # No implementation in abstract method
+
+    # Subscribers may also define notify_batch(self, batch) to receive records as
+    # column-oriented BBRecordBatch objects when the data source enables batching
+    # (params 'delivery_batch_size' / 'delivery_batch_interval'). Subscribers
+    # without it keep receiving one dict per notify() call.
@@ -0,0 +1,55 @@
+# File: brainboost_data_source_package/data_source_utils/BBAdaptiveRate.py
+
+
+class BBAdaptiveRate:
+    """
+    Polling-period controller for sources whose input is bursty.
+
+    After every poll, observe() is told whether the input changed and how much CPU
+    the poll consumed. A change drops the period straight to ``min_period`` so a
+    burst of activity is captured at full rate; every unchanged poll multiplies the
+    period by ``backoff`` up to the ``max_period`` ceiling. Independently, the
+    period never falls below what keeps the average poll cost (an exponential
+    moving average of CPU seconds) within ``cpu_budget``, a fraction of one core.
+    """
+
+    def __init__(self, min_period=0.5, max_period=60.0, backoff=2.0, cpu_budget=0.5, smoothing=0.3):
+        if not 0 < min_period <= max_period:
+            raise ValueError("Expected 0 < min_period <= max_period.")
+        if backoff < 1 or not 0 < cpu_budget:
+            raise ValueError("Expected backoff >= 1 and a positive cpu_budget.")
+        self.min_period = min_period
+        self.max_period = max_period
+        self.backoff = backoff
+        self.cpu_budget = cpu_budget
+        self.smoothing = smoothing
+        self.period = min_period
+        self.average_cost = None
+
+    def budget_floor(self):
+        """Shortest period that keeps the average poll cost within the CPU budget."""
+        if self.average_cost is None:
+            return self.min_period
+        return max(self.min_period, self.average_cost / self.cpu_budget)
+
+    def observe(self, changed, cpu_seconds=0.0):
+        """
+        Record one poll and return the period to use for the next one.
+
+        Args:
+            changed (bool): Whether the input changed since the previous poll.
+            cpu_seconds (float): CPU time the poll consumed.
+        """
+        if self.average_cost is None:
+            self.average_cost = cpu_seconds
+        else:
+            self.average_cost += self.smoothing * (cpu_seconds - self.average_cost)
+
+        period = self.min_period if changed else self.period * self.backoff
+        # The budget may push the period above the ceiling: the budget wins.
+        self.period = max(min(period, self.max_period), self.budget_floor())
+        return self.period
+
+    def rate(self):
+        """Current polls per second."""
+        return 1.0 / self.period
@@ -0,0 +1,107 @@
+# File: brainboost_data_source_package/data_source_utils/BBAudioChunker.py
+
+import numpy as np
+
+
+class BBAudioChunker:
+    """
+    Splits long mono audio into overlapping chunks cut at silences, and stitches the
+    per-chunk transcriptions back into one timeline.
+
+    Cut points are placed near every ``chunk_seconds``, at the quietest frame (lowest
+    RMS energy) within ``search_seconds`` of the target, so words are rarely split.
+    Each chunk "owns" the audio between its two cut points but is transcribed with
+    ``overlap_seconds`` of extra context on both sides. When merging, segment times
+    are shifted by the chunk offset, segments centred outside the owned range are
+    dropped, and words repeated across the seam are removed.
+    """
+
+    def __init__(self, sample_rate=16000, chunk_seconds=300.0, overlap_seconds=2.0,
+                 search_seconds=10.0, frame_seconds=0.03):
+        self.sample_rate = sample_rate
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.search_seconds = search_seconds
+        self.frame_seconds = frame_seconds
+
+    def cut_points(self, samples):
+        """Sample offsets of the chunk boundaries, including 0 and len(samples)."""
+        total = len(samples)
+        chunk = int(self.chunk_seconds * self.sample_rate)
+        if total <= chunk:
+            return [0, total]
+        frame = max(1, int(self.frame_seconds * self.sample_rate))
+        usable = total - total % frame
+        energy = np.sqrt(np.mean(np.square(samples[:usable].reshape(-1, frame), dtype=np.float32), axis=1))
+        search = int(self.search_seconds * self.sample_rate) // frame
+
+        cuts = [0]
+        target = chunk
+        while target < total - chunk // 2:
+            centre = target // frame
+            low, high = max(1, centre - search), min(len(energy), centre + search + 1)
+            cut = (low + int(np.argmin(energy[low:high]))) * frame if low < high else target
+            cuts.append(cut)
+            target = cut + chunk
+        cuts.append(total)
+        return cuts
+
+    def split(self, samples):
+        """
+        Returns:
+            list: (offset_seconds, owned_start_seconds, owned_end_seconds, chunk_samples)
+            per chunk; chunk_samples are views into ``samples``.
+        """
+        cuts = self.cut_points(samples)
+        overlap = int(self.overlap_seconds * self.sample_rate)
+        chunks = []
+        for start, end in zip(cuts, cuts[1:]):
+            padded_start = max(0, start - overlap)
+            padded_end = min(len(samples), end + overlap)
+            chunks.append((padded_start / self.sample_rate, start / self.sample_rate,
+                           end / self.sample_rate, samples[padded_start:padded_end]))
+        return chunks
+
+    @staticmethod
+    def _seam_overlap(previous_words, words, max_words=12):
+        """Length of the longest run of words ending ``previous_words`` that also starts ``words``."""
+        def normalise(word):
+            return word.strip('.,;:!?¡¿"\'').lower()
+
+        limit = min(max_words, len(previous_words), len(words))
+        for size in range(limit, 0, -1):
+            if [normalise(w) for w in previous_words[-size:]] == [normalise(w) for w in words[:size]]:
+                return size
+        return 0
+
+    def merge(self, chunks, results):
+        """
+        Stitch per-chunk Whisper results (dicts with 'segments') into one segment list.
+
+        Args:
+            chunks (list): Output of split(), in order.
+            results (list): Transcription result of each chunk, in the same order.
+
+        Returns:
+            tuple: (text, segments) with segment times relative to the whole audio.
+        """
+        merged = []
+        for (offset, owned_start, owned_end, _), result in zip(chunks, results):
+            at_seam = bool(merged)
+            for segment in result.get('segments', []):
+                start = segment.get('start', 0.0) + offset
+                end = segment.get('end', 0.0) + offset
+                if not owned_start <= (start + end) / 2 < owned_end:
+                    continue
+                text = segment.get('text', '')
+                if at_seam:
+                    # Only the first segment after a cut can repeat the previous chunk's tail.
+                    at_seam = False
+                    words = text.split()
+                    repeated = self._seam_overlap(merged[-1]['text'].split(), words)
+                    if repeated:
+                        text = ' ' + ' '.join(words[repeated:]) if repeated < len(words) else ''
+                if not text.strip():
+                    continue
+                merged.append(dict(segment, start=start, end=end, text=text, id=len(merged)))
+        return ''.join(segment['text'] for segment in merged), merged
@@ -0,0 +1,73 @@
+# File: brainboost_data_source_package/data_source_utils/BBAudioDecoder.py
+
+import os
+import subprocess
+import tempfile
+
+import numpy as np
+
+
+class BBAudioDecoder:
+    """
+    Decodes any audio/video file ffmpeg understands straight to mono float32 PCM at
+    ``sample_rate`` (16 kHz, what Whisper expects), in a single ffmpeg pass.
+
+    Short audio is read from ffmpeg's stdout into memory. Audio longer than
+    ``memmap_threshold_seconds`` (or of unknown length, when ``prefer_memmap`` is set)
+    is written by ffmpeg to a raw file and memory-mapped copy-on-write, so it is
+    paged in on demand instead of being held in RAM. Both results are writable
+    NumPy arrays that can be passed to ``whisper.transcribe`` directly.
+    """
+
+    def __init__(self, sample_rate=16000, memmap_threshold_seconds=1800, ffmpeg='ffmpeg'):
+        self.sample_rate = sample_rate
+        self.memmap_threshold_seconds = memmap_threshold_seconds
+        self.ffmpeg = ffmpeg
+
+    def _command(self, path, output):
+        return [self.ffmpeg, '-nostdin', '-hide_banner', '-loglevel', 'error', '-threads', '0',
+                '-i', path, '-f', 'f32le', '-acodec', 'pcm_f32le', '-ac', '1', '-ar', str(self.sample_rate),
+                '-y', output]
+
+    def decode(self, path, duration=None, workdir=None, prefer_memmap=False):
+        """
+        Decode ``path``. ``duration`` (seconds, e.g. from yt-dlp metadata) selects
+        in-memory or memory-mapped output; memory-mapped files go in ``workdir``.
+        """
+        if (duration is not None and duration > self.memmap_threshold_seconds) or \
+                (duration is None and prefer_memmap):
+            fd, raw_path = tempfile.mkstemp(suffix='.f32', dir=workdir)
+            os.close(fd)
+            return self.decode_to_file(path, raw_path)
+        return self.decode_to_memory(path)
+
+    def decode_to_memory(self, path):
+        process = subprocess.Popen(self._command(path, 'pipe:1'), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        buffer = bytearray()
+        while True:
+            chunk = process.stdout.read(1 << 20)
+            if not chunk:
+                break
+            buffer += chunk
+        stderr = process.stderr.read()
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed to decode {path}: {stderr.decode(errors='replace').strip()}")
+        # A bytearray-backed array is writable, so torch.from_numpy accepts it without a copy.
+        return np.frombuffer(buffer, dtype=np.float32)
+
+    def decode_to_file(self, path, raw_path):
+        """Decode into a raw float32 file and return it memory-mapped."""
+        result = subprocess.run(self._command(path, raw_path), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed to decode {path}: {result.stderr.decode(errors='replace').strip()}")
+        return self.open_raw(raw_path)
+
+    @staticmethod
+    def open_raw(raw_path):
+        """Memory-map a raw float32 file produced by decode_to_file (copy-on-write)."""
+        if os.path.getsize(raw_path) == 0:
+            return np.zeros(0, dtype=np.float32)
+        return np.memmap(raw_path, dtype=np.float32, mode='c')
+
+    def duration(self, samples):
+        return len(samples) / self.sample_rate
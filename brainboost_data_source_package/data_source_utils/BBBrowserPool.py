@@ -0,0 +1,98 @@
+# File: brainboost_data_source_package/data_source_utils/BBBrowserPool.py
+
+import queue
+import threading
+from contextlib import contextmanager
+
+from brainboost_data_source_logger_package.BBLogger import BBLogger
+
+
+class BBBrowserPool:
+    """
+    A pool of warm headless browsers (Selenium WebDrivers) shared by scraping sources.
+
+    Starting Chrome costs seconds and hundreds of MB, so drivers are created lazily
+    up to ``size`` and handed out again and again with acquire(); a driver that
+    raised while checked out is quit and replaced on the next acquire(). Each driver
+    keeps its cookies and loaded page, so a source can navigate once and then serve
+    many requests from it. Selenium is only imported when the first driver is made.
+    """
+
+    def __init__(self, size=1, headless=True, window_size=(1920, 1080), driver_factory=None):
+        self.size = size
+        self.headless = headless
+        self.window_size = window_size
+        self.driver_factory = driver_factory or self._create_chrome
+        self._idle = queue.LifoQueue()  # most recently used first: its page is most likely still warm
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _create_chrome(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        if self.headless:
+            options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-extensions")
+        options.add_argument(f"--window-size={self.window_size[0]},{self.window_size[1]}")
+        options.page_load_strategy = 'eager'  # DOM ready is enough, do not wait for images
+        return webdriver.Chrome(options=options)
+
+    def _take(self, timeout):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if not create:
+            return self._idle.get(timeout=timeout)
+        try:
+            driver = self.driver_factory()
+        except BaseException:
+            with self._lock:
+                self._created -= 1
+            raise
+        BBLogger.log(f"Started browser {self._created} of {self.size} for the browser pool.")
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._created -= 1
+        try:
+            driver.quit()
+        except Exception as e:
+            BBLogger.log(f"Error quitting browser: {e}", level='warning')
+
+    @contextmanager
+    def acquire(self, timeout=None):
+        """Borrow a driver for the duration of the with-block (waits while all are busy)."""
+        if self._closed:
+            raise RuntimeError("The browser pool is closed.")
+        driver = self._take(timeout)
+        try:
+            yield driver
+        except BaseException:
+            self._discard(driver)
+            raise
+        if self._closed:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    def close(self):
+        """Quit every idle driver; drivers in use are quit when returned."""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
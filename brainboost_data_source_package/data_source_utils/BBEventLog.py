@@ -0,0 +1,324 @@
+# File: brainboost_data_source_package/data_source_utils/BBEventLog.py
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+from brainboost_data_source_logger_package.BBLogger import BBLogger
+
+
+class BBEventLog:
+    """
+    Segmented, append-only event log used to make real-time deliveries durable.
+
+    Layout on disk (inside ``log_dir``):
+      - ``<base_offset>.log``    records as ``[length][crc32][json payload]``
+      - ``<base_offset>.index``  one 8-byte file position per record (offset index)
+      - ``offsets/<consumer>.offset``  next offset to deliver for each consumer
+
+    Appends are group-committed: a waiting writer wakes a background flusher and
+    blocks until it has fsynced a batch containing its record. The fsync runs
+    outside the lock, so records appended meanwhile join the next batch and many
+    concurrent appends share one fsync. Appends that do not wait are synced every
+    ``fsync_interval`` seconds or once ``fsync_batch`` are pending. Reads go
+    through read-only mmaps of the segment files.
+    """
+
+    _RECORD_HEADER = struct.Struct('>II')  # payload length, crc32
+    _INDEX_ENTRY = struct.Struct('>Q')     # file position of the record
+    _LOG_SUFFIX = '.log'
+    _INDEX_SUFFIX = '.index'
+
+    def __init__(self, log_dir, segment_bytes=64 * 1024 * 1024, fsync_interval=0.05, fsync_batch=256,
+                 retention_bytes=None, retention_seconds=None):
+        self.log_dir = log_dir
+        self.segment_bytes = segment_bytes
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        self.retention_bytes = retention_bytes
+        self.retention_seconds = retention_seconds
+
+        self._offsets_dir = os.path.join(log_dir, 'offsets')
+        os.makedirs(self._offsets_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._flushed = threading.Condition(self._lock)
+        self._wake_flusher = threading.Condition(self._lock)
+        self._sync_requested = False
+        self._closed = False
+        self._segments = []          # sorted base offsets
+        self._sealed_maps = {}       # base offset -> (log mmap, index mmap)
+        self._consumer_offsets = {}  # consumer id -> next offset to deliver
+        self._dirty_consumers = set()
+        self._pending = 0
+        self._durable_offset = 0
+
+        self._load_segments()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+        BBLogger.log(f"Event log opened at {log_dir} (offsets {self.start_offset()}..{self._next_offset}).")
+
+    # === Segment management ===
+
+    def _segment_path(self, base_offset, suffix):
+        return os.path.join(self.log_dir, f"{base_offset:020d}{suffix}")
+
+    def _load_segments(self):
+        for filename in os.listdir(self.log_dir):
+            if filename.endswith(self._LOG_SUFFIX):
+                self._segments.append(int(filename[:-len(self._LOG_SUFFIX)]))
+        self._segments.sort()
+        if not self._segments:
+            self._segments.append(0)
+        self._open_active_segment(self._segments[-1], recover=True)
+        self._durable_offset = self._next_offset
+
+    def _open_active_segment(self, base_offset, recover=False):
+        log_path = self._segment_path(base_offset, self._LOG_SUFFIX)
+        index_path = self._segment_path(base_offset, self._INDEX_SUFFIX)
+        count = self._recover_segment(log_path, index_path) if recover else 0
+        self._active_base = base_offset
+        self._log_file = open(log_path, 'ab')
+        self._index_file = open(index_path, 'ab')
+        self._next_offset = base_offset + count
+
+    def _recover_segment(self, log_path, index_path):
+        """
+        Rebuild the index of the active segment from its log and truncate any torn tail
+        left by a crash between a write and its fsync. Returns the number of valid records.
+        """
+        positions = []
+        valid_size = 0
+        if os.path.exists(log_path):
+            with open(log_path, 'rb') as f:
+                data = f.read()
+            header_size = self._RECORD_HEADER.size
+            while valid_size + header_size <= len(data):
+                length, crc = self._RECORD_HEADER.unpack_from(data, valid_size)
+                end = valid_size + header_size + length
+                if end > len(data) or zlib.crc32(data[valid_size + header_size:end]) != crc:
+                    break
+                positions.append(valid_size)
+                valid_size = end
+            if valid_size != len(data):
+                BBLogger.log(f"Truncating torn tail of {log_path} at byte {valid_size}.", level='warning')
+                with open(log_path, 'r+b') as f:
+                    f.truncate(valid_size)
+        with open(index_path, 'wb') as f:
+            f.write(b''.join(self._INDEX_ENTRY.pack(pos) for pos in positions))
+        return len(positions)
+
+    def _roll_segment(self):
+        """Seal the active segment and start a new one. Caller holds the lock."""
+        self._sync_files()
+        self._log_file.close()
+        self._index_file.close()
+        self._segments.append(self._next_offset)
+        self._open_active_segment(self._next_offset)
+        BBLogger.log(f"Event log rolled to segment {self._active_base}.")
+        self._enforce_retention()
+
+    def _enforce_retention(self):
+        """Delete the oldest sealed segments beyond the size or age limits. Caller holds the lock."""
+        if self.retention_bytes is None and self.retention_seconds is None:
+            return
+        now = time.time()
+        sizes = {base: os.path.getsize(self._segment_path(base, self._LOG_SUFFIX)) for base in self._segments}
+        total = sum(sizes.values())
+        while len(self._segments) > 1:
+            base = self._segments[0]
+            log_path = self._segment_path(base, self._LOG_SUFFIX)
+            too_big = self.retention_bytes is not None and total > self.retention_bytes
+            too_old = (self.retention_seconds is not None
+                       and now - os.path.getmtime(log_path) > self.retention_seconds)
+            if not (too_big or too_old):
+                break
+            # Cached maps are dropped rather than closed so in-flight readers keep a valid view.
+            self._sealed_maps.pop(base, None)
+            os.remove(log_path)
+            os.remove(self._segment_path(base, self._INDEX_SUFFIX))
+            self._segments.pop(0)
+            total -= sizes[base]
+            BBLogger.log(f"Event log retention removed segment {base}.")
+
+    # === Writing ===
+
+    def append(self, record, wait=True):
+        """
+        Append a JSON-serializable record and return its offset.
+        With ``wait`` the call returns only once the record has been fsynced.
+        """
+        payload = json.dumps(record, default=str).encode('utf-8')
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Event log is closed.")
+            if self._log_file.tell() >= self.segment_bytes:
+                self._roll_segment()
+            position = self._log_file.tell()
+            self._log_file.write(self._RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+            self._index_file.write(self._INDEX_ENTRY.pack(position))
+            offset = self._next_offset
+            self._next_offset += 1
+            self._pending += 1
+            if wait:
+                self._sync_requested = True
+            if wait or self._pending >= self.fsync_batch:
+                self._wake_flusher.notify()
+            if wait:
+                while self._durable_offset <= offset and not self._closed:
+                    self._flushed.wait()
+        return offset
+
+    def _sync_files(self):
+        """Flush and fsync the active segment. Caller holds the lock."""
+        self._log_file.flush()
+        self._index_file.flush()
+        os.fsync(self._log_file.fileno())
+        os.fsync(self._index_file.fileno())
+        self._durable_offset = self._next_offset
+        self._pending = 0
+        self._sync_requested = False
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                if not (self._closed or self._sync_requested or self._pending >= self.fsync_batch):
+                    self._wake_flusher.wait(self.fsync_interval)
+                if self._closed:
+                    return
+                if self._dirty_consumers:
+                    self._persist_consumer_offsets()
+                if self.retention_seconds is not None:
+                    self._enforce_retention()
+                if not self._pending:
+                    continue
+                self._log_file.flush()
+                self._index_file.flush()
+                target = self._next_offset
+                self._pending = 0
+                self._sync_requested = False
+                # Duplicated descriptors stay valid even if the segment rolls during the fsync.
+                fds = [os.dup(self._log_file.fileno()), os.dup(self._index_file.fileno())]
+            try:
+                for fd in fds:
+                    os.fsync(fd)
+            finally:
+                for fd in fds:
+                    os.close(fd)
+            with self._lock:
+                self._durable_offset = max(self._durable_offset, target)
+                self._flushed.notify_all()
+
+    # === Reading ===
+
+    def start_offset(self):
+        """Oldest offset still retained in the log."""
+        return self._segments[0]
+
+    def end_offset(self):
+        """Offset that the next durable record will receive."""
+        return self._durable_offset
+
+    def _maps_for(self, base):
+        """
+        Return ``(log mmap, index mmap, owned)`` for a segment. Sealed segments are
+        cached; maps of the active segment are ``owned`` and must be closed by the caller.
+        """
+        with self._lock:
+            if base in self._sealed_maps:
+                return self._sealed_maps[base] + (False,)
+            maps = []
+            for suffix in (self._LOG_SUFFIX, self._INDEX_SUFFIX):
+                with open(self._segment_path(base, suffix), 'rb') as f:
+                    maps.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            maps = tuple(maps)
+            if base != self._active_base:
+                self._sealed_maps[base] = maps
+                return maps + (False,)
+            return maps + (True,)
+
+    def read(self, offset, max_records=1000):
+        """Return a list of ``(offset, record)`` pairs starting at ``offset`` (durable records only)."""
+        with self._lock:
+            offset = max(offset, self.start_offset())
+            end = min(self._durable_offset, offset + max_records)
+            if offset >= end:
+                return []
+            segments = list(self._segments)
+        records = []
+        while offset < end:
+            seg_idx = bisect.bisect_right(segments, offset) - 1
+            base = segments[seg_idx]
+            seg_end = segments[seg_idx + 1] if seg_idx + 1 < len(segments) else end
+            log_map, index_map, owned = self._maps_for(base)
+            try:
+                for current in range(offset, min(seg_end, end)):
+                    position, = self._INDEX_ENTRY.unpack_from(index_map, (current - base) * self._INDEX_ENTRY.size)
+                    length, _ = self._RECORD_HEADER.unpack_from(log_map, position)
+                    start = position + self._RECORD_HEADER.size
+                    records.append((current, json.loads(log_map[start:start + length])))
+                    offset = current + 1
+            finally:
+                if owned:
+                    log_map.close()
+                    index_map.close()
+        return records
+
+    # === Consumer offsets ===
+
+    def committed(self, consumer_id):
+        """Next offset to deliver to ``consumer_id``, or None for an unknown consumer."""
+        with self._lock:
+            if consumer_id not in self._consumer_offsets:
+                path = os.path.join(self._offsets_dir, f"{consumer_id}.offset")
+                if not os.path.exists(path):
+                    return None
+                with open(path, 'r') as f:
+                    self._consumer_offsets[consumer_id] = int(f.read().strip() or 0)
+            offset = self._consumer_offsets[consumer_id]
+            if offset < self.start_offset():
+                BBLogger.log(f"Consumer {consumer_id} lagged past retention; skipping to {self.start_offset()}.",
+                             level='warning')
+                offset = self.start_offset()
+            return offset
+
+    def commit(self, consumer_id, offset):
+        """Record that everything before ``offset`` was delivered; persisted with the next flush."""
+        with self._lock:
+            self._consumer_offsets[consumer_id] = offset
+            self._dirty_consumers.add(consumer_id)
+
+    def _persist_consumer_offsets(self):
+        """Atomically write dirty consumer offsets. Caller holds the lock."""
+        for consumer_id in self._dirty_consumers:
+            path = os.path.join(self._offsets_dir, f"{consumer_id}.offset")
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(str(self._consumer_offsets[consumer_id]))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        self._dirty_consumers.clear()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._sync_files()
+            self._persist_consumer_offsets()
+            self._closed = True
+            self._flushed.notify_all()
+            self._wake_flusher.notify_all()
+            self._log_file.close()
+            self._index_file.close()
+            for maps in self._sealed_maps.values():
+                for m in maps:
+                    m.close()
+            self._sealed_maps.clear()
+        self._flusher.join()
+        BBLogger.log(f"Event log at {self.log_dir} closed.")
@@ -0,0 +1,66 @@
+# File: brainboost_data_source_package/data_source_utils/BBFrameDiff.py
+
+import numpy as np
+
+
+class BBFrameChangeDetector:
+    """
+    Cheap change detector for consecutive screen frames, meant to run before OCR.
+
+    Each frame is downscaled by striding, converted to grayscale and compared with
+    the previous one; the absolute difference is averaged per tile with a single
+    vectorized reshape. Tiles whose mean difference exceeds ``threshold`` (0-255
+    scale) are reported as changed, as ``(x1, y1, x2, y2)`` rects in full-resolution
+    pixel coordinates.
+    """
+
+    def __init__(self, tile_size=64, threshold=2.0, downscale=4):
+        if tile_size % downscale:
+            raise ValueError("tile_size must be a multiple of downscale.")
+        self.tile_size = tile_size
+        self.threshold = threshold
+        self.downscale = downscale
+        self._previous = None
+        self._shape = None
+
+    def _prepare(self, frame):
+        small = frame[::self.downscale, ::self.downscale]
+        if small.ndim == 3:
+            small = small[..., :3].mean(axis=2, dtype=np.float32)
+        else:
+            small = small.astype(np.float32)
+        tile = self.tile_size // self.downscale
+        pad_h = -small.shape[0] % tile
+        pad_w = -small.shape[1] % tile
+        if pad_h or pad_w:
+            small = np.pad(small, ((0, pad_h), (0, pad_w)), mode='edge')
+        return small
+
+    def _all_tiles(self, height, width):
+        return [(x, y, min(x + self.tile_size, width), min(y + self.tile_size, height))
+                for y in range(0, height, self.tile_size)
+                for x in range(0, width, self.tile_size)]
+
+    def changed_tiles(self, frame):
+        """
+        Compare ``frame`` with the previous one and return the changed tile rects.
+        The first frame (or a resolution change) reports every tile as changed.
+        """
+        height, width = frame.shape[:2]
+        current = self._prepare(frame)
+        previous, self._previous = self._previous, current
+        if previous is None or self._shape != frame.shape:
+            self._shape = frame.shape
+            return self._all_tiles(height, width)
+
+        tile = self.tile_size // self.downscale
+        rows, cols = current.shape[0] // tile, current.shape[1] // tile
+        diff = np.abs(current - previous).reshape(rows, tile, cols, tile).mean(axis=(1, 3))
+        changed = np.argwhere(diff > self.threshold)
+        return [(int(c) * self.tile_size, int(r) * self.tile_size,
+                 min((int(c) + 1) * self.tile_size, width), min((int(r) + 1) * self.tile_size, height))
+                for r, c in changed]
+
+    def reset(self):
+        self._previous = None
+        self._shape = None
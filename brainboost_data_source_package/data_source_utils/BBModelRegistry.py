@@ -0,0 +1,173 @@
+# File: brainboost_data_source_package/data_source_utils/BBModelRegistry.py
+
+import os
+import threading
+from collections import OrderedDict
+
+from brainboost_configuration_package.BBConfig import BBConfig
+from brainboost_data_source_logger_package.BBLogger import BBLogger
+
+
+class BBModelRegistry:
+    """
+    Process-wide cache of loaded ML models (Whisper, Hugging Face pipelines, ...).
+
+    Models are identified by a hashable key and built by a loader callable, either
+    registered up front with register() or passed to get(). A model is loaded lazily
+    on first use, exactly once even when several threads ask for it concurrently, and
+    kept resident in LRU order. The registry evicts the least recently used models
+    when more than ``max_models`` are resident or their estimated size exceeds
+    ``max_memory_bytes``; callers still holding an evicted model keep it alive until
+    they drop it. After a fork the child starts with an empty registry.
+
+    Loaders should be module-level functions (or functools.partial of them) keyed by
+    the model's configuration, not bound methods: the registry lives as long as the
+    process and would otherwise keep the registering object alive. The limits of
+    the shared registry are process-wide; they start from the 'model_registry_max_models'
+    and 'model_registry_max_bytes' config keys and are changed with set_limits().
+    """
+
+    _instance = None
+    _instance_pid = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_models=None, max_memory_bytes=None):
+        self.max_models = max_models
+        self.max_memory_bytes = max_memory_bytes
+        self._loaders = {}
+        self._models = OrderedDict()  # key -> (model, size in bytes)
+        self._loading = {}  # key -> lock held while the model is being loaded
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    @classmethod
+    def get_registry_singleton(cls):
+        """Registry shared by every data source in the current process."""
+        with cls._instance_lock:
+            if cls._instance is None or cls._instance_pid != os.getpid():
+                cls._instance = cls(max_models=BBConfig.get('model_registry_max_models'),
+                                    max_memory_bytes=BBConfig.get('model_registry_max_bytes'))
+                cls._instance_pid = os.getpid()
+            return cls._instance
+
+    # === Public API ===
+
+    def set_limits(self, max_models=None, max_memory_bytes=None):
+        """
+        Tighten or relax the limits; None leaves a limit unchanged. On the shared
+        registry this affects every user of it in the process.
+        """
+        with self._lock:
+            if max_models is not None:
+                self.max_models = max_models
+            if max_memory_bytes is not None:
+                self.max_memory_bytes = max_memory_bytes
+            BBLogger.log(f"Model registry limits: {self.max_models} models, {self.max_memory_bytes} bytes.")
+            self._evict_over_limits(keep=None)
+
+    def register(self, key, loader, size_bytes=None):
+        """
+        Declare how to load a model without loading it.
+
+        Args:
+            key: Hashable model identifier, e.g. ('whisper', 'base').
+            loader (callable): Builds the model from ``key`` alone (see the class docstring).
+            size_bytes (int, optional): Memory estimate, used when it cannot be measured.
+        """
+        with self._lock:
+            self._loaders[key] = (loader, size_bytes)
+
+    def get(self, key, loader=None, size_bytes=None):
+        """Return the model for ``key``, loading it on first use."""
+        if loader is not None:
+            with self._lock:
+                self._loaders.setdefault(key, (loader, size_bytes))
+        while True:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    self._models.move_to_end(key)
+                    return entry[0]
+                if key not in self._loaders:
+                    raise KeyError(f"No loader registered for model {key!r}.")
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = threading.Lock()
+                    loading.acquire()
+                    break
+            # Another thread is loading this model; wait for it and look again.
+            with loading:
+                pass
+
+        try:
+            model, size_bytes = self._load(key)
+            with self._lock:
+                self._models[key] = (model, size_bytes)
+                self._evict_over_limits(keep=key)
+            return model
+        finally:
+            with self._lock:
+                del self._loading[key]
+            loading.release()
+
+    def warm_up(self, keys=None):
+        """Load the given (default: all registered) models, e.g. when a worker process starts."""
+        with self._lock:
+            keys = list(self._loaders) if keys is None else list(keys)
+        for key in keys:
+            self.get(key)
+
+    def evict(self, key):
+        with self._lock:
+            self._models.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def loaded_keys(self):
+        with self._lock:
+            return list(self._models)
+
+    def memory_usage(self):
+        with self._lock:
+            return sum(size for _, size in self._models.values())
+
+    # === Internals ===
+
+    def _load(self, key):
+        loader, size_bytes = self._loaders[key]
+        BBLogger.log(f"Loading model {key!r}.")
+        model = loader()
+        self.loads += 1
+        measured = self.estimate_model_bytes(model)
+        return model, measured if measured else (size_bytes or 0)
+
+    def _evict_over_limits(self, keep):
+        """Drop least recently used models until both limits hold. Caller holds the lock."""
+        def over_limits():
+            if self.max_models is not None and len(self._models) > self.max_models:
+                return True
+            if self.max_memory_bytes is not None:
+                return sum(size for _, size in self._models.values()) > self.max_memory_bytes
+            return False
+
+        for key in list(self._models):
+            if not over_limits():
+                break
+            if key == keep:
+                continue
+            del self._models[key]
+            BBLogger.log(f"Evicted model {key!r} from the model registry.")
+
+    @staticmethod
+    def estimate_model_bytes(model):
+        """Parameter and buffer bytes of a torch model or of the model inside a pipeline, else 0."""
+        module = getattr(model, 'model', model)
+        if not hasattr(module, 'parameters'):
+            return 0
+        try:
+            tensors = list(module.parameters()) + list(getattr(module, 'buffers', lambda: [])())
+            return sum(t.numel() * t.element_size() for t in tensors)
+        except Exception:
+            return 0
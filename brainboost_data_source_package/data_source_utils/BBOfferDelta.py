@@ -0,0 +1,53 @@
+# File: brainboost_data_source_package/data_source_utils/BBOfferDelta.py
+
+
+class BBOfferDelta:
+    """
+    Remembers the last offer snapshot of every market and turns each new snapshot
+    into a delta: the offers that appeared, the ids of the ones that disappeared
+    and the offers whose ``fields`` (price, available quantity, limits, payment
+    methods...) changed. Offers are dicts identified by their 'offer_id'.
+    """
+
+    DEFAULT_FIELDS = ('price', 'available', 'min_amount', 'max_amount', 'payment_methods')
+
+    def __init__(self, fields=DEFAULT_FIELDS):
+        self.fields = tuple(fields)
+        self._snapshots = {}  # market -> {offer_id: (fingerprint, offer)}
+
+    def _fingerprint(self, offer):
+        return tuple(tuple(value) if isinstance(value, list) else value
+                     for value in (offer.get(field) for field in self.fields))
+
+    def diff(self, market, offers):
+        """
+        Replace the snapshot of ``market`` with ``offers`` and return the difference.
+
+        Returns:
+            dict: {'added': [offer, ...], 'removed': [offer_id, ...], 'changed': [offer, ...]}
+        """
+        previous = self._snapshots.get(market, {})
+        current = {}
+        added, changed = [], []
+        for offer in offers:
+            offer_id = offer['offer_id']
+            fingerprint = self._fingerprint(offer)
+            current[offer_id] = (fingerprint, offer)
+            before = previous.get(offer_id)
+            if before is None:
+                added.append(offer)
+            elif before[0] != fingerprint:
+                changed.append(offer)
+        removed = [offer_id for offer_id in previous if offer_id not in current]
+        self._snapshots[market] = current
+        return {'added': added, 'removed': removed, 'changed': changed}
+
+    def snapshot(self, market):
+        """The offers last seen for ``market``."""
+        return [offer for _, offer in self._snapshots.get(market, {}).values()]
+
+    def markets(self):
+        return list(self._snapshots)
+
+    def forget(self, market):
+        self._snapshots.pop(market, None)
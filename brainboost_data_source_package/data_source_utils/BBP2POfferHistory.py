@@ -0,0 +1,239 @@
+# File: brainboost_data_source_package/data_source_utils/BBP2POfferHistory.py
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+
+class BBP2POfferHistory:
+    """
+    Append-only columnar store of P2P offer events for backtesting.
+
+    Rows are partitioned by exchange, market and UTC day:
+    ``<directory>/<exchange>/<TOKEN_FIAT_SIDE>/<YYYY-MM-DD>/``. Each partition holds
+    one raw little-endian file per column (``<column>.bin``), so a column is read by
+    memory-mapping it, and ``strings.jsonl``, the partition's dictionary: the
+    string columns (offer id, trader, payment methods) store uint32 codes into it.
+    A row takes 53 bytes, so millions of rows per day stay small, and only the
+    columns and time range being scanned are paged in.
+
+    Events are 'added' (0), 'changed' (1) and 'removed' (2, numeric columns NaN).
+    Rows are buffered and written when ``flush_rows`` are pending or
+    ``flush_interval`` seconds have passed since the last write, checked on every
+    append and by flush_if_due(), which the owner calls periodically so a quiet
+    market's rows are not held back. A partition's row count is the length of its
+    shortest column and a dictionary line without its newline is ignored, so a
+    write interrupted half-way never exposes a partial row (and the writer truncates
+    such tails on reopening). Timestamps are assumed non-decreasing within a
+    market, which is what lets scans bisect them.
+    """
+
+    NUMERIC_COLUMNS = {'timestamp': '<f8', 'price': '<f8', 'available': '<f8',
+                       'min_amount': '<f8', 'max_amount': '<f8', 'event': '|u1'}
+    STRING_COLUMNS = ('offer_id', 'trader', 'payment_methods')
+    CODE_DTYPE = '<u4'
+    EVENTS = {'added': 0, 'changed': 1, 'removed': 2}
+
+    def __init__(self, directory, flush_rows=4096, flush_interval=5.0):
+        self.directory = directory
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+        self._partitions = {}  # partition path -> {'codes': {string: code}, 'new': [...], 'rows': {column: []}}
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _day(timestamp):
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime('%Y-%m-%d')
+
+    def _market_dir(self, exchange, market):
+        return os.path.join(self.directory, exchange, market.replace('/', '_'))
+
+    @classmethod
+    def _columns(cls):
+        return list(cls.NUMERIC_COLUMNS) + list(cls.STRING_COLUMNS)
+
+    @classmethod
+    def _dtype(cls, column):
+        return cls.NUMERIC_COLUMNS.get(column, cls.CODE_DTYPE)
+
+    @staticmethod
+    def _read_dictionary(path, repair=False):
+        """The partition's strings, up to the last complete line (truncating the rest with repair=True)."""
+        dictionary_path = os.path.join(path, 'strings.jsonl')
+        try:
+            with open(dictionary_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        complete = data[:data.rfind(b'\n') + 1]
+        if repair and len(complete) < len(data):
+            os.truncate(dictionary_path, len(complete))
+        return [json.loads(line) for line in complete.decode('utf-8').splitlines()]
+
+    def _partition(self, path):
+        partition = self._partitions.get(path)
+        if partition is None:
+            os.makedirs(path, exist_ok=True)
+            strings = self._read_dictionary(path, repair=True)
+            self._truncate_to_complete_rows(path)
+            partition = {'codes': {value: code for code, value in enumerate(strings)}, 'new': [],
+                         'rows': {column: [] for column in self._columns()}}
+            if not strings:
+                self._encode(partition, None)  # code 0 is always None
+            self._partitions[path] = partition
+        return partition
+
+    def _truncate_to_complete_rows(self, path):
+        rows = self._rows(path)
+        for column in self._columns():
+            column_path = os.path.join(path, f"{column}.bin")
+            size = rows * np.dtype(self._dtype(column)).itemsize
+            if os.path.exists(column_path) and os.path.getsize(column_path) > size:
+                os.truncate(column_path, size)
+
+    @staticmethod
+    def _encode(partition, value):
+        code = partition['codes'].get(value)
+        if code is None:
+            code = partition['codes'][value] = len(partition['codes'])
+            partition['new'].append(value)
+        return code
+
+    def append(self, exchange, market, event, offer, timestamp):
+        """Buffer one event row for ``offer`` (a dict with the P2P offer fields, or just an id for removals)."""
+        with self._lock:
+            self._append(exchange, market, event, offer, timestamp)
+            self._maybe_flush()
+
+    def _append(self, exchange, market, event, offer, timestamp):
+        if not isinstance(offer, dict):
+            offer = {'offer_id': offer}
+        partition = self._partition(os.path.join(self._market_dir(exchange, market), self._day(timestamp)))
+        rows = partition['rows']
+        rows['timestamp'].append(timestamp)
+        rows['event'].append(self.EVENTS[event])
+        for column in ('price', 'available', 'min_amount', 'max_amount'):
+            value = offer.get(column)
+            rows[column].append(np.nan if value is None else value)
+        rows['offer_id'].append(self._encode(partition, offer.get('offer_id')))
+        rows['trader'].append(self._encode(partition, offer.get('trader')))
+        methods = offer.get('payment_methods')
+        rows['payment_methods'].append(self._encode(partition, ','.join(methods) if methods else None))
+        self._pending += 1
+
+    def append_delta(self, exchange, market, delta, timestamp=None):
+        """Buffer every event of an {'added', 'removed', 'changed'} delta published by a P2P source."""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            for event in ('added', 'changed', 'removed'):
+                for offer in delta.get(event, ()):
+                    self._append(exchange, market, event, offer, timestamp)
+            self._maybe_flush()
+
+    def _maybe_flush(self):
+        if self._pending >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+            self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def flush_if_due(self):
+        """Write pending rows once ``flush_interval`` has passed, even if nothing was appended since."""
+        with self._lock:
+            if self._pending and time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def _flush(self):
+        for path, partition in list(self._partitions.items()):
+            if partition['new']:
+                # Dictionary first, so every code written below can be resolved.
+                with open(os.path.join(path, 'strings.jsonl'), 'a', encoding='utf-8') as f:
+                    f.writelines(json.dumps(value, ensure_ascii=False) + '\n' for value in partition['new'])
+                partition['new'] = []
+            rows = partition['rows']
+            if rows['timestamp']:
+                for column, values in rows.items():
+                    with open(os.path.join(path, f"{column}.bin"), 'ab') as f:
+                        f.write(np.asarray(values, dtype=self._dtype(column)).tobytes())
+                    values.clear()
+            elif not self._is_today(path):
+                del self._partitions[path]  # finished day: drop its dictionary from memory
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def _is_today(self, path):
+        return os.path.basename(path) == self._day(time.time())
+
+    def close(self):
+        self.flush()
+
+    def markets(self, exchange):
+        """Markets of ``exchange`` with history, as 'TOKEN/FIAT/SIDE'."""
+        root = os.path.join(self.directory, exchange)
+        if not os.path.isdir(root):
+            return []
+        return sorted(name.replace('_', '/') for name in os.listdir(root))
+
+    def _rows(self, path):
+        counts = []
+        for column in self._columns():
+            try:
+                counts.append(os.path.getsize(os.path.join(path, f"{column}.bin")) // np.dtype(self._dtype(column)).itemsize)
+            except FileNotFoundError:
+                return 0
+        return min(counts)
+
+    def iter_scan(self, exchange, market, start=None, end=None, columns=None, decode=True):
+        """
+        Yield, per day partition, a dict of column arrays with the rows whose timestamp
+        is in [start, end). Numeric columns are read-only memory-mapped slices; string
+        columns are decoded to object arrays (or left as uint32 codes with decode=False;
+        codes are local to each day partition).
+        """
+        self.flush()
+        columns = list(columns or self._columns())
+        market_dir = self._market_dir(exchange, market)
+        if not os.path.isdir(market_dir):
+            return
+        first_day = self._day(start) if start is not None else None
+        last_day = self._day(end) if end is not None else None
+        for day in sorted(os.listdir(market_dir)):
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            path = os.path.join(market_dir, day)
+            rows = self._rows(path)
+            if not rows:
+                continue
+            timestamps = np.memmap(os.path.join(path, 'timestamp.bin'), dtype='<f8', mode='r', shape=(rows,))
+            low = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+            high = rows if end is None else int(np.searchsorted(timestamps, end, side='left'))
+            if low >= high:
+                continue
+            dictionary = None
+            result = {}
+            for column in columns:
+                values = np.memmap(os.path.join(path, f"{column}.bin"), dtype=self._dtype(column),
+                                   mode='r', shape=(rows,))[low:high]
+                if column in self.STRING_COLUMNS and decode:
+                    if dictionary is None:
+                        dictionary = np.array(self._read_dictionary(path) or [None], dtype=object)
+                    values = dictionary[values]
+                result[column] = values
+            yield result
+
+    def scan(self, exchange, market, start=None, end=None, columns=None, decode=True):
+        """Like iter_scan(), but concatenated into one dict of arrays."""
+        columns = list(columns or self._columns())
+        parts = list(self.iter_scan(exchange, market, start, end, columns, decode))
+        if not parts:
+            return {column: np.empty(0, dtype=object if column in self.STRING_COLUMNS and decode
+                                     else self._dtype(column)) for column in columns}
+        return {column: np.concatenate([part[column] for part in parts]) for column in columns}
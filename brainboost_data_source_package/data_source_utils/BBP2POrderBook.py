@@ -0,0 +1,169 @@
+# File: brainboost_data_source_package/data_source_utils/BBP2POrderBook.py
+
+import bisect
+import math
+import threading
+
+
+class BBP2POrderBook:
+    """
+    In-memory order book of one P2P market (token, fiat and advertisement side).
+
+    Offers (dicts with 'offer_id', 'price', 'min_amount', 'max_amount' and
+    'payment_methods', as published by the P2P data sources) are kept in a list
+    sorted by price, best first: lowest price for 'SELL' advertisements, highest
+    for 'BUY'. Secondary indexes keep one price-sorted list per payment method and
+    the offers sorted by their minimum and maximum amounts.
+
+    best() answers "best N offers payable with this method for this amount" by
+    walking the (method's) price list from the top and stopping after N matches.
+    When few offers accept the amount (found by bisecting the amount indexes), it
+    sorts just those candidates instead. Updates are incremental: apply() takes the
+    added/removed/changed delta of a poll. All methods are thread-safe.
+    """
+
+    def __init__(self, side='SELL'):
+        self.side = side.upper()
+        self._descending = self.side == 'BUY'
+        self._offers = {}             # offer_id -> offer
+        self._keys = {}               # offer_id -> price sort key
+        self._by_price = []           # [(key, offer_id)]
+        self._by_method = {}          # payment method -> [(key, offer_id)]
+        self._by_min_amount = []      # [(min_amount, offer_id)]
+        self._by_max_amount = []      # [(max_amount, offer_id)]
+        self._lock = threading.RLock()
+
+    def _price_key(self, offer):
+        price = offer.get('price')
+        if price is None:
+            return math.inf  # unpriced offers sort last
+        return -price if self._descending else price
+
+    @staticmethod
+    def _amount(value, default):
+        return default if value is None else value
+
+    @staticmethod
+    def _remove_entry(entries, entry):
+        index = bisect.bisect_left(entries, entry)
+        if index < len(entries) and entries[index] == entry:
+            del entries[index]
+
+    def _insert(self, offer):
+        offer_id = offer['offer_id']
+        key = (self._price_key(offer), offer_id)
+        self._offers[offer_id] = offer
+        self._keys[offer_id] = key
+        bisect.insort(self._by_price, key)
+        for method in offer.get('payment_methods') or ():
+            bisect.insort(self._by_method.setdefault(method, []), key)
+        bisect.insort(self._by_min_amount, (self._amount(offer.get('min_amount'), 0.0), offer_id))
+        bisect.insort(self._by_max_amount, (self._amount(offer.get('max_amount'), math.inf), offer_id))
+
+    def _delete(self, offer_id):
+        offer = self._offers.pop(offer_id, None)
+        if offer is None:
+            return False
+        key = self._keys.pop(offer_id)
+        self._remove_entry(self._by_price, key)
+        for method in offer.get('payment_methods') or ():
+            entries = self._by_method.get(method)
+            if entries is not None:
+                self._remove_entry(entries, key)
+                if not entries:
+                    del self._by_method[method]
+        self._remove_entry(self._by_min_amount, (self._amount(offer.get('min_amount'), 0.0), offer_id))
+        self._remove_entry(self._by_max_amount, (self._amount(offer.get('max_amount'), math.inf), offer_id))
+        return True
+
+    def upsert(self, offer):
+        with self._lock:
+            self._delete(offer['offer_id'])
+            self._insert(offer)
+
+    def remove(self, offer_id):
+        with self._lock:
+            return self._delete(offer_id)
+
+    def apply(self, delta):
+        """Apply a {'added', 'removed', 'changed'} delta as published by the P2P sources."""
+        with self._lock:
+            for offer_id in delta.get('removed', ()):
+                self._delete(offer_id)
+            for offer in list(delta.get('added', ())) + list(delta.get('changed', ())):
+                self._delete(offer['offer_id'])
+                self._insert(offer)
+
+    def replace(self, offers):
+        """Replace the whole book with a full snapshot."""
+        with self._lock:
+            self.clear()
+            for offer in offers:
+                self._insert(offer)
+
+    def clear(self):
+        with self._lock:
+            self._offers.clear()
+            self._keys.clear()
+            self._by_price.clear()
+            self._by_method.clear()
+            self._by_min_amount.clear()
+            self._by_max_amount.clear()
+
+    def get(self, offer_id):
+        return self._offers.get(offer_id)
+
+    def __len__(self):
+        return len(self._offers)
+
+    def payment_methods(self):
+        with self._lock:
+            return sorted(self._by_method)
+
+    def _accepts(self, offer, amount):
+        return self._amount(offer.get('min_amount'), 0.0) <= amount <= self._amount(offer.get('max_amount'), math.inf)
+
+    def _accepting(self, amount):
+        """
+        Ids of offers whose [min_amount, max_amount] contains ``amount``, scanning only
+        the smaller side of the amount indexes. Returns None when neither side is
+        selective enough to beat walking the price list.
+        """
+        low = bisect.bisect_right(self._by_min_amount, (amount, chr(0x10FFFF)))  # min_amount <= amount
+        high = bisect.bisect_left(self._by_max_amount, (amount, ''))             # max_amount < amount
+        if min(low, len(self._by_max_amount) - high) > len(self._offers) // 8:
+            return None
+        if low <= len(self._by_max_amount) - high:
+            entries = self._by_min_amount[:low]
+        else:
+            entries = self._by_max_amount[high:]
+        return [offer_id for _, offer_id in entries if self._accepts(self._offers[offer_id], amount)]
+
+    def best(self, n=10, payment_method=None, amount=None):
+        """
+        The ``n`` best-priced offers, optionally only those accepting ``payment_method``
+        and whose limits allow trading ``amount`` (in fiat).
+        """
+        with self._lock:
+            entries = self._by_price if payment_method is None else self._by_method.get(payment_method, [])
+            if amount is None:
+                return [self._offers[offer_id] for _, offer_id in entries[:n]]
+            candidates = self._accepting(amount)
+            if candidates is not None:
+                # Selective amount: sort the few candidates instead of walking the price list.
+                keys = sorted(self._keys[offer_id] for offer_id in candidates
+                              if payment_method is None or
+                              payment_method in (self._offers[offer_id].get('payment_methods') or ()))
+                return [self._offers[offer_id] for _, offer_id in keys[:n]]
+            result = []
+            for _, offer_id in entries:
+                offer = self._offers[offer_id]
+                if self._accepts(offer, amount):
+                    result.append(offer)
+                    if len(result) == n:
+                        break
+            return result
+
+    def best_price(self, payment_method=None, amount=None):
+        offers = self.best(1, payment_method=payment_method, amount=amount)
+        return offers[0]['price'] if offers else None
@@ -0,0 +1,143 @@
+# File: brainboost_data_source_package/data_source_utils/BBRecordBatch.py
+
+import threading
+import time
+
+import numpy as np
+
+from brainboost_data_source_logger_package.BBLogger import BBLogger
+
+
+class BBRecordBatch:
+    """
+    Column-oriented batch of records: one NumPy array per field, all of the same length.
+
+    Numeric and boolean fields become typed arrays; anything else (strings, nested
+    dicts, fields missing in some records) is kept in an object array with None
+    for missing values. ``to_arrow()`` converts to a ``pyarrow.RecordBatch`` when
+    pyarrow is installed.
+    """
+
+    def __init__(self, columns, num_rows):
+        self.columns = columns
+        self.num_rows = num_rows
+
+    @classmethod
+    def from_column_lists(cls, column_lists, num_rows):
+        columns = {}
+        for name, values in column_lists.items():
+            columns[name] = cls._to_array(values)
+        return cls(columns, num_rows)
+
+    @staticmethod
+    def _to_array(values):
+        if all(isinstance(v, (bool, np.bool_)) for v in values):
+            return np.asarray(values, dtype=bool)
+        if all(isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool) for v in values):
+            return np.asarray(values)
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        return array
+
+    def __len__(self):
+        return self.num_rows
+
+    def column(self, name):
+        return self.columns[name]
+
+    def to_records(self):
+        """Expand the batch back into one dict per row (missing fields are dropped)."""
+        names = list(self.columns)
+        records = []
+        for i in range(self.num_rows):
+            record = {}
+            for name in names:
+                value = self.columns[name][i]
+                if value is not None:
+                    record[name] = value.item() if isinstance(value, np.generic) else value
+            records.append(record)
+        return records
+
+    def to_arrow(self):
+        """Return a pyarrow.RecordBatch sharing the numeric buffers where possible."""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow is required for BBRecordBatch.to_arrow().")
+        return pa.RecordBatch.from_pydict({name: array for name, array in self.columns.items()})
+
+
+class BBRecordBatcher:
+    """
+    Accumulates dict records column by column and hands a BBRecordBatch to
+    ``on_flush`` once ``batch_size`` records are pending or ``flush_interval``
+    seconds have passed since the first pending record. The timer thread starts
+    with the first append and is stopped by close(), which delivers what is left;
+    appending again afterwards restarts it.
+    """
+
+    def __init__(self, on_flush, batch_size=1000, flush_interval=1.0):
+        self.on_flush = on_flush
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._reset()
+        self._stopped = threading.Event()
+        self._timer = None
+
+    def _reset(self):
+        self._columns = {}
+        self._num_rows = 0
+        self._first_append = None
+
+    def append(self, record):
+        with self._lock:
+            if self.flush_interval and self._timer is None:
+                self._stopped.clear()
+                self._timer = threading.Thread(target=self._flush_loop, daemon=True)
+                self._timer.start()
+            if self._num_rows == 0:
+                self._first_append = time.monotonic()
+            for name in record.keys() - self._columns.keys():
+                # Backfill a field first seen mid-batch.
+                self._columns[name] = [None] * self._num_rows
+            for name, values in self._columns.items():
+                values.append(record.get(name))
+            self._num_rows += 1
+            full = self.batch_size and self._num_rows >= self.batch_size
+        if full:
+            self.flush()
+
+    def _take_batch(self):
+        """Build a batch from pending rows and clear them. Caller holds the lock."""
+        batch = BBRecordBatch.from_column_lists(self._columns, self._num_rows)
+        self._reset()
+        return batch
+
+    def flush(self):
+        # Deliveries are serialized so batches reach subscribers in append order.
+        with self._flush_lock:
+            with self._lock:
+                batch = self._take_batch() if self._num_rows else None
+            if batch is not None:
+                self.on_flush(batch)
+
+    def _flush_loop(self):
+        while not self._stopped.wait(min(self.flush_interval, 0.1)):
+            with self._lock:
+                due = self._num_rows and time.monotonic() - self._first_append >= self.flush_interval
+            if due:
+                try:
+                    self.flush()
+                except Exception as e:
+                    BBLogger.log(f"Error delivering record batch: {e}", level='error')
+
+    def close(self):
+        """Stop the timer thread and deliver any pending records."""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        self._stopped.set()
+        if timer is not None:
+            timer.join()
+        self.flush()
@@ -0,0 +1,179 @@
+# File: brainboost_data_source_package/data_source_utils/BBScheduler.py
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from brainboost_data_source_logger_package.BBLogger import BBLogger
+
+
+class BBScheduledJob:
+    """
+    A callback registered with BBScheduler.
+
+    Periodic jobs are anchored: the k-th tick is due at ``anchor + k * period``
+    (plus a fresh random jitter per tick), so schedules never drift no matter
+    how long each run takes.
+    """
+
+    def __init__(self, callback, period=None, jitter=0.0, missed_tick_policy='skip', name=None):
+        if missed_tick_policy not in ('skip', 'coalesce'):
+            raise ValueError(f"Unknown missed_tick_policy '{missed_tick_policy}'.")
+        self.callback = callback
+        self.period = period
+        self.jitter = jitter
+        self.missed_tick_policy = missed_tick_policy
+        self.name = name or getattr(callback, '__qualname__', repr(callback))
+        self.anchor = None
+        self.tick = 0
+        self.generation = 0   # bumped to invalidate heap entries on reschedule/cancel
+        self.running = False
+        self.pending = False  # a coalesced tick waiting for the current run to finish
+        self.cancelled = False
+        self.missed_ticks = 0
+
+    def nominal_time(self, tick):
+        return self.anchor + tick * self.period
+
+
+class BBScheduler:
+    """
+    Single-thread heap scheduler shared by periodic data sources.
+
+    One timer thread keeps every job in a heap ordered by due time and hands due
+    callbacks to a small worker pool, so many sources fire on schedule without a
+    thread or ``threading.Timer`` each. A job never runs concurrently with itself:
+    ticks that come due while it is still running are skipped, or coalesced into
+    a single catch-up run with ``missed_tick_policy='coalesce'``.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_workers=4):
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._workers = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='BBScheduler')
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='BBSchedulerTimer', daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def get_scheduler_singleton(cls):
+        """Process-wide scheduler used by BBPeriodicDataSource."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                BBLogger.log("Shared data source scheduler started.")
+            return cls._instance
+
+    # === Public API ===
+
+    def schedule_periodic(self, callback, period, jitter=0.0, missed_tick_policy='skip', start_delay=None, name=None):
+        """Run ``callback`` every ``period`` seconds; the first run is after ``start_delay`` (default: one period)."""
+        job = BBScheduledJob(callback, period, jitter, missed_tick_policy, name)
+        with self._condition:
+            job.anchor = time.monotonic() + (period if start_delay is None else start_delay)
+            self._push(job, job.anchor)
+        return job
+
+    def call_later(self, delay, callback, name=None):
+        """Run ``callback`` once after ``delay`` seconds."""
+        job = BBScheduledJob(callback, name=name)
+        with self._condition:
+            self._push(job, time.monotonic() + delay)
+        return job
+
+    def set_period(self, job, period):
+        """Change a periodic job's period, re-anchoring its schedule at the next tick."""
+        with self._condition:
+            if job.cancelled or period == job.period:
+                return
+            job.period = period
+            job.anchor = time.monotonic() + period
+            job.tick = 0
+            job.generation += 1
+            self._push(job, job.anchor)
+
+    def cancel(self, job):
+        with self._condition:
+            job.cancelled = True
+            job.generation += 1
+            self._condition.notify()
+
+    def shutdown(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join()
+        self._workers.shutdown(wait=True)
+
+    # === Internals ===
+
+    def _push(self, job, due):
+        """Queue the job's next run. Caller holds the condition."""
+        if job.period and job.jitter:
+            due += random.uniform(0, job.jitter)
+        heapq.heappush(self._heap, (due, next(self._counter), job.generation, job))
+        self._condition.notify()
+
+    def _schedule_next(self, job, now):
+        """Queue the tick after the current one, skipping nominal times already in the past."""
+        job.tick += 1
+        nominal = job.nominal_time(job.tick)
+        if nominal < now:
+            missed = int((now - nominal) // job.period) + 1
+            job.missed_ticks += missed
+            if job.missed_tick_policy == 'coalesce':
+                # Catch up with one immediate run, then realign to the anchored grid.
+                job.tick += missed - 1
+                self._push(job, now)
+                return
+            job.tick += missed
+            nominal = job.nominal_time(job.tick)
+        self._push(job, nominal)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    now = time.monotonic()
+                    if self._heap and self._heap[0][0] <= now:
+                        break
+                    timeout = self._heap[0][0] - now if self._heap else None
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+                _, _, generation, job = heapq.heappop(self._heap)
+                if job.cancelled or generation != job.generation:
+                    continue
+                if job.period:
+                    self._schedule_next(job, now)
+                if job.running:
+                    job.missed_ticks += 1
+                    if job.missed_tick_policy == 'coalesce':
+                        job.pending = True
+                    continue
+                job.running = True
+            self._workers.submit(self._execute, job)
+
+    def _execute(self, job):
+        try:
+            job.callback()
+        except Exception as e:
+            BBLogger.log(f"Scheduled job {job.name} raised: {e}", level='error')
+        finally:
+            with self._condition:
+                job.running = False
+                if job.pending and not job.cancelled:
+                    job.pending = False
+                    job.running = True
+                    rerun = True
+                else:
+                    rerun = False
+            if rerun:
+                self._workers.submit(self._execute, job)
@@ -0,0 +1,166 @@
+# File: brainboost_data_source_package/data_source_utils/BBSharedFrameRing.py
+
+import threading
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from brainboost_data_source_logger_package.BBLogger import BBLogger
+
+
+class BBTornFrameError(Exception):
+    """Raised when a frame slot was overwritten while (or before) a reader used it."""
+
+
+class BBSharedFrameRing:
+    """
+    Ring of preallocated frame buffers in one ``multiprocessing.shared_memory`` segment.
+
+    The writer copies each frame into the next slot and returns a small descriptor
+    (segment name, byte offset, shape, dtype, slot, generation, sequence number)
+    that can be sent to other processes instead of the pixels. Readers attach to
+    the segment by name and map the frame without copying it.
+
+    Each slot is guarded by a generation counter used as a seqlock: it is odd while
+    the writer fills the slot and advances by two per write. A reader's view is
+    valid only while the slot's generation still equals the descriptor's, which
+    ``read()`` checks after the reader is done, raising BBTornFrameError otherwise.
+    With ``slots`` buffers a reader has ``slots - 1`` frame periods before its slot
+    is reused.
+    """
+
+    _HEADER_WORDS = 2  # per slot: generation, payload bytes
+    _attached = {}
+    _attached_lock = threading.Lock()
+
+    def __init__(self, slot_bytes, slots=4):
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self._header_bytes = slots * self._HEADER_WORDS * 8
+        self.shm = shared_memory.SharedMemory(create=True, size=self._header_bytes + slots * slot_bytes)
+        self.owner = True
+        self._header = np.ndarray((slots, self._HEADER_WORDS), dtype=np.uint64, buffer=self.shm.buf)
+        self._header[:] = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @staticmethod
+    def _open_untracked(name):
+        """
+        Attach to an existing segment without registering it with the resource
+        tracker, which would otherwise unlink the writer's segment when a reader exits.
+        """
+        try:
+            return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+        except TypeError:
+            pass
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+    def _slot_offset(self, slot):
+        return self._header_bytes + slot * self.slot_bytes
+
+    # === Writer side ===
+
+    def write(self, frame):
+        """Copy a frame into the next slot and return its descriptor."""
+        frame = np.ascontiguousarray(frame)
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame of {frame.nbytes} bytes does not fit in {self.slot_bytes}-byte slots.")
+        with self._lock:
+            sequence = self._sequence
+            self._sequence += 1
+            slot = sequence % self.slots
+            offset = self._slot_offset(slot)
+            generation = int(self._header[slot, 0])
+            self._header[slot, 0] = generation + 1  # odd: slot being written
+            target = np.ndarray(frame.shape, dtype=frame.dtype, buffer=self.shm.buf, offset=offset)
+            target[...] = frame
+            self._header[slot, 1] = frame.nbytes
+            self._header[slot, 0] = generation + 2
+        return {
+            'shm_name': self.name,
+            'offset': offset,
+            'shape': tuple(frame.shape),
+            'dtype': frame.dtype.str,
+            'slot': slot,
+            'generation': generation + 2,
+            'sequence': sequence
+        }
+
+    def close(self):
+        self._header = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+            BBLogger.log(f"Shared frame ring {self.shm.name} released.")
+
+    # === Reader side ===
+
+    @classmethod
+    def attach(cls, descriptor):
+        """Return the (cached) reader-side ring for the segment named in a descriptor."""
+        name = descriptor['shm_name']
+        with cls._attached_lock:
+            ring = cls._attached.get(name)
+            if ring is None:
+                # Slot geometry travels in the descriptors, so a reader only needs the segment.
+                ring = cls.__new__(cls)
+                ring.shm = cls._open_untracked(name)
+                ring.owner = False
+                ring._header = None
+                cls._attached[name] = ring
+            return ring
+
+    @classmethod
+    def detach(cls, name):
+        """Drop a cached reader-side mapping, e.g. after the writer switched segments."""
+        with cls._attached_lock:
+            ring = cls._attached.pop(name, None)
+        if ring is not None:
+            ring.close()
+
+    def _generation(self, descriptor):
+        slot = descriptor['slot']
+        header = np.ndarray((self._HEADER_WORDS,), dtype=np.uint64, buffer=self.shm.buf,
+                            offset=slot * self._HEADER_WORDS * 8)
+        return int(header[0])
+
+    def is_current(self, descriptor):
+        """True while the descriptor's slot has not been rewritten."""
+        return self._generation(descriptor) == descriptor['generation']
+
+    def view(self, descriptor):
+        """Zero-copy, read-only array over the frame; validate with is_current() after use."""
+        if not self.is_current(descriptor):
+            raise BBTornFrameError(f"Frame {descriptor['sequence']} was already overwritten.")
+        array = np.ndarray(descriptor['shape'], dtype=np.dtype(descriptor['dtype']),
+                           buffer=self.shm.buf, offset=descriptor['offset'])
+        array.flags.writeable = False
+        return array
+
+    @contextmanager
+    def read(self, descriptor):
+        """
+        Map a frame for the duration of a ``with`` block; raises BBTornFrameError on
+        exit if the writer reused the slot meanwhile (the data seen may be torn).
+        """
+        array = self.view(descriptor)
+        yield array
+        if not self.is_current(descriptor):
+            raise BBTornFrameError(f"Frame {descriptor['sequence']} was overwritten while being read.")
+
+    def copy(self, descriptor):
+        """Copy a frame out of shared memory, guaranteeing the copy is not torn."""
+        with self.read(descriptor) as array:
+            return array.copy()
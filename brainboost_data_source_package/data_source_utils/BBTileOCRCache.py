@@ -0,0 +1,66 @@
+# File: brainboost_data_source_package/data_source_utils/BBTileOCRCache.py
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class BBTileOCRCache:
+    """
+    LRU cache of OCR results keyed by a content hash of the image tile they came from.
+
+    Results are stored with rects relative to the tile, so an identical tile found
+    anywhere on screen is a hit. The cache is bounded by an estimate of the memory
+    held by the cached results (``max_bytes``); least recently used tiles are
+    evicted first.
+    """
+
+    _ENTRY_OVERHEAD = 200  # rough bytes per cached tile (key, list, OrderedDict node)
+    _RESULT_OVERHEAD = 120  # rough bytes per (text, rect) tuple besides the text itself
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (results, size)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def tile_key(tile):
+        """Content hash of a tile (pixels plus shape and dtype)."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str((tile.shape, tile.dtype.str)).encode('ascii'))
+        digest.update(tile.tobytes() if not tile.flags.c_contiguous else memoryview(tile).cast('B'))
+        return digest.digest()
+
+    def _estimate_size(self, results):
+        return self._ENTRY_OVERHEAD + sum(self._RESULT_OVERHEAD + len(text) for text, _ in results)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, results):
+        size = self._estimate_size(results)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (results, size)
+            self._size += size
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def memory_usage(self):
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
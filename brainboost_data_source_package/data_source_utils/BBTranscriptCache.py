@@ -0,0 +1,138 @@
+# File: brainboost_data_source_package/data_source_utils/BBTranscriptCache.py
+
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to atomic renames only
+    fcntl = None
+
+from brainboost_data_source_logger_package.BBLogger import BBLogger
+
+
+class BBTranscriptCache:
+    """
+    Persistent, content-addressed cache of transcription and summarization results.
+
+    Each entry is a JSON document stored under the SHA-256 of its key parts (e.g.
+    video id, model, language, summarizer), so any worker process computing the
+    same key finds the same file. Writes go to a temporary file that is atomically
+    renamed into place; writers and the evictor serialize on an exclusive
+    ``flock`` of ``.lock`` in the cache directory while readers take it shared.
+    When the total size exceeds ``max_bytes`` the least recently read entries are
+    removed first. The total is kept in ``.size`` and updated by each write under
+    the lock, so the directory is only walked when an eviction is due.
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock_path = os.path.join(directory, '.lock')
+        self._size_path = os.path.join(directory, '.size')
+
+    @staticmethod
+    def key(*parts):
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    @contextmanager
+    def _locked(self, exclusive):
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, *parts):
+        """Return the cached entry for the key parts, or None."""
+        path = self._path(self.key(*parts))
+        with self._locked(exclusive=False):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+            try:
+                os.utime(path)  # mark as recently used for eviction
+            except OSError:
+                pass
+        return entry
+
+    def put(self, entry, *parts):
+        """Store a JSON-serializable entry under the key parts, then enforce the size limit."""
+        path = self._path(self.key(*parts))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            with self._locked(exclusive=True):
+                total = self._read_total()
+                try:
+                    total -= os.path.getsize(path)
+                except OSError:
+                    pass
+                os.replace(tmp_path, path)
+                total += os.path.getsize(path)
+                if total > self.max_bytes:
+                    total = self._evict()
+                self._write_total(total)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.json'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield stat.st_mtime, stat.st_size, path
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _read_total(self):
+        """Total size of the entries as last recorded, measured on first use. Caller holds the exclusive lock."""
+        try:
+            with open(self._size_path, 'r') as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return self.size()
+
+    def _write_total(self, total):
+        with open(self._size_path, 'w') as f:
+            f.write(str(total))
+
+    def _evict(self):
+        """
+        Remove least recently used entries until under max_bytes and return the size left.
+        Caller holds the exclusive lock.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+            BBLogger.log(f"Evicted {path} from the transcript cache.")
+        return total
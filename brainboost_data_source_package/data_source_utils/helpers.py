@@ -0,0 +1,33 @@
+# File: brainboost_data_source_package/data_source_utils/helpers.py
+
+import os
+
+from brainboost_configuration_package.BBConfig import BBConfig
+
+
+def get_redis_connection_params():
+    """
+    Resolve the Redis host and port used by the data source infrastructure.
+
+    The private VM address takes precedence and is written back as
+    'redis_server_ip' / 'redis_server_port' so every component sees the same values.
+
+    :return: Tuple (host, port)
+    """
+    redis_private_ip = BBConfig.get("brainboost_server_vm_redis_private_ip_0")
+    redis_private_port = BBConfig.get("brainboost_server_vm_redis_private_port_0")
+    BBConfig.override("redis_server_ip", redis_private_ip)
+    BBConfig.override("redis_server_port", redis_private_port)
+    return BBConfig.get('redis_server_ip'), BBConfig.get('redis_server_port')
+
+
+def git_clone_path(repo_clone_url, target_directory):
+    """
+    Directory that `git clone <url>` creates inside target_directory.
+
+    :return: Path of the cloned repository
+    """
+    repo_dir = os.path.basename(repo_clone_url.rstrip('/'))
+    if repo_dir.endswith('.git'):
+        repo_dir = repo_dir[:-len('.git')]
+    return os.path.join(target_directory, repo_dir)
@@ -91,27 +91,65 @@ class ProjectContextGenerator:
                 return language
         return None
 
-    def build_tree_structure(self, root_dir):
+    def scan_project(self, root_dir):
+        """
+        Walk root_dir once with os.scandir, in the same order as os.walk, building the
+        project tree and collecting the source files to snapshot in the same pass.
+        Directory nodes are found through a relative path -> node index instead of
+        searching each parent's children.
+
+        Returns:
+            tuple: (tree, sources) where sources is a list of
+            (file, file_path, relative_file_path, stat_result or None).
+        """
+        include_extensions = tuple(self.include_extensions)
+        key_files = set(self.key_files)
+        avoid_folders = set(self.avoid_folders)
         tree = {"directory_name": os.path.basename(root_dir), "children": []}
-        for root, dirs, files in os.walk(root_dir):
-            dirs[:] = self.exclude_directories(dirs)
-            path = os.path.relpath(root, root_dir).split(os.sep)
-            subdir = tree
-            for part in path:
-                if part == '.':
+        nodes = {'': tree}
+        sources = []
+        # (directory path, relative path, parent's relative path); root is already in nodes
+        stack = [(root_dir, '', None)]
+        while stack:
+            path, relative, parent = stack.pop()
+            try:
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError:
+                continue  # like os.walk, unreadable directories are skipped
+            if parent is not None:
+                node = {"directory_name": os.path.basename(relative), "children": []}
+                nodes[parent]["children"].append(node)
+                nodes[relative] = node
+            node = nodes[relative]
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if entry.name not in avoid_folders and not entry.is_symlink():
+                        subdirs.append(entry)
+                    continue
+                file = entry.name
+                if not (file.endswith(include_extensions) or file in key_files):
+                    continue
+                node["children"].append({"file_name": file})
+                relative_file_path = os.path.join(relative, file)
+                if file in self.avoid_files or relative_file_path in self.avoid_files:
                     continue
-                for child in subdir["children"]:
-                    if child.get("directory_name") == part:
-                        subdir = child
-                        break
-                else:
-                    new_dir = {"directory_name": part, "children": []}
-                    subdir["children"].append(new_dir)
-                    subdir = new_dir
-            for file in files:
-                if file.endswith(tuple(self.include_extensions)) or file in self.key_files:
-                    subdir["children"].append({"file_name": file})
-        return tree
+                try:
+                    file_info = entry.stat()
+                except OSError:
+                    file_info = None
+                sources.append((file, os.path.join(path, file), relative_file_path, file_info))
+            for entry in reversed(subdirs):
+                stack.append((os.path.join(path, entry.name), os.path.join(relative, entry.name), relative))
+        return tree, sources
+
+    def build_tree_structure(self, root_dir):
+        return self.scan_project(root_dir)[0]
 
     def extract_imports(self, content, extension):
         patterns = {
@@ -141,69 +179,94 @@ class ProjectContextGenerator:
             self.imports[match] += 1
         return matches
 
+    def detect_project_language(self, sources):
+        """
+        The language of the first source file that has a known extension and can be
+        read, which is what the snapshot reports. Found before the sources are
+        streamed, since 'programming_language' precedes them in the document.
+        """
+        for file, file_path, _, _ in sources:
+            language = self.detect_programming_language(file)
+            if language is None:
+                continue
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f_in:
+                    while f_in.read(1 << 20):
+                        pass
+                return language
+            except Exception:
+                continue
+        return None
+
+    def iter_source_entries(self, sources):
+        """Read the source files one at a time, yielding their 'project_sources' entries."""
+        for file, file_path, relative_file_path, file_info in sources:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f_in:
+                    content = f_in.read()
+                    file_info = file_info or os.stat(file_path)
+                    source_data = {
+                        'file': {
+                            'File': file,
+                            'Full Path': file_path,
+                            'Relative Path': relative_file_path,
+                            'Size': file_info.st_size,
+                            'Last Modified': datetime.fromtimestamp(file_info.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
+                            'Lines': len(content.splitlines()),
+                            'Source_Code': content
+                        }
+                    }
+
+                    extension = os.path.splitext(file)[1]
+                    self.extract_imports(content, extension)
+
+            except UnicodeDecodeError as e:
+                BBLogger.log(f"Skipping file {file_path} due to decoding error: {e}")
+                continue
+            except Exception as e:
+                BBLogger.log(f"Skipping file {file_path} due to an unexpected error: {e}")
+                continue
+            yield source_data
+
+    @staticmethod
+    def _json_at_level(value, level):
+        """json.dumps(value, indent=4) as it appears nested ``level`` levels deep in an indented document."""
+        return json.dumps(value, indent=4).replace('\n', '\n' + ' ' * 4 * level)
+
     def generate_context_file(self):
+        """
+        Write the snapshot document, byte for byte what json.dump(project_data, indent=4)
+        would produce, but streamed: each source file is read, encoded and written
+        before the next one is read, so memory is bounded by the largest file rather
+        than by the whole project.
+        """
         BBLogger.log(f"Generating context file: {self.output_file}")
-        project_data = {
-            'project_name': self.project_name,
-            'programming_language': '',  # Will be detected later
-            'project_tree_structure': self.build_tree_structure(self.root_dir),
-            'project_sources': [],
-            'external_libraries': [],
-            'observations': []
-        }
-
-        for root, dirs, files in os.walk(self.root_dir, topdown=True):
-            dirs[:] = self.exclude_directories(dirs)
-            if files:
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    relative_file_path = os.path.relpath(file_path, self.root_dir)
-                    if (
-                        (file.endswith(tuple(self.include_extensions)) or file in self.key_files) and
-                        file not in self.avoid_files and
-                        relative_file_path not in self.avoid_files
-                    ):
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f_in:
-                                content = f_in.read()
-                                file_info = os.stat(file_path)
-                                source_data = {
-                                    'file': {
-                                        'File': file,
-                                        'Full Path': file_path,
-                                        'Relative Path': relative_file_path,
-                                        'Size': file_info.st_size,
-                                        'Last Modified': datetime.fromtimestamp(file_info.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
-                                        'Lines': len(content.splitlines()),
-                                        'Source_Code': content
-                                    }
-                                }
-                                project_data['project_sources'].append(source_data)
-
-                                extension = os.path.splitext(file)[1]
-                                self.extract_imports(content, extension)
-
-                                # Detect programming language
-                                if not self.detected_language:
-                                    self.detected_language = self.detect_programming_language(file)
-
-                        except UnicodeDecodeError as e:
-                            BBLogger.log(f"Skipping file {file_path} due to decoding error: {e}")
-                        except Exception as e:
-                            BBLogger.log(f"Skipping file {file_path} due to an unexpected error: {e}")
-
-        project_data['programming_language'] = self.detected_language or 'unknown'
-        project_data['external_libraries'] = [{"import_name": imp, "count": count} for imp, count in self.imports.items()]
-
-        if not self.imports:
-            project_data['observations'].append("No external libraries or imports were detected in the source code.")
+        tree, sources = self.scan_project(self.root_dir)
+        if not self.detected_language:
+            self.detected_language = self.detect_project_language(sources)
 
         # Ensure the output directory exists
         output_dir = os.path.dirname(self.output_file)
         os.makedirs(output_dir, exist_ok=True)
 
         with open(self.output_file, 'w', encoding='utf-8') as f_out:
-            json.dump(project_data, f_out, indent=4)
+            f_out.write('{\n    "project_name": ' + self._json_at_level(self.project_name, 1) +
+                        ',\n    "programming_language": ' + self._json_at_level(self.detected_language or 'unknown', 1) +
+                        ',\n    "project_tree_structure": ' + self._json_at_level(tree, 1) +
+                        ',\n    "project_sources": [')
+            del tree
+            wrote_sources = False
+            for source_data in self.iter_source_entries(sources):
+                f_out.write((',\n        ' if wrote_sources else '\n        ') + self._json_at_level(source_data, 2))
+                wrote_sources = True
+            f_out.write('\n    ]' if wrote_sources else ']')
+
+            external_libraries = [{"import_name": imp, "count": count} for imp, count in self.imports.items()]
+            observations = []
+            if not self.imports:
+                observations.append("No external libraries or imports were detected in the source code.")
+            f_out.write(',\n    "external_libraries": ' + self._json_at_level(external_libraries, 1) +
+                        ',\n    "observations": ' + self._json_at_level(observations, 1) + '\n}')
 
         os.chmod(self.output_file, 0o666)
         BBLogger.log(f"Context file generated at: {self.output_file}")
@@ -213,22 +276,32 @@ class ProjectContextGenerator:
         os.makedirs(output_dir, exist_ok=True)
         BBLogger.log(f"Splitting file {file_path} into parts in directory {output_dir}")
 
+        # Chunks are counted in characters, as before, but copied in bounded blocks
+        # so the snapshot never has to fit in memory.
+        block_size = 1 << 20
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            total_length = sum(len(block) for block in iter(lambda: f.read(block_size), ''))
 
         if num_chunks:
-            chunk_size = len(content) // num_chunks + (len(content) % num_chunks > 0)
+            chunk_size = total_length // num_chunks + (total_length % num_chunks > 0)
 
-        chunk_size = chunk_size or len(content)
+        chunk_size = chunk_size or total_length
         part_num = 0
 
-        for i in range(0, len(content), chunk_size):
-            part_filename = os.path.join(output_dir, f"{os.path.basename(file_path)}.part{part_num}")
-            with open(part_filename, 'w', encoding='utf-8') as part_file:
-                part_file.write(content[i:i + chunk_size])
-            os.chmod(part_filename, 0o666)
-            BBLogger.log(f"Created part file: {part_filename}")
-            part_num += 1
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for _ in range(0, total_length, chunk_size):
+                part_filename = os.path.join(output_dir, f"{os.path.basename(file_path)}.part{part_num}")
+                with open(part_filename, 'w', encoding='utf-8') as part_file:
+                    remaining = chunk_size
+                    while remaining:
+                        block = f.read(min(remaining, block_size))
+                        if not block:
+                            break
+                        part_file.write(block)
+                        remaining -= len(block)
+                os.chmod(part_filename, 0o666)
+                BBLogger.log(f"Created part file: {part_filename}")
+                part_num += 1
 
         new_output_file_path = os.path.join(output_dir, os.path.basename(file_path))
         os.rename(file_path, new_output_file_path)
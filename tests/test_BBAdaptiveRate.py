@@ -0,0 +1,17 @@
+# tests/test_BBAdaptiveRate.py
+
+from brainboost_data_source_package.data_source_utils.BBAdaptiveRate import BBAdaptiveRate
+
+
+def test_backs_off_to_ceiling_and_snaps_back_on_change():
+    rate = BBAdaptiveRate(min_period=1.0, max_period=10.0, backoff=2.0)
+    periods = [rate.observe(changed=False) for _ in range(6)]
+    assert periods == [2.0, 4.0, 8.0, 10.0, 10.0, 10.0]
+    assert rate.observe(changed=True) == 1.0
+
+
+def test_cpu_budget_limits_rate():
+    rate = BBAdaptiveRate(min_period=0.1, max_period=10.0, cpu_budget=0.25)
+    # Polls costing 0.2 s of CPU may run at most every 0.8 s on a quarter core.
+    assert rate.observe(changed=True, cpu_seconds=0.2) == 0.8
+    assert rate.rate() == 1.25
@@ -0,0 +1,36 @@
+# tests/test_BBAudioChunker.py
+
+import numpy as np
+
+from brainboost_data_source_package.data_source_utils.BBAudioChunker import BBAudioChunker
+
+
+def _tone_with_silences(seconds, silence_every, rate=1000):
+    t = np.arange(seconds * rate) / rate
+    samples = np.sin(2 * np.pi * 50 * t).astype(np.float32)
+    samples[(t % silence_every) < 0.5] = 0
+    return samples
+
+
+def test_cuts_land_in_silences():
+    chunker = BBAudioChunker(sample_rate=1000, chunk_seconds=10, overlap_seconds=1, search_seconds=3)
+    samples = _tone_with_silences(60, silence_every=9)
+    cuts = chunker.cut_points(samples)
+    assert cuts[0] == 0 and cuts[-1] == len(samples)
+    for cut in cuts[1:-1]:
+        assert (cut / 1000) % 9 < 0.5
+
+
+def test_merge_offsets_times_and_drops_repeated_words():
+    chunker = BBAudioChunker(sample_rate=1000, chunk_seconds=10, overlap_seconds=1)
+    chunks = [(0.0, 0.0, 10.0, None), (9.0, 10.0, 20.0, None)]
+    results = [
+        {'segments': [{'start': 0.0, 'end': 4.0, 'text': ' hola a todos'},
+                      {'start': 7.0, 'end': 9.9, 'text': ' esto es una'}]},
+        {'segments': [{'start': 0.0, 'end': 0.8, 'text': ' una'},
+                      {'start': 1.0, 'end': 3.0, 'text': ' es una prueba'},
+                      {'start': 3.0, 'end': 5.0, 'text': ' final'}]},
+    ]
+    text, segments = chunker.merge(chunks, results)
+    assert text == ' hola a todos esto es una prueba final'
+    assert [s['start'] for s in segments] == [0.0, 7.0, 10.0, 12.0]
@@ -0,0 +1,51 @@
+# tests/test_BBAudioDecoder.py
+
+import shutil
+import wave
+
+import numpy as np
+import pytest
+
+from brainboost_data_source_package.data_source_utils.BBAudioDecoder import BBAudioDecoder
+
+pytestmark = pytest.mark.skipif(shutil.which('ffmpeg') is None, reason="ffmpeg is not installed")
+
+
+def write_wav(path, seconds=0.5, rate=44100, channels=2, amplitude=0.5):
+    t = np.arange(int(seconds * rate)) / rate
+    pcm = (amplitude * np.sin(2 * np.pi * 440 * t) * 32767).astype('<i2')
+    with wave.open(str(path), 'wb') as out:
+        out.setnchannels(channels)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        out.writeframes(np.repeat(pcm, channels).tobytes())
+
+
+def test_decodes_to_mono_float32_at_the_target_rate(tmp_path):
+    path = tmp_path / 'tone.wav'
+    write_wav(path, channels=1)
+    decoder = BBAudioDecoder(sample_rate=16000)
+    samples = decoder.decode(str(path), duration=0.5)
+    assert samples.dtype == np.float32 and samples.ndim == 1
+    assert abs(len(samples) - 8000) <= 16
+    assert decoder.duration(samples) == pytest.approx(0.5, abs=0.01)
+    assert 0.45 < np.abs(samples).max() < 0.55
+    samples[0] = 0.0  # writable, as whisper/torch expect
+
+
+def test_long_audio_is_memory_mapped_from_workdir(tmp_path):
+    path = tmp_path / 'tone.wav'
+    write_wav(path)
+    decoder = BBAudioDecoder(sample_rate=16000, memmap_threshold_seconds=0.1)
+    in_memory = BBAudioDecoder(sample_rate=16000).decode_to_memory(str(path))
+    mapped = decoder.decode(str(path), duration=0.5, workdir=str(tmp_path))
+    assert isinstance(mapped, np.memmap)
+    assert np.array_equal(np.asarray(mapped), in_memory)
+    assert list(tmp_path.glob('*.f32'))
+
+
+def test_undecodable_input_raises(tmp_path):
+    path = tmp_path / 'broken.wav'
+    path.write_bytes(b'not audio')
+    with pytest.raises(RuntimeError):
+        BBAudioDecoder().decode(str(path))
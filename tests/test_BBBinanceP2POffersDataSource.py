@@ -0,0 +1,139 @@
+# tests/test_BBBinanceP2POffersDataSource.py
+
+import importlib
+import json
+import sys
+
+import pytest
+import requests
+
+from brainboost_data_source_package.data_source_addons.BBBinanceP2POffersDataSource import BBBinanceP2POffersDataSource
+from brainboost_data_source_package.data_source_utils.BBBrowserPool import BBBrowserPool
+
+binance_module = importlib.import_module(BBBinanceP2POffersDataSource.__module__)
+
+
+def item(adv_no, price):
+    return {'adv': {'advNo': adv_no, 'price': str(price), 'surplusAmount': '250.5', 'minSingleTransAmount': '10',
+                    'maxSingleTransAmount': '1000', 'dynamicMaxSingleTransAmount': '800',
+                    'tradeMethods': [{'identifier': 'Wise'}, {'tradeMethodName': 'SEPA'}]},
+            'advertiser': {'nickName': 'trader1', 'userNo': 'u1'}}
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    def __init__(self, data=None, error=None):
+        self.data, self.error = data, error
+        self.requests = []
+
+    def post(self, url, timeout=None, json=None):
+        self.requests.append(json)
+        if self.error:
+            raise self.error
+        return FakeResponse(self.data)
+
+    def close(self):
+        pass
+
+
+class FakeDriver:
+    """Stands in for a WebDriver already on the P2P page."""
+
+    def __init__(self):
+        self.current_url = "https://p2p.binance.com/en/trade/all-payments/USDT?fiat=USD"
+        self.bodies = []
+
+    def set_script_timeout(self, timeout):
+        pass
+
+    def execute_async_script(self, script, url, body):
+        self.bodies.append(json.loads(body))
+        return json.dumps({'code': '000000', 'data': [item('browser', 0.93)], 'success': True})
+
+    def quit(self):
+        pass
+
+
+def source_with(session, **params):
+    source = BBBinanceP2POffersDataSource(params=dict({'markets': [('USDT', 'EUR', 'SELL')]}, **params))
+    source._http = session
+    source.browser_pool = BBBrowserPool(size=1, driver_factory=FakeDriver)
+    return source
+
+
+def test_search_payload_uses_the_takers_side():
+    assert binance_module.binance_search_payload('USDT', 'EUR', 'sell')['tradeType'] == 'BUY'
+    payload = binance_module.binance_search_payload('BTC', 'ARS', 'BUY', page=2, rows=20, pay_types=('Wise',))
+    assert (payload['tradeType'], payload['asset'], payload['fiat']) == ('SELL', 'BTC', 'ARS')
+    assert (payload['page'], payload['rows'], payload['payTypes']) == (2, 20, ['Wise'])
+
+
+@pytest.mark.parametrize('data', [
+    {'code': '100001', 'message': 'bad request'},
+    {'code': '000000', 'success': False, 'data': []},
+    {'error': 'TypeError: Failed to fetch'},
+    'not json object',
+])
+def test_parse_search_response_raises_on_errors(data):
+    with pytest.raises(ValueError):
+        binance_module.parse_binance_search_response(data)
+
+
+def test_parse_search_response_returns_items():
+    assert binance_module.parse_binance_search_response({'code': '000000', 'data': [item('1', 1.0)]}) == [item('1', 1.0)]
+    assert binance_module.parse_binance_search_response({'code': '000000', 'data': None}) == []
+
+
+def test_normalize_offer_maps_the_shared_fields():
+    source = BBBinanceP2POffersDataSource()
+    offer = source.normalize_offer(item(123, 0.91), 'USDT', 'EUR', 'SELL')
+    assert offer == {'offer_id': '123', 'exchange': 'binance', 'token': 'USDT', 'fiat': 'EUR', 'side': 'SELL',
+                     'price': 0.91, 'available': 250.5, 'min_amount': 10.0, 'max_amount': 800.0,
+                     'payment_methods': ['SEPA', 'Wise'], 'trader': 'trader1', 'trader_id': 'u1'}
+
+
+def test_api_offers_are_fetched_over_the_session():
+    session = FakeSession({'code': '000000', 'data': [item('api', 0.9)]})
+    source = source_with(session)
+    assert [o['offer_id'] for o in source.fetch_market('USDT', 'EUR', 'SELL')] == ['api']
+    assert session.requests[0]['tradeType'] == 'BUY'
+
+
+def test_falls_back_to_the_browser_pool_when_the_api_fails():
+    pytest.importorskip('selenium')
+    session = FakeSession(error=requests.exceptions.ConnectionError("blocked"))
+    source = source_with(session, api_retry_interval=60)
+    assert [o['offer_id'] for o in source.fetch_market('USDT', 'EUR', 'SELL')] == ['browser']
+    # The API is not retried until api_retry_interval has passed.
+    source.fetch_market('USDT', 'EUR', 'SELL')
+    assert len(session.requests) == 1
+    source.stop()
+
+
+def test_busy_browser_pool_skips_the_market_instead_of_stopping():
+    pytest.importorskip('selenium')
+    source = source_with(FakeSession(error=requests.exceptions.ConnectionError("blocked")), browser_timeout=0.01)
+    with source.browser_pool.acquire():
+        with pytest.raises(ValueError):
+            source._search_browser('USDT', 'EUR', 'SELL', 1)
+        assert source.poll() is None
+    source.stop()
+
+
+def test_missing_selenium_is_reported_as_a_fetch_error(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'selenium.common.exceptions', None)
+    source = source_with(FakeSession(error=requests.exceptions.ConnectionError("blocked")))
+    with pytest.raises(ValueError):
+        source._search_browser('USDT', 'EUR', 'SELL', 1)
+    assert source.poll() is None
+    source.stop()
@@ -0,0 +1,40 @@
+# tests/test_BBBrowserPool.py
+
+import pytest
+
+from brainboost_data_source_package.data_source_utils.BBBrowserPool import BBBrowserPool
+
+
+class FakeDriver:
+    created = 0
+
+    def __init__(self):
+        FakeDriver.created += 1
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_drivers_are_reused_and_replaced_after_errors():
+    FakeDriver.created = 0
+    pool = BBBrowserPool(size=2, driver_factory=FakeDriver)
+    with pool.acquire() as first:
+        pass
+    with pool.acquire() as again:
+        assert again is first
+    assert FakeDriver.created == 1
+
+    with pytest.raises(RuntimeError):
+        with pool.acquire() as broken:
+            raise RuntimeError("page crashed")
+    assert broken.quit_called
+    with pool.acquire() as replacement:
+        assert replacement is not broken
+    assert FakeDriver.created == 2
+
+    pool.close()
+    assert replacement.quit_called
+    with pytest.raises(RuntimeError):
+        with pool.acquire():
+            pass
@@ -0,0 +1,78 @@
+# tests/test_BBDependencyExecutor.py
+
+import threading
+import time
+
+import pytest
+
+from brainboost_data_source_package.data_source_abstract.BBDataSource import BBDataSource
+from brainboost_data_source_package.data_source_manager.BBDependencyExecutor import (
+    BBDependencyExecutor,
+    BBDependencyCycleError,
+)
+
+
+class BBRecordingDataSource(BBDataSource):
+    started = []
+    lock = threading.Lock()
+
+    def __init__(self, name, dependency_data_sources=None, delay=0.0):
+        super().__init__(name=name, dependency_data_sources=dependency_data_sources)
+        self.delay = delay
+
+    def start_node(self):
+        time.sleep(self.delay)
+        with self.lock:
+            self.started.append(self.name)
+
+    def fetch(self):
+        pass
+
+    def get_icon(self):
+        return ""
+
+    def get_connection_data(self):
+        return {"connection_type": "Test", "fields": []}
+
+
+@pytest.fixture(autouse=True)
+def reset_started():
+    BBRecordingDataSource.started = []
+
+
+def test_dependencies_start_first_and_are_subscribed():
+    shared = BBRecordingDataSource('shared', delay=0.05)
+    left = BBRecordingDataSource('left', [shared], delay=0.2)
+    right = BBRecordingDataSource('right', [shared], delay=0.2)
+    root = BBRecordingDataSource('root', [left, right])
+
+    began = time.monotonic()
+    root.start()
+    elapsed = time.monotonic() - began
+
+    started = BBRecordingDataSource.started
+    assert started[0] == 'shared' and started[-1] == 'root'
+    assert set(started[1:3]) == {'left', 'right'}
+    assert elapsed < 0.4, "independent dependencies should start concurrently"
+    assert left in shared.subscribers and right in shared.subscribers
+    assert root in left.subscribers
+
+    names, total = root.dependency_critical_path
+    assert names[0].startswith('shared') and names[-1].startswith('root')
+    assert total >= 0.25
+    assert set(root.dependency_timings) == {n.get_name() for n in (shared, left, right, root)}
+
+
+def test_cycle_is_detected():
+    a = BBRecordingDataSource('a')
+    b = BBRecordingDataSource('b', [a])
+    a.dependency_data_sources.append(b)
+    with pytest.raises(BBDependencyCycleError):
+        BBDependencyExecutor(b)
+
+
+def test_default_dependency_list_is_not_shared():
+    first = BBRecordingDataSource('first')
+    second = BBRecordingDataSource('second')
+    first.dependency_data_sources.append(second)
+    assert second.dependency_data_sources == []
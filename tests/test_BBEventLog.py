@@ -0,0 +1,56 @@
+# tests/test_BBEventLog.py
+
+import time
+
+from brainboost_data_source_package.data_source_utils.BBEventLog import BBEventLog
+
+
+def test_append_and_read_back(tmp_path):
+    log = BBEventLog(str(tmp_path), fsync_interval=0.01)
+    offsets = [log.append({'value': i}) for i in range(5)]
+    assert offsets == [0, 1, 2, 3, 4]
+    records = log.read(2)
+    assert [offset for offset, _ in records] == [2, 3, 4]
+    assert records[0][1] == {'value': 2}
+    log.close()
+
+
+def test_reopen_recovers_records_and_consumer_offsets(tmp_path):
+    log = BBEventLog(str(tmp_path), fsync_interval=0.01)
+    for i in range(3):
+        log.append({'value': i})
+    log.commit('subscriber', 2)
+    log.close()
+
+    # Simulate a torn write left behind by a crash.
+    with open(tmp_path / f"{0:020d}.log", 'ab') as f:
+        f.write(b'\x00\x00\x00\x10garbage')
+
+    reopened = BBEventLog(str(tmp_path), fsync_interval=0.01)
+    assert reopened.end_offset() == 3
+    assert reopened.committed('subscriber') == 2
+    assert reopened.committed('unknown') is None
+    assert reopened.append({'value': 3}) == 3
+    assert [record['value'] for _, record in reopened.read(0)] == [0, 1, 2, 3]
+    reopened.close()
+
+
+def test_segments_roll_and_size_retention(tmp_path):
+    log = BBEventLog(str(tmp_path), segment_bytes=64, fsync_interval=0.01, retention_bytes=200)
+    for i in range(50):
+        log.append({'value': i})
+    assert log.start_offset() > 0
+    records = log.read(0, max_records=100)
+    assert records[0][0] == log.start_offset()
+    assert records[-1] == (49, {'value': 49})
+    log.close()
+
+
+def test_waiting_writer_does_not_wait_for_the_fsync_interval(tmp_path):
+    log = BBEventLog(str(tmp_path), fsync_interval=5.0)
+    started = time.monotonic()
+    for i in range(40):
+        log.append({'value': i})
+    assert time.monotonic() - started < 2.0
+    assert log.end_offset() == 40
+    log.close()
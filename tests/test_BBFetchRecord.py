@@ -0,0 +1,47 @@
+# tests/test_BBFetchRecord.py
+
+import os
+
+from brainboost_data_source_package.data_source_abstract.BBDataSource import BBDataSource
+from brainboost_data_source_package.data_source_abstract.BBFetchRecord import BBFetchRecord
+from brainboost_data_source_package.data_source_addons.BBGitLabDataSource import BBGitLabDataSource
+from brainboost_data_source_package.data_source_utils.helpers import git_clone_path
+
+
+class BatchOnlyDataSource(BBDataSource):
+    def fetch(self):
+        return 3
+
+    def get_icon(self):
+        return ""
+
+    def get_connection_data(self):
+        return {}
+
+
+def test_sources_without_streaming_yield_a_completion_record():
+    source = BatchOnlyDataSource(name='batch')
+    assert list(source.iter_fetch()) == [BBFetchRecord('fetch_completed', 'batch_BatchOnlyDataSource',
+                                                       {'result': 3})]
+
+
+def test_repository_records_are_yielded_as_repos_are_cloned(tmp_path, monkeypatch):
+    source = BBGitLabDataSource(params={'username': 'user', 'token': 'token', 'target_directory': str(tmp_path)})
+    cloned = []
+    monkeypatch.setattr(source, 'get_repos', lambda username, token: [
+        {'name': 'one', 'http_url_to_repo': 'https://gitlab.com/user/one.git'},
+        {'name': 'no-url'},
+        {'name': 'two', 'http_url_to_repo': 'https://gitlab.com/user/two/'}])
+    monkeypatch.setattr(source, 'clone_repo', lambda url, target, name: cloned.append(name) or True)
+
+    records = source.iter_fetch()
+    first = next(records)
+    assert cloned == ['one']  # the second repo is not cloned before the first record is consumed
+    assert first == BBFetchRecord('repository', 'BBGitLabDataSource',
+                                  {'name': 'one', 'clone_url': 'https://gitlab.com/user/one.git',
+                                   'path': os.path.join(str(tmp_path), 'one'), 'cloned': True})
+    assert [record.data['path'] for record in records] == [os.path.join(str(tmp_path), 'two')]
+
+
+def test_git_clone_path():
+    assert git_clone_path('https://bitbucket.org/team/repo.git', '/repos') == os.path.join('/repos', 'repo')
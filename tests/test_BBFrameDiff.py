@@ -0,0 +1,62 @@
+# tests/test_BBFrameDiff.py
+
+import numpy as np
+
+from brainboost_data_source_package.data_source_addons.BBKnowledgeHookRealTimeDataSource import \
+    BBKnowledgeHookRealTimeDataSource
+from brainboost_data_source_package.data_source_utils.BBFrameDiff import BBFrameChangeDetector
+
+
+class FakeDesktop:
+    """Desktop exposing capture and OCR separately, counting OCR calls."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.ocr_calls = 0
+
+    def take_screenshot(self):
+        return self.frame.copy()
+
+    def extract_texts_with_rects(self, image):
+        self.ocr_calls += 1
+        return [('text', (0, 0, 10, 10))]
+
+
+def frame(height=128, width=192):
+    return np.zeros((height, width, 3), dtype=np.uint8)
+
+
+def test_first_frame_reports_every_tile_and_identical_frames_none():
+    detector = BBFrameChangeDetector(tile_size=64, threshold=2.0, downscale=4)
+    assert detector.changed_tiles(frame()) == [(x, y, x + 64, y + 64) for y in (0, 64) for x in (0, 64, 128)]
+    assert detector.changed_tiles(frame()) == []
+    assert len(detector.changed_tiles(frame(64, 64))) == 1  # a resolution change resets the reference
+
+
+def test_changed_tile_is_reported_depending_on_threshold():
+    detector = BBFrameChangeDetector(tile_size=64, threshold=2.0, downscale=4)
+    detector.changed_tiles(frame())
+    faint = frame()
+    faint[64:128, 128:192] = 1  # mean difference 1 <= threshold
+    assert detector.changed_tiles(faint) == []
+    bright = frame()
+    bright[64:128, 128:192] = 50
+    assert detector.changed_tiles(bright) == [(128, 64, 192, 128)]
+
+    sensitive = BBFrameChangeDetector(tile_size=64, threshold=0.5, downscale=4)
+    sensitive.changed_tiles(frame())
+    assert sensitive.changed_tiles(faint) == [(128, 64, 192, 128)]
+
+
+def test_unchanged_frame_skips_ocr_and_changed_tile_triggers_it():
+    source = BBKnowledgeHookRealTimeDataSource(params={'change_detection': True, 'verbose': False})
+    source._desktop = desktop = FakeDesktop(frame())
+    first = source.poll()
+    assert desktop.ocr_calls == 1 and len(first['changed_tiles']) == 6
+    assert source.poll() is None
+    assert desktop.ocr_calls == 1
+    desktop.frame[0:64, 0:64] = 200
+    snapshot = source.poll()
+    assert desktop.ocr_calls == 2
+    assert [tile['rect'] for tile in snapshot['changed_tiles']] == [(0, 0, 64, 64)]
+    assert snapshot['changed_tiles'][0]['image'].shape == (64, 64, 3)
@@ -0,0 +1,85 @@
+# tests/test_BBKnowledgeHookPipeline.py
+
+import importlib
+import queue
+import threading
+import time
+
+import numpy as np
+
+from brainboost_data_source_package.data_source_addons.BBKnowledgeHookRealTimeDataSource import \
+    BBKnowledgeHookRealTimeDataSource
+
+hook_module = importlib.import_module(BBKnowledgeHookRealTimeDataSource.__module__)
+
+
+class FakeDesktop:
+    """Desktop with separate capture and OCR; the OCR runs in the pipeline's worker processes."""
+
+    def take_screenshot(self):
+        return np.full((16, 16, 3), 7, dtype=np.uint8)
+
+    def extract_texts_with_rects(self, image):
+        return [(f"value {int(image.max())}", (0, 0, 4, 4))]
+
+
+class SnapshotOnlyDesktop:
+    def snapshot(self):
+        return np.zeros((16, 16, 3), dtype=np.uint8), [('serial', (0, 0, 1, 1))]
+
+
+def test_pipelined_snapshots_reach_iter_fetch(monkeypatch):
+    monkeypatch.setattr(hook_module.Desktop, 'get_desktop_singleton', classmethod(lambda cls: FakeDesktop()))
+    source = BBKnowledgeHookRealTimeDataSource(name='pipeline', params={
+        'pipelined': True, 'ocr_workers': 1, 'frequency': 0.05, 'verbose': False})
+    records = source.iter_fetch()
+    try:
+        first, second = next(records), next(records)
+    finally:
+        records.close()
+    assert first.record_type == 'snapshot'
+    assert first.data['texts_with_rects'] == [('value 7', (0, 0, 4, 4))]
+    assert second.data['image'].shape == (16, 16, 3)
+    assert source._pipeline_threads == []
+
+
+def test_snapshot_only_desktop_falls_back_to_serial_polling(monkeypatch):
+    monkeypatch.setattr(hook_module.Desktop, 'get_desktop_singleton',
+                        classmethod(lambda cls: SnapshotOnlyDesktop()))
+    source = BBKnowledgeHookRealTimeDataSource(params={'pipelined': True, 'verbose': False})
+    assert source.poll()['texts_with_rects'] == [('serial', (0, 0, 1, 1))]
+    assert source.pipelined is False and source._pipeline_threads == []
+
+
+def test_subscriber_can_stop_a_pipelined_source_from_notify(monkeypatch):
+    monkeypatch.setattr(hook_module.Desktop, 'get_desktop_singleton', classmethod(lambda cls: FakeDesktop()))
+    source = BBKnowledgeHookRealTimeDataSource(name='pipeline', params={
+        'pipelined': True, 'ocr_workers': 1, 'frequency': 0.05, 'verbose': False})
+    statuses, received = [], []
+    done = threading.Event()
+    source.status_callback = lambda name, status: statuses.append(status)
+
+    class StoppingSubscriber:
+        def notify(self, data):
+            received.append(data)
+            source.stop()
+            done.set()
+
+    source.subscribe(StoppingSubscriber())
+    source.start_periodic()
+    assert done.wait(timeout=30)
+    time.sleep(0.2)
+    assert len(received) == 1
+    assert 'error' not in statuses
+    assert source._pipeline_threads == []
+
+
+def test_stop_sentinel_is_not_dropped_by_a_full_capture_queue(monkeypatch):
+    monkeypatch.setattr(hook_module.Desktop, 'get_desktop_singleton', classmethod(lambda cls: FakeDesktop()))
+    source = BBKnowledgeHookRealTimeDataSource(params={'pipelined': True, 'ocr_workers': 1, 'verbose': False,
+                                                       'pipeline_queue_size': 1})
+    source._pipeline_stop.set()
+    source._capture_queue = queue.Queue(maxsize=1)
+    source._capture_queue.put(None)
+    source._enqueue_frame({'texts_with_rects': []})
+    assert source._capture_queue.get_nowait() is None
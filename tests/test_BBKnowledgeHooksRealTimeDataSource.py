@@ -9,6 +9,7 @@ from brainboost_configuration_package.BBConfig import BBConfig
 from io import StringIO
 import sys
 import numpy as np
+from datetime import datetime
 from pathlib import Path
 
 @pytest.fixture(scope="function", autouse=True)
@@ -60,37 +61,17 @@ def test_fetch_method():
         subscribers=[mock_subscriber]
     )
     
-    # Function to run fetch and handle StopIteration to exit the loop
-    def run_fetch():
-        try:
-            data_source.fetch()
-        except StopIteration:
-            pass  # Expected exception to stop the loop
-        except Exception as e:
-            print(f"Fetch loop exited with exception: {e}")
+    # Stop the periodic source once the subscriber has been notified 3 times
+    def stop_after_three(snapshot_data):
+        if mock_subscriber.notify.call_count >= 3:
+            data_source.stop()
+    mock_subscriber.notify.side_effect = stop_after_three
     
-    # Start the fetch method in a separate thread
-    fetch_thread = threading.Thread(target=run_fetch)
-    fetch_thread.start()
-    
-    # Mock the Desktop.snapshot method to return predefined data and inject StopIteration after 3 calls
+    # Mock the Desktop.snapshot method to return predefined data and run fetch until stopped
     with patch('brainboost_desktop_package.Desktop.Desktop.snapshot', return_value=(mock_screenshot, mock_texts_with_rects)):
-        # Mock time.sleep to raise StopIteration after 3 calls
-        sleep_call_count = {'count': 0}
-        
-        def mock_sleep(seconds):
-            sleep_call_count['count'] += 1
-            if sleep_call_count['count'] >= 3:
-                raise StopIteration("Stopping fetch loop after 3 iterations")
-            time.sleep.original_sleep(seconds)  # Call the real sleep for first 2 iterations
-        
-        # Patch time.sleep with our mock_sleep
-        with patch('time.sleep', side_effect=mock_sleep):
-            try:
-                # Let the fetch loop run until StopIteration is raised
-                fetch_thread.join(timeout=5)
-            except StopIteration:
-                pass
+        fetch_thread = threading.Thread(target=data_source.fetch)
+        fetch_thread.start()
+        fetch_thread.join(timeout=10)
     
     # After the fetch loop is stopped, verify that the subscriber's notify method was called 3 times
     assert mock_subscriber.notify.call_count == 3, f"Expected notify to be called 3 times, got {mock_subscriber.notify.call_count}"
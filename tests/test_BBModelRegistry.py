@@ -0,0 +1,55 @@
+# tests/test_BBModelRegistry.py
+
+import threading
+import time
+
+from brainboost_data_source_package.data_source_utils.BBModelRegistry import BBModelRegistry
+
+
+def test_concurrent_gets_load_once():
+    registry = BBModelRegistry()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    registry.register('m', loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get('m'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert all(model is results[0] for model in results)
+
+
+def test_lru_and_memory_limits():
+    registry = BBModelRegistry(max_models=2)
+    for key in 'abc':
+        registry.get(key, loader=lambda key=key: key, size_bytes=100)
+    assert registry.loaded_keys() == ['b', 'c']
+    registry.get('b')
+    registry.set_limits(max_memory_bytes=150)
+    assert registry.loaded_keys() == ['b']
+
+
+def test_warm_up_loads_registered_models():
+    registry = BBModelRegistry()
+    registry.register('x', lambda: 'x')
+    registry.register('y', lambda: 'y')
+    registry.warm_up()
+    assert sorted(registry.loaded_keys()) == ['x', 'y']
+    assert registry.loads == 2
+
+
+def test_shared_registry_limits_come_from_config(monkeypatch):
+    from brainboost_data_source_package.data_source_utils import BBModelRegistry as registry_module
+    settings = {'model_registry_max_models': 3, 'model_registry_max_bytes': 2 ** 30}
+    monkeypatch.setattr(registry_module.BBConfig, 'get', staticmethod(settings.get))
+    monkeypatch.setattr(BBModelRegistry, '_instance', None)
+    registry = BBModelRegistry.get_registry_singleton()
+    assert (registry.max_models, registry.max_memory_bytes) == (3, 2 ** 30)
+    assert BBModelRegistry.get_registry_singleton() is registry
@@ -0,0 +1,27 @@
+# tests/test_BBOfferDelta.py
+
+from brainboost_data_source_package.data_source_utils.BBOfferDelta import BBOfferDelta
+
+
+def offer(offer_id, price, available=100.0):
+    return {'offer_id': offer_id, 'price': price, 'available': available, 'min_amount': 10.0,
+            'max_amount': 500.0, 'payment_methods': ['SEPA']}
+
+
+def test_first_snapshot_is_all_added():
+    delta = BBOfferDelta()
+    result = delta.diff('USDT/EUR/SELL', [offer('a', 0.92), offer('b', 0.93)])
+    assert [o['offer_id'] for o in result['added']] == ['a', 'b']
+    assert result['removed'] == [] and result['changed'] == []
+
+
+def test_reports_only_added_removed_and_changed_offers():
+    delta = BBOfferDelta()
+    delta.diff('USDT/EUR/SELL', [offer('a', 0.92), offer('b', 0.93), offer('c', 0.94)])
+    result = delta.diff('USDT/EUR/SELL', [offer('a', 0.92), offer('b', 0.95), offer('d', 0.96)])
+    assert [o['offer_id'] for o in result['added']] == ['d']
+    assert result['removed'] == ['c']
+    assert [o['offer_id'] for o in result['changed']] == ['b']
+    assert sorted(o['offer_id'] for o in delta.snapshot('USDT/EUR/SELL')) == ['a', 'b', 'd']
+    # Markets are tracked independently.
+    assert delta.diff('USDT/USD/BUY', [])['removed'] == []
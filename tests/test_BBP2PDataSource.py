@@ -0,0 +1,65 @@
+# tests/test_BBP2PDataSource.py
+
+import threading
+
+from brainboost_data_source_package.data_source_abstract.BBP2PDataSource import BBP2PDataSource
+
+
+class FakeP2PDataSource(BBP2PDataSource):
+    exchange = 'fake'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.offers = []
+
+    def fetch_market(self, token, fiat, side):
+        return list(self.offers)
+
+    def get_icon(self):
+        return ""
+
+    def get_connection_data(self):
+        return {}
+
+
+def offer(offer_id, price):
+    return {'offer_id': offer_id, 'price': price, 'available': 100.0, 'min_amount': 10.0,
+            'max_amount': 1000.0, 'payment_methods': ['SEPA']}
+
+
+def test_poll_publishes_only_changes():
+    source = FakeP2PDataSource(params={'markets': [('usdt', 'eur', 'sell')]})
+    source.offers = [offer('a', 0.9)]
+    first = source.poll()
+    assert first['markets'][0]['market'] == 'USDT/EUR/SELL'
+    assert [o['offer_id'] for o in first['markets'][0]['added']] == ['a']
+    assert source.poll() is None
+    source.offers = []
+    assert source.poll()['markets'][0]['removed'] == ['a']
+    source.stop()
+
+
+def test_poll_waits_while_a_snapshot_is_being_sent():
+    source = FakeP2PDataSource(params={'markets': [('USDT', 'EUR', 'SELL')]})
+    source.offers = [offer('a', 0.9)]
+    source.poll()
+    source.offers = [offer('a', 0.9), offer('b', 0.95)]
+    received, polled = [], []
+
+    class SlowSubscriber:
+        def notify(self, data):
+            # A poll started while the snapshot is in flight must not diff before it is delivered.
+            poller = threading.Thread(target=lambda: polled.append(source.poll()))
+            poller.start()
+            poller.join(timeout=0.2)
+            assert poller.is_alive()
+            received.append(data)
+            self.poller = poller
+
+    subscriber = SlowSubscriber()
+    source.subscribe(subscriber)
+    subscriber.poller.join(timeout=5)
+    assert [o['offer_id'] for o in received[0]['markets'][0]['added']] == ['a']
+    assert received[0]['markets'][0]['snapshot'] is True
+    assert [o['offer_id'] for o in polled[0]['markets'][0]['added']] == ['b']
+    source.stop()
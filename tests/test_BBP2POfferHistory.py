@@ -0,0 +1,68 @@
+# tests/test_BBP2POfferHistory.py
+
+import time
+
+import numpy as np
+
+from brainboost_data_source_package.data_source_utils.BBP2POfferHistory import BBP2POfferHistory
+
+DAY = 86400.0
+START = 1735689600.0  # 2025-01-01T00:00:00Z
+
+
+def offer(offer_id, price, trader='alice', methods=('SEPA',)):
+    return {'offer_id': offer_id, 'price': price, 'available': 100.0, 'min_amount': 10.0,
+            'max_amount': 500.0, 'trader': trader, 'payment_methods': list(methods)}
+
+
+def test_deltas_round_trip_across_day_partitions(tmp_path):
+    history = BBP2POfferHistory(str(tmp_path), flush_rows=2)
+    history.append_delta('bybit', 'USDT/EUR/SELL', {'added': [offer('a', 0.92), offer('b', 0.93, 'bob')]}, START + 10)
+    history.append_delta('bybit', 'USDT/EUR/SELL', {'changed': [offer('a', 0.94)], 'removed': ['b']}, START + 20)
+    history.append_delta('bybit', 'USDT/EUR/SELL', {'added': [offer('c', 0.91, methods=())]}, START + DAY + 5)
+    history.close()
+
+    reopened = BBP2POfferHistory(str(tmp_path))
+    everything = reopened.scan('bybit', 'USDT/EUR/SELL')
+    assert list(everything['offer_id']) == ['a', 'b', 'a', 'b', 'c']
+    assert list(everything['event']) == [0, 0, 1, 2, 0]
+    assert list(everything['trader']) == ['alice', 'bob', 'alice', None, 'alice']
+    assert list(everything['payment_methods']) == ['SEPA', 'SEPA', 'SEPA', None, None]
+    assert np.isnan(everything['price'][3])
+
+    window = reopened.scan('bybit', 'USDT/EUR/SELL', start=START + 15, end=START + DAY + 5,
+                           columns=['timestamp', 'price'])
+    assert list(window['timestamp']) == [START + 20, START + 20]
+    assert window['price'][0] == 0.94
+    assert reopened.markets('bybit') == ['USDT/EUR/SELL']
+    assert reopened.scan('binance', 'USDT/EUR/SELL')['price'].size == 0
+
+
+def test_partial_rows_are_hidden_and_repaired(tmp_path):
+    history = BBP2POfferHistory(str(tmp_path), flush_rows=1)
+    history.append_delta('bybit', 'USDT/EUR/SELL', {'added': [offer('a', 0.92)]}, START)
+    # Simulate a crash half-way through writing the next row's columns.
+    partition = tmp_path / 'bybit' / 'USDT_EUR_SELL' / '2025-01-01'
+    with open(partition / 'timestamp.bin', 'ab') as f:
+        f.write(np.array([START + 1]).tobytes())
+    with open(partition / 'strings.jsonl', 'a', encoding='utf-8') as f:
+        f.write('"tor')
+    assert list(history.scan('bybit', 'USDT/EUR/SELL')['offer_id']) == ['a']
+
+    reopened = BBP2POfferHistory(str(tmp_path), flush_rows=1)
+    reopened.append_delta('bybit', 'USDT/EUR/SELL', {'added': [offer('b', 0.93)]}, START + 2)
+    scan = reopened.scan('bybit', 'USDT/EUR/SELL')
+    assert list(scan['offer_id']) == ['a', 'b'] and list(scan['timestamp']) == [START, START + 2]
+    assert (partition / 'strings.jsonl').read_text(encoding='utf-8').endswith('"b"\n')
+
+
+def test_pending_rows_are_flushed_once_due_without_new_appends(tmp_path, monkeypatch):
+    history = BBP2POfferHistory(str(tmp_path), flush_rows=100, flush_interval=5.0)
+    history.append_delta('bybit', 'USDT/EUR/SELL', {'added': [offer('a', 0.92)]}, START)
+    partition = tmp_path / 'bybit' / 'USDT_EUR_SELL' / '2025-01-01'
+    history.flush_if_due()
+    assert not (partition / 'timestamp.bin').exists()
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 5.0)
+    history.flush_if_due()
+    assert (partition / 'timestamp.bin').stat().st_size == 8
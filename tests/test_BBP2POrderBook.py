@@ -0,0 +1,35 @@
+# tests/test_BBP2POrderBook.py
+
+from brainboost_data_source_package.data_source_utils.BBP2POrderBook import BBP2POrderBook
+
+
+def offer(offer_id, price, methods=('SEPA',), min_amount=10.0, max_amount=1000.0):
+    return {'offer_id': offer_id, 'price': price, 'payment_methods': list(methods),
+            'min_amount': min_amount, 'max_amount': max_amount}
+
+
+def test_best_offers_by_side_method_and_amount():
+    book = BBP2POrderBook(side='SELL')
+    book.replace([offer('a', 0.95), offer('b', 0.93, methods=('Revolut',)),
+                  offer('c', 0.94, methods=('SEPA', 'Revolut'), min_amount=500.0), offer('d', 0.96)])
+    assert [o['offer_id'] for o in book.best(2)] == ['b', 'c']
+    assert [o['offer_id'] for o in book.best(5, payment_method='SEPA')] == ['c', 'a', 'd']
+    assert [o['offer_id'] for o in book.best(5, payment_method='SEPA', amount=100.0)] == ['a', 'd']
+    assert book.best(5, payment_method='Wise') == []
+
+    buy_book = BBP2POrderBook(side='BUY')
+    buy_book.replace([offer('a', 0.95), offer('b', 0.97)])
+    assert buy_book.best_price() == 0.97
+
+
+def test_apply_delta_updates_all_indexes():
+    book = BBP2POrderBook(side='SELL')
+    book.replace([offer('a', 0.95), offer('b', 0.93, methods=('Revolut',))])
+    book.apply({'added': [offer('c', 0.90, max_amount=50.0)], 'removed': ['b'],
+                'changed': [offer('a', 0.91, methods=('Revolut',))]})
+    assert len(book) == 2
+    assert [o['offer_id'] for o in book.best(5)] == ['c', 'a']
+    assert [o['offer_id'] for o in book.best(5, payment_method='Revolut')] == ['a']
+    assert book.best(5, payment_method='SEPA', amount=100.0) == []
+    assert [o['offer_id'] for o in book.best(5, amount=20.0)] == ['c', 'a']
+    assert book.payment_methods() == ['Revolut', 'SEPA']
@@ -0,0 +1,32 @@
+# tests/test_BBP2POrderBookSubscriber.py
+
+from brainboost_data_source_package.data_source_subscriber.BBP2POrderBookSubscriber import BBP2POrderBookSubscriber
+
+
+def offer(offer_id, price, methods=('SEPA',)):
+    return {'offer_id': offer_id, 'price': price, 'payment_methods': list(methods),
+            'min_amount': 10.0, 'max_amount': 1000.0}
+
+
+def delta(market, added=(), removed=(), snapshot=False):
+    return {'market': market, 'added': list(added), 'removed': list(removed), 'changed': [], 'snapshot': snapshot}
+
+
+def test_best_merges_exchanges_by_price_with_unpriced_offers_last():
+    books = BBP2POrderBookSubscriber()
+    books.notify({'exchange': 'bybit', 'markets': [delta('USDT/EUR/SELL', [offer('a', None), offer('b', 0.94)])]})
+    books.notify({'exchange': 'binance', 'markets': [delta('USDT/EUR/SELL', [offer('c', 0.93), offer('d', 0.95)])]})
+    assert [o['offer_id'] for o in books.best('USDT/EUR/SELL')] == ['c', 'b', 'd', 'a']
+    assert [o['offer_id'] for o in books.best('USDT/EUR/SELL', n=2)] == ['c', 'b']
+
+    books.notify({'exchange': 'bybit', 'markets': [delta('USDT/EUR/BUY', [offer('e', None), offer('f', 0.90)])]})
+    books.notify({'exchange': 'binance', 'markets': [delta('USDT/EUR/BUY', [offer('g', 0.92)])]})
+    assert [o['offer_id'] for o in books.best('USDT/EUR/BUY')] == ['g', 'f', 'e']
+
+
+def test_snapshot_replaces_the_book():
+    books = BBP2POrderBookSubscriber()
+    books.notify({'exchange': 'bybit', 'markets': [delta('USDT/EUR/SELL', [offer('a', 0.94)])]})
+    books.notify({'exchange': 'bybit', 'markets': [delta('USDT/EUR/SELL', [offer('b', 0.95)], snapshot=True)]})
+    assert [o['offer_id'] for o in books.best('USDT/EUR/SELL', exchange='bybit')] == ['b']
+    assert books.best('USDT/EUR/SELL', exchange='binance') == []
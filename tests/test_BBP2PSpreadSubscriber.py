@@ -0,0 +1,48 @@
+# tests/test_BBP2PSpreadSubscriber.py
+
+from brainboost_data_source_package.data_source_subscriber.BBP2PSpreadSubscriber import BBP2PSpreadSubscriber
+
+
+class Collector:
+    def __init__(self):
+        self.received = []
+
+    def notify(self, data):
+        self.received.append(data)
+
+
+def offer(offer_id, price, methods, min_amount=10.0, max_amount=1000.0):
+    return {'offer_id': offer_id, 'price': price, 'payment_methods': list(methods),
+            'min_amount': min_amount, 'max_amount': max_amount}
+
+
+def delta(market, added=(), removed=()):
+    return {'market': market, 'added': list(added), 'removed': list(removed), 'changed': []}
+
+
+def test_reports_cross_exchange_spreads_above_threshold():
+    collector = Collector()
+    spreads = BBP2PSpreadSubscriber(threshold=0.01, amount=100.0, subscribers=[collector])
+    spreads.notify({'exchange': 'bybit', 'markets': [
+        delta('USDT/EUR/SELL', [offer('a', 0.90, ['SEPA']), offer('b', 0.89, ['Revolut'], max_amount=50.0)]),
+        delta('USDT/EUR/BUY', [offer('c', 0.95, ['SEPA'])])]})
+    # Only bybit so far: same-exchange pairs are not reported.
+    assert collector.received == []
+
+    spreads.notify({'exchange': 'binance', 'markets': [
+        delta('USDT/EUR/BUY', [offer('d', 0.93, ['Wise']), offer('e', 0.905, ['SEPA'])]),
+        delta('USDT/ARS/SELL', [offer('f', 1000.0, ['MercadoPago'])])]})
+    opportunities = collector.received[-1]['opportunities']
+    assert [(o['buy']['offer_id'], o['sell']['offer_id']) for o in opportunities] == [('a', 'd')]
+    assert abs(opportunities[0]['spread'] - (0.93 / 0.90 - 1)) < 1e-12
+    assert opportunities[0]['buy']['exchange'] == 'bybit' and opportunities[0]['sell']['payment_method'] == 'Wise'
+
+    spreads.notify({'exchange': 'binance', 'markets': [delta('USDT/EUR/BUY', removed=['d'])]})
+    assert len(collector.received) == 1
+
+
+def test_fees_reduce_spread():
+    spreads = BBP2PSpreadSubscriber(threshold=0.0, fees={'bybit': 0.01, 'binance': 0.01})
+    spreads.notify({'exchange': 'bybit', 'markets': [delta('USDT/EUR/SELL', [offer('a', 1.00, ['SEPA'])])]})
+    spreads.notify({'exchange': 'binance', 'markets': [delta('USDT/EUR/BUY', [offer('b', 1.015, ['SEPA'])])]})
+    assert spreads.compute() == []
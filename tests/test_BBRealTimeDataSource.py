@@ -0,0 +1,67 @@
+# tests/test_BBRealTimeDataSource.py
+
+import pytest
+
+from brainboost_data_source_package.data_source_abstract.BBRealTimeDataSource import BBRealTimeDataSource
+from brainboost_data_source_package.data_source_subscriber.BBSubscriber import BBSubscriber
+
+
+class LoggedRealTimeDataSource(BBRealTimeDataSource):
+    def get_icon(self):
+        return ""
+
+    def get_connection_data(self):
+        return {}
+
+
+class RecordingSubscriber(BBSubscriber):
+    def __init__(self, consumer_id=None):
+        super().__init__(any_object=self)
+        self.consumer_id = consumer_id
+        self.received = []
+
+    def notify(self, data):
+        self.received.append(data)
+
+
+def test_subscribers_of_the_same_class_keep_separate_offsets(tmp_path):
+    first, second = RecordingSubscriber(), RecordingSubscriber()
+    source = LoggedRealTimeDataSource(name='log', subscribers=[first, second],
+                                      params={'event_log_dir': str(tmp_path)})
+    for i in range(3):
+        source.update({'value': i})
+    source.stop()
+    assert first.received == second.received == [{'value': 0}, {'value': 1}, {'value': 2}]
+
+
+def test_consumer_id_resumes_after_restart_and_must_be_unique(tmp_path):
+    params = {'event_log_dir': str(tmp_path)}
+    subscriber = RecordingSubscriber('ui')
+    source = LoggedRealTimeDataSource(name='log', subscribers=[subscriber], params=params)
+    source.update({'value': 0})
+    source.stop()
+
+    source = LoggedRealTimeDataSource(name='log', params=params)
+    source.update({'value': 1})
+    with source._delivery_lock:
+        resumed = RecordingSubscriber('ui')
+        source.subscribers.append(resumed)
+        source._catch_up(resumed)
+    assert resumed.received == [{'value': 1}]
+    with pytest.raises(ValueError):
+        source.subscribe(RecordingSubscriber('ui'))
+    source.stop()
+
+
+def test_anonymous_subscribers_keep_offsets_in_memory_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(LoggedRealTimeDataSource, '_schedule_mock_update', lambda self: None)
+    source = LoggedRealTimeDataSource(name='log', params={'event_log_dir': str(tmp_path)})
+    anonymous, named = RecordingSubscriber(), RecordingSubscriber('ui')
+    source.subscribe(anonymous)
+    source.subscribe(named)
+    source.update({'value': 0})
+    source.update({'value': 1})
+    source.stop()
+    assert anonymous.received == named.received == [{'value': 0}, {'value': 1}]
+    offset_files = [path.name for path in tmp_path.rglob('*.offset')]
+    assert offset_files == ['ui.offset']
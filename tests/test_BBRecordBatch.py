@@ -0,0 +1,92 @@
+# tests/test_BBRecordBatch.py
+
+import time
+
+from brainboost_data_source_package.data_source_abstract.BBDataSource import BBDataSource
+from brainboost_data_source_package.data_source_abstract.BBRealTimeDataSource import BBRealTimeDataSource
+from brainboost_data_source_package.data_source_subscriber.BBSubscriber import BBSubscriber
+from brainboost_data_source_package.data_source_utils.BBRecordBatch import BBRecordBatcher
+
+
+class PushDataSource(BBDataSource):
+    def fetch(self):
+        pass
+
+    def get_icon(self):
+        return ""
+
+    def get_connection_data(self):
+        return {}
+
+
+class LoggedRealTimeDataSource(BBRealTimeDataSource):
+    def get_icon(self):
+        return ""
+
+    def get_connection_data(self):
+        return {}
+
+
+class RecordSubscriber(BBSubscriber):
+    def __init__(self):
+        super().__init__(any_object=self)
+        self.records = []
+
+    def notify(self, data):
+        self.records.append(data)
+
+
+class BatchSubscriber(RecordSubscriber):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def notify_batch(self, batch):
+        self.batches.append(batch)
+
+
+def test_batcher_flushes_on_size_and_on_time():
+    batches = []
+    batcher = BBRecordBatcher(batches.append, batch_size=3, flush_interval=0.05)
+    for i in range(4):
+        batcher.append({'value': i})
+    assert [len(batch) for batch in batches] == [3]
+    assert batches[0].column('value').tolist() == [0, 1, 2]
+    deadline = time.monotonic() + 2
+    while len(batches) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert batches[1].to_records() == [{'value': 3}]
+    batcher.append({'value': 4, 'name': 'x'})
+    batcher.close()
+    assert batches[2].to_records() == [{'value': 4, 'name': 'x'}]
+    assert batcher._timer is None
+
+
+def test_batches_go_to_batch_subscribers_and_stop_flushes_them():
+    plain, batched = RecordSubscriber(), BatchSubscriber()
+    source = PushDataSource(subscribers=[plain, batched],
+                            params={'delivery_batch_size': 10, 'delivery_batch_interval': 60})
+    for i in range(3):
+        source.update({'value': i})
+    assert plain.records == [{'value': 0}, {'value': 1}, {'value': 2}]
+    assert batched.batches == [] and batched.records == []
+    source.stop()
+    assert [batch.column('value').tolist() for batch in batched.batches] == [[0, 1, 2]]
+
+
+def test_event_log_commits_batch_subscriber_offsets_on_delivery(tmp_path):
+    plain, batched = RecordSubscriber(), BatchSubscriber()
+    plain.consumer_id, batched.consumer_id = 'plain', 'batched'
+    source = LoggedRealTimeDataSource(subscribers=[plain, batched],
+                                      params={'event_log_dir': str(tmp_path), 'delivery_batch_size': 2,
+                                              'delivery_batch_interval': 60})
+    for i in range(3):
+        source.update({'value': i})
+    assert len(plain.records) == 3
+    assert [batch.to_records() for batch in batched.batches] == [[{'value': 0}, {'value': 1}]]
+    assert source._event_log.committed('batched') == 2
+    source.stop()
+    assert batched.batches[-1].to_records() == [{'value': 2}]
+    reopened = LoggedRealTimeDataSource(params={'event_log_dir': str(tmp_path)})
+    assert reopened._event_log.committed('batched') == 3
+    reopened.stop()
@@ -0,0 +1,136 @@
+# tests/test_BBRedisStream.py
+
+import threading
+import time
+
+import redis
+
+from brainboost_data_source_package.data_source_subscriber.BBRedisStreamReader import BBRedisStreamReader
+from brainboost_data_source_package.data_source_subscriber.BBRedisStreamSubscriber import BBRedisStreamSubscriber
+from brainboost_data_source_package.data_source_subscriber.BBSubscriber import BBSubscriber
+from brainboost_data_source_package.data_source_utils import helpers
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def xadd(self, stream, fields, maxlen=None, approximate=True):
+        self.commands.append(('xadd', stream, fields))
+
+    def xack(self, stream, group, *ids):
+        self.commands.append(('xack', stream, ids))
+
+    def execute(self):
+        with self.client.lock:
+            if self.client.fail_writes:
+                raise redis.ConnectionError("connection refused")
+            for command in self.commands:
+                if command[0] == 'xadd':
+                    self.client.next_id += 1
+                    self.client.entries.append((str(self.client.next_id).encode(), command[2]))
+                else:
+                    self.client.acked.update(command[2])
+
+
+class FakeRedis:
+    """The subset of redis.Redis used by the stream bridge, for one consumer group."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = []
+        self.delivered = 0  # entries up to here were handed to the group
+        self.acked = set()
+        self.next_id = 0
+        self.fail_writes = False
+        self.fail_reads = 0
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+    def xgroup_create(self, stream, group, id='$', mkstream=False):
+        self.delivered = len(self.entries)
+
+    def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        if self.fail_reads:
+            self.fail_reads -= 1
+            raise redis.ConnectionError("connection reset")
+        stream, last_id = next(iter(streams.items()))
+        with self.lock:
+            if last_id == '>':
+                batch = self.entries[self.delivered:self.delivered + count]
+                self.delivered += len(batch)
+            else:
+                batch = [entry for entry in self.entries[:self.delivered]
+                         if int(entry[0]) > int(last_id) and entry[0] not in self.acked][:count]
+        if not batch:
+            time.sleep(0.01)
+            return []
+        return [[stream, batch]]
+
+
+class RecordingSubscriber(BBSubscriber):
+    def __init__(self, fail_on=None):
+        super().__init__(any_object=self)
+        self.fail_on = fail_on
+        self.received = []
+
+    def notify(self, data):
+        if data == self.fail_on:
+            raise RuntimeError("cannot handle this record")
+        self.received.append(data)
+
+
+def test_subscriber_publishes_in_order_and_caps_retry_buffer():
+    client = FakeRedis()
+    bridge = BBRedisStreamSubscriber('events', redis_client=client, batch_size=1000, flush_interval=60,
+                                     max_buffer=5)
+    client.fail_writes = True
+    for i in range(8):
+        bridge.notify({'value': i})
+    bridge.flush()
+    assert client.entries == []
+    client.fail_writes = False
+    bridge.close()
+    assert [entry[1]['data'] for entry in client.entries] == [f'{{"value": {i}}}' for i in range(3, 8)]
+
+
+def test_reader_redelivers_pending_and_survives_failures():
+    client = FakeRedis()
+    reader = BBRedisStreamReader('events', 'group', consumer='a', redis_client=client, block_ms=10)
+    bridge = BBRedisStreamSubscriber('events', redis_client=client, batch_size=1, flush_interval=60)
+    for i in range(3):
+        bridge.notify({'value': i})
+    client.xreadgroup('group', 'a', {'events': '>'}, count=2)  # delivered to a consumer that crashed
+    client.fail_reads = 1
+
+    subscriber = RecordingSubscriber(fail_on={'value': 1})
+    reader.subscribe(subscriber)
+    reader.start()
+    bridge.notify({'value': 3})
+    deadline = time.monotonic() + 2
+    while len(subscriber.received) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    reader.stop()
+    bridge.close()
+    assert subscriber.received == [{'value': 0}, {'value': 2}, {'value': 3}]
+    assert b'2' not in client.acked  # the failed entry stays pending for redelivery
+
+
+def test_get_redis_connection_params_prefers_private_address(monkeypatch):
+    class FakeConfig:
+        values = {'brainboost_server_vm_redis_private_ip_0': '10.0.0.5',
+                  'brainboost_server_vm_redis_private_port_0': 6380,
+                  'redis_server_ip': 'localhost', 'redis_server_port': 6379}
+
+        @classmethod
+        def get(cls, key):
+            return cls.values.get(key)
+
+        @classmethod
+        def override(cls, key, value):
+            cls.values[key] = value
+
+    monkeypatch.setattr(helpers, 'BBConfig', FakeConfig)
+    assert helpers.get_redis_connection_params() == ('10.0.0.5', 6380)
@@ -0,0 +1,62 @@
+# tests/test_BBScheduler.py
+
+import threading
+import time
+
+from brainboost_data_source_package.data_source_utils.BBScheduler import BBScheduler
+
+
+def test_periodic_job_does_not_drift():
+    scheduler = BBScheduler(max_workers=2)
+    fired = []
+    job = scheduler.schedule_periodic(lambda: fired.append(time.monotonic()), 0.05, start_delay=0)
+    time.sleep(0.52)
+    scheduler.cancel(job)
+    scheduler.shutdown()
+    # Ticks are anchored at start + k * period, so the count matches elapsed time.
+    assert 10 <= len(fired) <= 12
+    assert abs((fired[-1] - fired[0]) - 0.05 * (len(fired) - 1)) < 0.03
+
+
+def test_overrunning_job_skips_missed_ticks():
+    scheduler = BBScheduler(max_workers=2)
+    runs = []
+    active = threading.Lock()
+
+    def slow():
+        assert active.acquire(blocking=False), "job ran concurrently with itself"
+        runs.append(time.monotonic())
+        time.sleep(0.12)
+        active.release()
+
+    job = scheduler.schedule_periodic(slow, 0.05, start_delay=0)
+    time.sleep(0.5)
+    scheduler.cancel(job)
+    scheduler.shutdown()
+    assert 2 <= len(runs) <= 5
+    assert job.missed_ticks > 0
+
+
+def test_coalesce_runs_once_after_overrun():
+    scheduler = BBScheduler(max_workers=2)
+    runs = []
+
+    def slow():
+        runs.append(time.monotonic())
+        time.sleep(0.12)
+
+    job = scheduler.schedule_periodic(slow, 0.05, missed_tick_policy='coalesce', start_delay=0)
+    time.sleep(0.5)
+    scheduler.cancel(job)
+    scheduler.shutdown()
+    # Back-to-back catch-up runs: at most one run per 0.12 s of work.
+    assert 3 <= len(runs) <= 5
+    assert all(b - a >= 0.11 for a, b in zip(runs, runs[1:]))
+
+
+def test_call_later_runs_once():
+    scheduler = BBScheduler()
+    fired = threading.Event()
+    scheduler.call_later(0.05, fired.set)
+    assert fired.wait(1)
+    scheduler.shutdown()
@@ -0,0 +1,36 @@
+# tests/test_BBSharedFrameRing.py
+
+import numpy as np
+import pytest
+
+from brainboost_data_source_package.data_source_utils.BBSharedFrameRing import BBSharedFrameRing, BBTornFrameError
+
+
+def test_reader_maps_frame_without_copy():
+    ring = BBSharedFrameRing(slot_bytes=4 * 6 * 3, slots=2)
+    try:
+        frame = np.arange(72, dtype=np.uint8).reshape(4, 6, 3)
+        descriptor = ring.write(frame)
+        reader = BBSharedFrameRing.attach(descriptor)
+        with reader.read(descriptor) as view:
+            assert not view.flags.owndata
+            assert np.array_equal(view, frame)
+        BBSharedFrameRing.detach(descriptor['shm_name'])
+    finally:
+        ring.close()
+
+
+def test_reused_slot_is_detected():
+    ring = BBSharedFrameRing(slot_bytes=16, slots=2)
+    try:
+        first = ring.write(np.zeros(16, dtype=np.uint8))
+        reader = BBSharedFrameRing.attach(first)
+        with pytest.raises(BBTornFrameError):
+            with reader.read(first):
+                ring.write(np.ones(16, dtype=np.uint8))
+                ring.write(np.ones(16, dtype=np.uint8))
+        with pytest.raises(BBTornFrameError):
+            reader.view(first)
+        BBSharedFrameRing.detach(first['shm_name'])
+    finally:
+        ring.close()
@@ -0,0 +1,75 @@
+# tests/test_BBTileOCRCache.py
+
+import importlib
+
+import numpy as np
+
+from brainboost_data_source_package.data_source_addons.BBKnowledgeHookRealTimeDataSource import \
+    BBKnowledgeHookRealTimeDataSource
+from brainboost_data_source_package.data_source_utils.BBTileOCRCache import BBTileOCRCache
+
+hook_module = importlib.import_module(BBKnowledgeHookRealTimeDataSource.__module__)
+
+
+class TiledDesktop:
+    """Desktop exposing capture and OCR separately, recording the shape of every OCRed image."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.ocr_shapes = []
+
+    def take_screenshot(self):
+        return self.frame.copy()
+
+    def extract_texts_with_rects(self, image):
+        self.ocr_shapes.append(image.shape)
+        return [(f"{int(image.max())}", (1, 2, 3, 4))]
+
+
+class SnapshotOnlyDesktop:
+    def snapshot(self):
+        return np.zeros((8, 8, 3), dtype=np.uint8), []
+
+
+def test_hits_misses_and_lru_eviction():
+    cache = BBTileOCRCache(max_bytes=2 * (BBTileOCRCache._ENTRY_OVERHEAD + BBTileOCRCache._RESULT_OVERHEAD + 1))
+    image = np.zeros((4, 8), dtype=np.uint8)
+    left, right = cache.tile_key(image[:, :4]), cache.tile_key(image[:, 4:])
+    assert left == right  # same pixels anywhere on screen share a key
+    assert cache.tile_key(image[:, :4].astype(np.uint16)) != left
+    assert cache.get(left) is None
+    cache.put(left, [('a', (0, 0, 1, 1))])
+    assert cache.get(right) == [('a', (0, 0, 1, 1))]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.put(b'b', [('b', (0, 0, 1, 1))])
+    cache.get(left)
+    cache.put(b'c', [('c', (0, 0, 1, 1))])  # evicts b, the least recently used
+    assert cache.get(b'b') is None and cache.get(left) is not None
+    assert len(cache) == 2 and cache.memory_usage() <= cache.max_bytes
+
+
+def test_repeated_tiles_are_not_ocred_again():
+    frame = np.zeros((64, 96, 3), dtype=np.uint8)
+    frame[:, 64:] = 9
+    source = BBKnowledgeHookRealTimeDataSource(params={'ocr_tile_cache': True, 'ocr_tile_size': 32,
+                                                       'verbose': False})
+    source._desktop = desktop = TiledDesktop(frame)
+    snapshot = source.poll()
+    assert len(desktop.ocr_shapes) == 6
+    assert ('9', (65, 34, 67, 36)) in snapshot['texts_with_rects']
+    assert source.poll()['texts_with_rects'] == snapshot['texts_with_rects']
+    assert len(desktop.ocr_shapes) == 6
+    assert source._ocr_cache.hits == 6
+    desktop.frame[:32, 64:] = 7  # one new tile content
+    source.poll()
+    assert len(desktop.ocr_shapes) == 7
+
+
+def test_snapshot_only_desktop_logs_that_the_cache_is_unused(monkeypatch):
+    messages = []
+    monkeypatch.setattr(hook_module.Desktop, 'get_desktop_singleton', classmethod(lambda cls: SnapshotOnlyDesktop()))
+    monkeypatch.setattr(hook_module.BBLogger, 'log', staticmethod(lambda message, **kwargs: messages.append(message)))
+    source = BBKnowledgeHookRealTimeDataSource(params={'ocr_tile_cache': True, 'verbose': False})
+    assert source.poll()['texts_with_rects'] == []
+    assert any("'ocr_tile_cache' has no effect" in message for message in messages)
@@ -0,0 +1,38 @@
+# tests/test_BBTranscriptCache.py
+
+import os
+import time
+
+from brainboost_data_source_package.data_source_utils.BBTranscriptCache import BBTranscriptCache
+
+
+def test_round_trip_by_key_parts(tmp_path):
+    cache = BBTranscriptCache(str(tmp_path))
+    assert cache.get('transcript', 'abc', 'base', 'es') is None
+    cache.put({'transcript': 'hola'}, 'transcript', 'abc', 'base', 'es')
+    assert cache.get('transcript', 'abc', 'base', 'es') == {'transcript': 'hola'}
+    assert cache.get('transcript', 'abc', 'small', 'es') is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = BBTranscriptCache(str(tmp_path), max_bytes=2500)
+    for video_id in ('a', 'b'):
+        cache.put({'text': 'x' * 1000}, video_id)
+    # Backdate both, then read 'a' so 'b' becomes the least recently used entry.
+    for path in (cache._path(cache.key('a')), cache._path(cache.key('b'))):
+        os.utime(path, (time.time() - 60, time.time() - 60))
+    assert cache.get('a') is not None
+    cache.put({'text': 'x' * 1000}, 'c')
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.size() <= 2500
+
+
+def test_size_is_tracked_without_walking_the_directory(tmp_path, monkeypatch):
+    cache = BBTranscriptCache(str(tmp_path), max_bytes=10 ** 6)
+    cache.put({'text': 'x' * 100}, 'a')
+    monkeypatch.setattr(cache, '_entries', lambda: (_ for _ in ()).throw(AssertionError("directory walked")))
+    cache.put({'text': 'x' * 200}, 'b')
+    cache.put({'text': 'x' * 50}, 'a')  # replacing an entry subtracts its old size
+    monkeypatch.undo()
+    assert cache._read_total() == cache.size()
@@ -0,0 +1,230 @@
+# tests/test_BBYouTubeDataSource.py
+
+import gc
+import importlib
+import queue
+import shutil
+import threading
+import time
+import wave
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+from brainboost_data_source_package.data_source_addons.BBYouTubeDataSource import BBYouTubeDataSource
+
+youtube_module = importlib.import_module(BBYouTubeDataSource.__module__)
+
+
+def test_registering_models_does_not_keep_the_source_alive():
+    source = BBYouTubeDataSource(params={'transcript_cache': False})
+    registry = source.model_registry
+    reference = weakref.ref(source)
+    del source
+    gc.collect()
+    assert reference() is None
+    loader, _ = registry._loaders[('whisper', BBYouTubeDataSource.WHISPER_MODEL_SIZE)]
+    assert loader.args == (BBYouTubeDataSource.WHISPER_MODEL_SIZE,)
+
+
+def _batch_source(monkeypatch, tmp_path, fail_url=None):
+    """Source whose downloads write fake raw audio and whose transcription pool runs in threads."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(youtube_module, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setattr(youtube_module, '_init_transcription_worker', lambda params: None)
+    monkeypatch.setattr(youtube_module, '_transcribe_in_worker',
+                        lambda raw_path: (open(raw_path).read(), 'es', [{'start': 0.0, 'end': 1.0, 'text': 'hola'}]))
+    source = BBYouTubeDataSource(params={'transcript_cache': False, 'transcription_workers': 2,
+                                         'download_workers': 2})
+
+    def download_and_decode(video_url, download_path, raw_path=None):
+        if video_url == fail_url:
+            raise RuntimeError("Error al descargar el audio.")
+        time.sleep(0.01)
+        with open(raw_path, 'w') as f:
+            f.write(f"texto de {video_url}")
+        return None, {'id': video_url[-11:], 'title': f"Video {video_url[-1]}"}
+
+    monkeypatch.setattr(source, 'download_and_decode', download_and_decode)
+    monkeypatch.setattr(source, 'summarize_text', lambda text, summarizer: f"resumen: {text}")
+    return source
+
+
+def test_batch_yields_records_per_video_and_reports_progress(monkeypatch, tmp_path):
+    urls = [f"https://www.youtube.com/watch?v=abcdefghij{i}" for i in range(4)]
+    source = _batch_source(monkeypatch, tmp_path, fail_url=urls[2])
+    progress = []
+    source.set_progress_callback(lambda name, total, processed, remaining: progress.append((total, processed)))
+
+    records = list(source.iter_fetch(urls))
+
+    summaries = {record.data['video_url']: record.data['summary'] for record in records
+                 if record.record_type == 'summary'}
+    assert summaries == {url: f"resumen: texto de {url}" for url in urls if url != urls[2]}
+    assert sum(record.record_type == 'transcript_segment' for record in records) == 3
+    assert progress == [(4, 1), (4, 2), (4, 3), (4, 4)]
+    assert source.get_total_processing_time() >= 0.03
+    assert source._fetch_completed
+
+
+def test_download_to_queue_reports_errors_and_stops_when_cancelled(monkeypatch, tmp_path):
+    source = _batch_source(monkeypatch, tmp_path, fail_url='https://www.youtube.com/watch?v=abcdefghijk')
+    ready = queue.Queue(maxsize=1)
+    cancelled = threading.Event()
+    source._download_to_queue('https://www.youtube.com/watch?v=abcdefghijk', None, str(tmp_path), ready, cancelled)
+    video_url, title, video_id, raw_path, error = ready.get_nowait()
+    assert (title, video_id, raw_path) == (video_url, 'abcdefghijk', None)
+    assert isinstance(error, RuntimeError)
+
+    ready.put('occupied')
+    worker = threading.Thread(target=source._download_to_queue,
+                              args=('https://www.youtube.com/watch?v=abcdefghij1', 'T', str(tmp_path), ready,
+                                    cancelled))
+    worker.start()
+    time.sleep(0.05)
+    cancelled.set()
+    worker.join(timeout=2)
+    assert not worker.is_alive()
+
+
+def test_concurrent_downloads_add_up_processing_time(monkeypatch, tmp_path):
+    source = _batch_source(monkeypatch, tmp_path)
+    ready = queue.Queue()
+    threads = [threading.Thread(target=source._download_to_queue,
+                                args=(f"https://www.youtube.com/watch?v=abcdefghij{i}", None, str(tmp_path), ready,
+                                      threading.Event()))
+               for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert ready.qsize() == 8
+    assert source._total_processing_time >= 8 * 0.01
+
+
+def test_chunk_pool_is_created_once_and_shut_down_on_stop(monkeypatch):
+    initialized = []
+    monkeypatch.setattr(youtube_module, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setattr(youtube_module, '_init_transcription_worker', lambda params: initialized.append(params))
+    monkeypatch.setattr(youtube_module, '_transcribe_chunk_in_worker',
+                        lambda samples: {'language': 'es', 'segments': [{'start': 0.0, 'end': 1.0, 'text': ' hola'}]})
+    source = BBYouTubeDataSource(params={'transcript_cache': False, 'parallel_transcription': True,
+                                         'transcription_chunk_seconds': 2.0, 'chunk_workers': 2})
+    samples = np.random.default_rng(0).uniform(-0.5, 0.5, 16000 * 7).astype(np.float32)
+    for _ in range(2):
+        transcript, language, segments = source.transcribe_audio(samples, model=None)
+        assert language == 'es' and transcript.strip() == 'hola'
+    pool = source._pools['chunks']
+    assert len(initialized) == 2 and initialized[0]['torch_threads'] >= 1
+    source.stop()
+    assert source._pools == {}
+    assert pool._shutdown
+
+
+class BreaksFirstPool(ThreadPoolExecutor):
+    """The first pool created fails every task as if one of its worker processes had died."""
+    created = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.broken = not BreaksFirstPool.created
+        BreaksFirstPool.created.append(self)
+
+    def submit(self, fn, *args, **kwargs):
+        if self.broken:
+            future = Future()
+            future.set_exception(BrokenProcessPool("worker died"))
+            return future
+        return super().submit(fn, *args, **kwargs)
+
+
+def test_broken_chunk_pool_is_replaced_and_retried(monkeypatch):
+    monkeypatch.setattr(BreaksFirstPool, 'created', [])
+    monkeypatch.setattr(youtube_module, 'ProcessPoolExecutor', BreaksFirstPool)
+    monkeypatch.setattr(youtube_module, '_init_transcription_worker', lambda params: None)
+    monkeypatch.setattr(youtube_module, '_transcribe_chunk_in_worker',
+                        lambda samples: {'language': 'es', 'segments': [{'start': 0.0, 'end': 1.0, 'text': ' hola'}]})
+    source = BBYouTubeDataSource(params={'transcript_cache': False, 'parallel_transcription': True,
+                                         'transcription_chunk_seconds': 2.0, 'chunk_workers': 2})
+    samples = np.random.default_rng(0).uniform(-0.5, 0.5, 16000 * 7).astype(np.float32)
+    transcript, _, _ = source.transcribe_audio(samples, model=None)
+    assert transcript.strip() == 'hola'
+    broken, replacement = BreaksFirstPool.created
+    assert broken._shutdown and source._pools['chunks'] is replacement
+    source.stop()
+
+
+def test_broken_batch_pool_is_replaced_and_videos_retried(monkeypatch, tmp_path):
+    source = _batch_source(monkeypatch, tmp_path)
+    monkeypatch.setattr(BreaksFirstPool, 'created', [])
+    monkeypatch.setattr(youtube_module, 'ProcessPoolExecutor', BreaksFirstPool)
+    urls = [f"https://www.youtube.com/watch?v=abcdefghij{i}" for i in range(3)]
+
+    records = list(source.iter_fetch(urls))
+
+    assert sum(record.record_type == 'summary' for record in records) == 3
+    assert len(BreaksFirstPool.created) == 2 and source._pools['batch'] is BreaksFirstPool.created[1]
+    source.stop()
+
+
+def test_download_audio_keeps_returning_a_path(monkeypatch, tmp_path):
+    source = BBYouTubeDataSource(params={'transcript_cache': False})
+    monkeypatch.setattr(source, 'download_audio_stream',
+                        lambda url, path, max_retries=3: (str(tmp_path / 'abc.webm'), {'id': 'abc'}))
+    assert source.download_audio('https://www.youtube.com/watch?v=abc', str(tmp_path)) == str(tmp_path / 'abc.webm')
+
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None, reason="ffmpeg is not installed")
+def test_convert_to_mono_wav_still_writes_a_mono_wav(tmp_path):
+    stereo = tmp_path / 'stereo.wav'
+    with wave.open(str(stereo), 'wb') as out:
+        out.setnchannels(2)
+        out.setsampwidth(2)
+        out.setframerate(22050)
+        out.writeframes(np.zeros(2 * 22050, dtype='<i2').tobytes())
+    source = BBYouTubeDataSource(params={'transcript_cache': False})
+    output = source.convert_to_mono_wav(str(stereo), str(tmp_path / 'mono.wav'))
+    with wave.open(output, 'rb') as result:
+        assert (result.getnchannels(), result.getframerate(), result.getnframes()) == (1, 16000, 16000)
+    assert source.convert_to_mono_wav(str(tmp_path / 'missing.mp3'), str(tmp_path / 'out.wav')) is None
+
+
+class _WordTokenizer:
+    """One token per word; decode gives the words back."""
+    model_max_length = 1024
+
+    def __call__(self, sentences, add_special_tokens=True):
+        return {'input_ids': [sentence.split() for sentence in sentences]}
+
+    def decode(self, ids):
+        return ' '.join(ids)
+
+
+def test_chunk_text_by_tokens_groups_sentences_and_splits_long_ones():
+    source = BBYouTubeDataSource(params={'transcript_cache': False, 'summary_chunk_tokens': 6})
+    tokenizer = _WordTokenizer()
+    text = "Uno dos. Tres cuatro. Cinco seis siete. a b c d e f g h i j."
+    assert source.chunk_text_by_tokens(text, tokenizer) == [
+        "Uno dos. Tres cuatro.", "Cinco seis siete.", "a b c d", "e f g h", "i j."]
+    assert source.chunk_text_by_tokens("   ", tokenizer) == []
+
+    # Limits that leave no room after the special tokens still make progress, one token per chunk.
+    tiny = BBYouTubeDataSource(params={'transcript_cache': False, 'summary_chunk_tokens': 2})
+    assert tiny.chunk_text_by_tokens("Uno dos. Tres.", tokenizer) == ["Uno", "dos.", "Tres."]
+
+
+def test_summarize_chunks_batches_in_order():
+    source = BBYouTubeDataSource(params={'transcript_cache': False, 'summary_batch_size': 3})
+    calls = []
+
+    def summarizer(chunks, **kwargs):
+        calls.append(kwargs)
+        return [{'summary_text': chunk.upper()} for chunk in chunks]
+
+    assert source._summarize_chunks(['a', 'b', 'c', 'd'], summarizer) == ['A', 'B', 'C', 'D']
+    assert calls[0]['batch_size'] == 3 and calls[0]['truncation'] is True
+    assert source._summarize_chunks([], summarizer) == []
+    assert len(calls) == 1